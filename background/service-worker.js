@@ -16,12 +16,16 @@ const MSG = Object.freeze({
     SCAN_STARTED: 'SCAN_STARTED',
     SCAN_COMPLETE: 'SCAN_COMPLETE',
     SCAN_ERROR: 'SCAN_ERROR',
+    SCAN_PARTIAL: 'SCAN_PARTIAL',
     PROGRESS: 'PROGRESS',
     STATE: 'STATE',
     CMI_DATA: 'CMI_DATA',
     TEST_RESULT: 'TEST_RESULT',
     SET_COMPLETION_RESULT: 'SET_COMPLETION_RESULT',
-    AUTO_SELECT_RESULT: 'AUTO_SELECT_RESULT'
+    AUTO_SELECT_RESULT: 'AUTO_SELECT_RESULT',
+    TRACE_DATA: 'TRACE_DATA',
+    EXTRACTION_COMPLETE: 'EXTRACTION_COMPLETE',
+    EXTRACTION_ERROR: 'EXTRACTION_ERROR'
 });
 
 const LMS_URL_PATTERNS = [
@@ -30,7 +34,35 @@ const LMS_URL_PATTERNS = [
     /bravo/i, /moodle/i, /blackboard/i, /canvas/i
 ];
 
-const MAX_SCAN_HISTORY = 50;
+// Scan history retention: oldest scans are dropped past either limit
+const HISTORY_MAX_SCANS = 5000;
+const HISTORY_MAX_BYTES = 200 * 1024 * 1024;
+
+// Page resource cache (extension IndexedDB): LRU-evicted past the total budget
+const RESOURCE_CACHE_MAX_BYTES = 50 * 1024 * 1024;
+const RESOURCE_CACHE_MAX_ENTRY_BYTES = 8 * 1024 * 1024;
+
+const RULES_STORAGE_KEY = 'selectorRules';
+
+// Compact rule packs: a header line, then one JSON array per rule in field order
+const RULE_EXPORT_FORMAT = 'lms-qa-rules';
+const RULE_EXPORT_FIELDS = Object.freeze([
+    'urlPattern', 'questionSelector', 'answerSelector', 'correctSelector', 'grouping', 'created'
+]);
+const RULE_IMPORT_BATCH_SIZE = 250;
+const RULE_IMPORT_TIMEOUT = 5 * 60 * 1000;
+const MAX_RULE_FIELD_LENGTH = 2000;
+
+// Scan traces (Chrome Trace Event Format): one process per context, page frames from PAGE_BASE up
+const TRACE_PID = Object.freeze({ EXTENSION: 2, POPUP: 3, PAGE_BASE: 10 });
+const TRACE_MAX_EVENTS = 20000;
+// How long to wait for every injected frame to report its spans
+const TRACE_COLLECT_DELAY = 500;
+
+// Chunked page payloads not completed within this window are discarded
+const PAGE_TRANSFER_TIMEOUT = 60 * 1000;
+// Upper bound on chunks per page transfer (1 MB each)
+const PAGE_TRANSFER_MAX_CHUNKS = 1024;
 
 // ═══════════════════════════════════════════════════════════════════════════
 // STATE MANAGEMENT
@@ -337,6 +369,7 @@ chrome.tabs.onUpdated.addListener(async (tabId, changeInfo, tab) => {
 chrome.tabs.onRemoved.addListener((tabId) => {
     DomainSession.removeTab(tabId);
     TabState.delete(tabId);
+    ScanTrace.clear(tabId);
 });
 
 // ═══════════════════════════════════════════════════════════════════════════
@@ -344,12 +377,37 @@ chrome.tabs.onRemoved.addListener((tabId) => {
 // ═══════════════════════════════════════════════════════════════════════════
 
 chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
+    switch (message.type) {
+        case 'BATCH':
+            // Page messages posted in the same tick
+            (message.messages || []).forEach(entry => {
+                handleMessage({ ...entry, url: message.url }, sender, () => {});
+            });
+            return false;
+
+        case 'CHUNK': {
+            const whole = Transport.receiveChunk(message, sender);
+            if (whole) handleMessage(whole, sender, () => {});
+            return false;
+        }
+    }
+
+    return handleMessage(message, sender, sendResponse);
+});
+
+function handleMessage(message, sender, sendResponse) {
     const tabId = sender.tab?.id;
     const url = sender.tab?.url || message.url;
     const type = message.type;
 
     log.debug(`Message: ${type} from tab ${tabId}`);
 
+    if (message.trace && tabId) {
+        // Every scanning frame reports SCAN_STARTED; the first one starts a fresh trace
+        if (type === MSG.SCAN_STARTED && !TabState.get(tabId)?.scanning) ScanTrace.begin(tabId);
+        ScanTrace.hop(tabId, message, Date.now());
+    }
+
     // Handle different message types
     switch (type) {
         case MSG.READY:
@@ -363,7 +421,7 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
 
         case MSG.SCAN_STARTED:
             log.info(`Scan started on tab ${tabId}`);
-            TabState.update(tabId, { scanning: true, scanStarted: Date.now() });
+            TabState.update(tabId, { scanning: true, scanStarted: Date.now(), partialItems: [] });
             // Start domain session for this tab's domain
             if (url) DomainSession.startSession(tabId, url);
             notifyPopup(MSG.SCAN_STARTED, { tabId });
@@ -374,20 +432,30 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
             notifyPopup(MSG.PROGRESS, { tabId, ...message.payload });
             break;
 
+        case MSG.SCAN_PARTIAL:
+            log.debug(`Partial results (${message.payload?.phase} #${message.payload?.seq}): ${message.payload?.items?.length || 0} items`);
+            // Keep streamed items so a popup opened mid-scan can catch up
+            if (message.payload?.items?.length) {
+                TabState.get(tabId)?.partialItems?.push(...message.payload.items);
+            }
+            notifyPopup(MSG.SCAN_PARTIAL, { tabId, ...message.payload });
+            break;
+
         case MSG.SCAN_COMPLETE:
             log.info(`Scan complete on tab ${tabId}`);
             TabState.update(tabId, {
                 scanning: false,
                 lastScan: Date.now(),
-                results: message.payload
+                results: message.payload,
+                partialItems: []
             });
-            storeScanResult(url, message.payload);
+            ScanHistory.add(url, message.payload);
             notifyPopup(MSG.SCAN_COMPLETE, { tabId, results: message.payload });
             break;
 
         case MSG.SCAN_ERROR:
             log.error(`Scan error on tab ${tabId}:`, message.payload?.error);
-            TabState.update(tabId, { scanning: false, error: message.payload?.error });
+            TabState.update(tabId, { scanning: false, error: message.payload?.error, partialItems: [] });
             notifyPopup(MSG.SCAN_ERROR, { tabId, error: message.payload?.error });
             break;
 
@@ -407,6 +475,25 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
             notifyPopup(MSG.AUTO_SELECT_RESULT, { tabId, ...message.payload });
             break;
 
+        case MSG.TRACE_DATA:
+            ScanTrace.addPage(tabId, sender.frameId ?? 0, message.payload?.events);
+            break;
+
+        case 'SNAPSHOT_UNCHANGED':
+            // The page skips resending identical state; ask for it in full if this
+            // worker restarted and lost it
+            if (message.payload?.of === MSG.STATE && tabId && !TabState.get(tabId)?.results) {
+                chrome.tabs.sendMessage(tabId, { type: 'GET_STATE', force: true }, { frameId: sender.frameId }, () => {
+                    void chrome.runtime.lastError;
+                });
+            }
+            break;
+
+        case 'TRACE_EVENTS':
+            // Popup handler and render timings
+            ScanTrace.push(message.tabId, message.events);
+            break;
+
         case MSG.STATE:
             TabState.update(tabId, { results: message.payload });
             notifyPopup('STATE_UPDATE', { tabId, results: message.payload });
@@ -480,6 +567,64 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
             sendResponse(sessionInfo);
             return true;
 
+        case 'SELECTOR_RULE_CREATED':
+            SelectorRules.save(message.payload?.rule).then(saved => {
+                if (saved) log.info(`Saved selector rule for ${message.payload.rule.urlPattern}`);
+            });
+            break;
+
+        case 'RULE_COMPILED':
+            SelectorRules.storePlan(message.payload?.urlPattern, message.payload?.plan);
+            break;
+
+        case MSG.EXTRACTION_COMPLETE:
+            // Results of a saved rule applied by the element selector
+            log.info(`Rule extraction complete on tab ${tabId}`);
+            TabState.update(tabId, { scanning: false, lastScan: Date.now(), results: message.payload });
+            notifyPopup(MSG.SCAN_COMPLETE, { tabId, results: message.payload });
+            break;
+
+        case MSG.EXTRACTION_ERROR:
+            log.error(`Rule extraction failed on tab ${tabId}:`, message.payload?.error);
+            notifyPopup(MSG.SCAN_ERROR, { tabId, error: message.payload?.error });
+            break;
+
+        case 'IMPORT_RULES_CHUNK':
+            RuleTransfer.receive(message).then(sendResponse);
+            return true;
+
+        case 'EXPORT_RULES':
+            RuleTransfer.exportCompact().then(sendResponse);
+            return true;
+
+        case 'GET_SCAN_HISTORY':
+            const historyQuery = { ...message.query };
+            if (historyQuery.courseUrl) historyQuery.course = ScanHistory.getCourseKey(historyQuery.courseUrl);
+            ScanHistory.list(historyQuery).then(scans => {
+                sendResponse({ scans });
+            });
+            return true;
+
+        case 'GET_SCAN_RESULT':
+            ScanHistory.getResults(message.id).then(results => {
+                sendResponse({ results });
+            });
+            return true;
+
+        case 'CACHE_REQUEST':
+            // Page validator's resource cache, kept in extension storage
+            ResourceStore.handle(message, sender).then(result => sendResponse({ result }));
+            return true;
+
+        case 'GET_SELECTOR_RULE':
+            SelectorRules.find(message.url || url).then(rule => {
+                sendResponse({ rule });
+            }).catch(error => {
+                log.error('Selector rule lookup failed:', error.message);
+                sendResponse({ rule: null });
+            });
+            return true;
+
         case 'END_DOMAIN_SESSION':
             const domainToEnd = message.domain || DomainSession.getDomain(url);
             const sessionToEnd = domainToEnd ? DomainSession.getSessionId(domainToEnd) : null;
@@ -501,7 +646,79 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
     }
 
     return false;
-});
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// PAGE TRANSPORT
+// Large page payloads arrive as ordered text chunks (decoded from the
+// ArrayBuffers the page transferred) and are parsed once when complete
+// ═══════════════════════════════════════════════════════════════════════════
+
+const Transport = {
+    transfers: new Map(),
+
+    /**
+     * Returns the reassembled message once its last chunk arrives, else null
+     */
+    receiveChunk(message, sender) {
+        this.prune();
+
+        const { index, count } = message;
+        if (!this.isValidChunk(message)) {
+            log.warn(`Dropped invalid chunk ${index}/${count} of ${message.messageType} transfer`);
+            return null;
+        }
+
+        const key = `${sender.tab?.id}:${message.id}`;
+        let transfer = this.transfers.get(key);
+        if (!transfer) {
+            transfer = { parts: new Array(count), received: 0, startedAt: Date.now() };
+            this.transfers.set(key, transfer);
+        } else if (transfer.parts.length !== count) {
+            log.warn(`Dropped ${message.messageType} transfer: chunk count changed from ${transfer.parts.length} to ${count}`);
+            this.transfers.delete(key);
+            return null;
+        }
+
+        if (transfer.parts[message.index] === undefined) {
+            transfer.parts[message.index] = message.text;
+            transfer.received++;
+        }
+        if (transfer.received < count) return null;
+
+        this.transfers.delete(key);
+        try {
+            return {
+                type: message.messageType,
+                payload: JSON.parse(transfer.parts.join('')),
+                url: message.url,
+                trace: message.trace
+            };
+        } catch (error) {
+            log.error(`Dropped malformed ${message.messageType} transfer:`, error.message);
+            return null;
+        }
+    },
+
+    /**
+     * Chunks come from the page, so their shape is checked before use
+     */
+    isValidChunk({ index, count, text }) {
+        return Number.isInteger(count) && count > 0 && count <= PAGE_TRANSFER_MAX_CHUNKS &&
+            Number.isInteger(index) && index >= 0 && index < count &&
+            typeof text === 'string';
+    },
+
+    /**
+     * Drop transfers whose frame went away mid-send
+     */
+    prune() {
+        const cutoff = Date.now() - PAGE_TRANSFER_TIMEOUT;
+        for (const [key, transfer] of this.transfers) {
+            if (transfer.startedAt < cutoff) this.transfers.delete(key);
+        }
+    }
+};
 
 // ═══════════════════════════════════════════════════════════════════════════
 // POPUP COMMUNICATION
@@ -509,7 +726,8 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
 
 async function notifyPopup(type, payload) {
     try {
-        await chrome.runtime.sendMessage({ type, payload });
+        // sentAt lets the popup time the service worker -> popup hop
+        await chrome.runtime.sendMessage({ type, payload, sentAt: Date.now() });
     } catch (error) {
         // Popup not open - this is expected
     }
@@ -648,38 +866,1187 @@ async function scanSpecificTab(tabId) {
 }
 
 // ═══════════════════════════════════════════════════════════════════════════
-// STORAGE
+// SCAN HISTORY
+// One IndexedDB record per scan: small summaries in 'scans' (indexed by
+// domain, course, URL and time) and full results in 'results' by scan id.
+// Writes only ever add records; retention deletes the oldest. Running
+// totals live in 'meta' and change in the same transaction as the scans.
 // ═══════════════════════════════════════════════════════════════════════════
 
-async function storeScanResult(url, results) {
-    if (!url) return;
-    
-    try {
-        const domain = new URL(url).hostname;
-        const data = await chrome.storage.local.get('scanHistory');
-        const scanHistory = data.scanHistory || [];
-
-        scanHistory.unshift({
-            domain,
-            url,
-            timestamp: Date.now(),
-            apiCount: results.apis?.length || 0,
-            qaCount: results.qa?.total || 0,
-            correctCount: results.qa?.correct || 0
+const ScanHistory = {
+    DB_NAME: 'lms-qa-scan-history',
+    DB_VERSION: 2,
+    TOTALS_KEY: 'totals',
+    MAX_SCANS: HISTORY_MAX_SCANS,
+    MAX_BYTES: HISTORY_MAX_BYTES,
+    dbPromise: null,
+
+    /**
+     * Open the history database; resolves to null if IndexedDB is unavailable
+     */
+    open() {
+        if (this.dbPromise) return this.dbPromise;
+
+        this.dbPromise = new Promise(resolve => {
+            try {
+                const request = indexedDB.open(this.DB_NAME, this.DB_VERSION);
+                request.onupgradeneeded = () => {
+                    const db = request.result;
+                    if (!db.objectStoreNames.contains('scans')) {
+                        const scans = db.createObjectStore('scans', { keyPath: 'id', autoIncrement: true });
+                        scans.createIndex('domain', 'domain');
+                        scans.createIndex('course', 'course');
+                        scans.createIndex('url', 'url');
+                        scans.createIndex('timestamp', 'timestamp');
+                    }
+                    if (!db.objectStoreNames.contains('results')) db.createObjectStore('results');
+                    if (!db.objectStoreNames.contains('meta')) {
+                        this.initTotals(request.transaction, db.createObjectStore('meta'));
+                    }
+                };
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => resolve(null);
+                request.onblocked = () => resolve(null);
+            } catch (error) {
+                resolve(null);
+            }
+        });
+
+        return this.dbPromise;
+    },
+
+    /**
+     * Total the scans already stored (a version 1 database) once, during the upgrade
+     */
+    initTotals(tx, meta) {
+        const totals = { count: 0, bytes: 0 };
+        const request = tx.objectStore('scans').openCursor();
+
+        request.onsuccess = () => {
+            const cursor = request.result;
+            if (!cursor) {
+                meta.put(totals, this.TOTALS_KEY);
+                return;
+            }
+            totals.count++;
+            totals.bytes += cursor.value.size || 0;
+            cursor.continue();
+        };
+    },
+
+    /**
+     * Add to the running totals inside a transaction that includes 'meta'.
+     * The returned object holds the new totals once the transaction completes.
+     */
+    adjustTotals(tx, count, bytes) {
+        const totals = { count: 0, bytes: 0 };
+        const meta = tx.objectStore('meta');
+        const request = meta.get(this.TOTALS_KEY);
+
+        request.onsuccess = () => {
+            totals.count = Math.max(0, (request.result?.count || 0) + count);
+            totals.bytes = Math.max(0, (request.result?.bytes || 0) + bytes);
+            meta.put(totals, this.TOTALS_KEY);
+        };
+        return totals;
+    },
+
+    promisify(request) {
+        return new Promise((resolve, reject) => {
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
         });
+    },
+
+    complete(tx) {
+        return new Promise((resolve, reject) => {
+            tx.oncomplete = () => resolve();
+            tx.onerror = () => reject(tx.error);
+            tx.onabort = () => reject(tx.error);
+        });
+    },
 
-        if (scanHistory.length > MAX_SCAN_HISTORY) {
-            scanHistory.length = MAX_SCAN_HISTORY;
+    /**
+     * Course key for a URL: host and path with numeric segments wildcarded,
+     * matching the element selector's rule patterns
+     */
+    getCourseKey(url) {
+        try {
+            const parsed = new URL(url);
+            const path = parsed.pathname.replace(/\/\d+/g, '/*').replace(/\/$/, '') || '/';
+            return `${parsed.hostname}${path}`;
+        } catch {
+            return null;
         }
+    },
+
+    async add(url, results) {
+        if (!url || !results) return null;
+
+        const db = await this.open();
+        if (!db) return null;
 
-        await chrome.storage.local.set({ 
-            scanHistory,
-            [`results_${domain}`]: results
+        try {
+            const size = JSON.stringify(results).length;
+            const summary = {
+                domain: new URL(url).hostname,
+                course: this.getCourseKey(url),
+                url,
+                timestamp: Date.now(),
+                apiCount: results.apis?.length || 0,
+                qaCount: results.qa?.total || 0,
+                correctCount: results.qa?.correct || 0,
+                size
+            };
+
+            const tx = db.transaction(['scans', 'results', 'meta'], 'readwrite');
+            const request = tx.objectStore('scans').add(summary);
+            request.onsuccess = () => tx.objectStore('results').put(results, request.result);
+            const totals = this.adjustTotals(tx, 1, size);
+            await this.complete(tx);
+
+            if (totals.count > this.MAX_SCANS || totals.bytes > this.MAX_BYTES) {
+                await this.enforceRetention();
+            }
+            return request.result;
+        } catch (error) {
+            log.error('Failed to store scan result:', error.message);
+            return null;
+        }
+    },
+
+    async getTotals() {
+        const db = await this.open();
+        if (!db) return { count: 0, bytes: 0 };
+
+        const totals = await this.promisify(db.transaction('meta').objectStore('meta').get(this.TOTALS_KEY));
+        return totals || { count: 0, bytes: 0 };
+    },
+
+    /**
+     * Delete the oldest scans until history fits both the count and byte limits
+     */
+    async enforceRetention() {
+        const db = await this.open();
+        if (!db) return 0;
+
+        const tx = db.transaction(['scans', 'results', 'meta'], 'readwrite');
+        const meta = tx.objectStore('meta');
+        const results = tx.objectStore('results');
+        const read = meta.get(this.TOTALS_KEY);
+        let removed = 0;
+
+        read.onsuccess = () => {
+            const totals = read.result || { count: 0, bytes: 0 };
+            const request = tx.objectStore('scans').index('timestamp').openCursor();
+
+            request.onsuccess = () => {
+                const cursor = request.result;
+                if (!cursor || (totals.count <= this.MAX_SCANS && totals.bytes <= this.MAX_BYTES)) {
+                    meta.put(totals, this.TOTALS_KEY);
+                    return;
+                }
+
+                totals.count--;
+                totals.bytes -= cursor.value.size || 0;
+                results.delete(cursor.primaryKey);
+                cursor.delete();
+                removed++;
+                cursor.continue();
+            };
+        };
+
+        try {
+            await this.complete(tx);
+        } catch (error) {
+            // The transaction rolled back, totals included
+            removed = 0;
+            log.error('Scan history retention failed:', error.message);
+        }
+
+        if (removed > 0) log.info(`Scan history: removed ${removed} old scan(s)`);
+        return removed;
+    },
+
+    /**
+     * Scan summaries, newest first. Filter by one of domain, course or url.
+     */
+    async list({ domain, course, url, limit = 50 } = {}) {
+        const db = await this.open();
+        if (!db) return [];
+
+        try {
+            const store = db.transaction('scans').objectStore('scans');
+            const [indexName, key] = domain ? ['domain', domain]
+                : course ? ['course', course]
+                : url ? ['url', url]
+                : ['timestamp', null];
+
+            const scans = [];
+            const request = key === null
+                ? store.index(indexName).openCursor(null, 'prev')
+                : store.index(indexName).openCursor(IDBKeyRange.only(key), 'prev');
+
+            await new Promise((resolve, reject) => {
+                request.onsuccess = () => {
+                    const cursor = request.result;
+                    if (!cursor || scans.length >= limit) {
+                        resolve();
+                        return;
+                    }
+                    scans.push(cursor.value);
+                    cursor.continue();
+                };
+                request.onerror = () => reject(request.error);
+            });
+
+            // Equal index keys are walked in reverse id order, so filtered lists are newest first too
+            return scans;
+        } catch (error) {
+            log.error('Failed to read scan history:', error.message);
+            return [];
+        }
+    },
+
+    async getResults(id) {
+        const db = await this.open();
+        if (!db || id === undefined || id === null) return null;
+
+        try {
+            const results = await this.promisify(db.transaction('results').objectStore('results').get(id));
+            return results || null;
+        } catch (error) {
+            return null;
+        }
+    },
+
+    /**
+     * Move history kept in chrome.storage by earlier versions into IndexedDB
+     */
+    async migrateLegacy() {
+        try {
+            const all = await chrome.storage.local.get(null);
+            const legacy = all.scanHistory;
+            const resultKeys = Object.keys(all).filter(key => key.startsWith('results_'));
+            if (!Array.isArray(legacy) && resultKeys.length === 0) return;
+
+            const db = await this.open();
+            if (!db) return;
+
+            // Legacy results were kept per domain, for the latest scan only
+            const latestByDomain = new Map();
+            for (const entry of legacy || []) {
+                if (!latestByDomain.has(entry.domain)) latestByDomain.set(entry.domain, entry);
+            }
+
+            const tx = db.transaction(['scans', 'results', 'meta'], 'readwrite');
+            const scans = tx.objectStore('scans');
+            const resultsStore = tx.objectStore('results');
+            let bytes = 0;
+
+            // Oldest first so ids keep chronological order
+            for (const entry of [...(legacy || [])].reverse()) {
+                const results = latestByDomain.get(entry.domain) === entry
+                    ? all[`results_${entry.domain}`]
+                    : undefined;
+                const size = results ? JSON.stringify(results).length : 0;
+                const request = scans.add({
+                    domain: entry.domain,
+                    course: this.getCourseKey(entry.url),
+                    url: entry.url,
+                    timestamp: entry.timestamp,
+                    apiCount: entry.apiCount || 0,
+                    qaCount: entry.qaCount || 0,
+                    correctCount: entry.correctCount || 0,
+                    size
+                });
+                if (results) {
+                    request.onsuccess = () => resultsStore.put(results, request.result);
+                }
+                bytes += size;
+            }
+            this.adjustTotals(tx, legacy?.length || 0, bytes);
+
+            await this.complete(tx);
+            await chrome.storage.local.remove(['scanHistory', ...resultKeys]);
+            log.info(`Migrated ${legacy?.length || 0} scan(s) to IndexedDB history`);
+        } catch (error) {
+            log.error('Scan history migration failed:', error.message);
+        }
+    }
+};
+
+// ═══════════════════════════════════════════════════════════════════════════
+// RESOURCE CACHE
+// Course files the page validator fetched, with their parse results, held in
+// extension storage instead of the LMS origin's. Keys are prefixed with the
+// requesting frame's origin (from the sender, not the page), so a page only
+// ever reaches entries for its own origin.
+// ═══════════════════════════════════════════════════════════════════════════
+
+const ResourceStore = {
+    DB_NAME: 'lms-qa-resource-cache',
+    DB_VERSION: 1,
+    dbPromise: null,
+    evictTimer: null,
+
+    /**
+     * Open the cache database; resolves to null if IndexedDB is unavailable
+     */
+    open() {
+        if (this.dbPromise) return this.dbPromise;
+
+        this.dbPromise = new Promise(resolve => {
+            try {
+                const request = indexedDB.open(this.DB_NAME, this.DB_VERSION);
+                request.onupgradeneeded = () => {
+                    const db = request.result;
+                    // Metadata, bodies and parse results are split so eviction
+                    // never reads file contents
+                    if (!db.objectStoreNames.contains('entries')) {
+                        const entries = db.createObjectStore('entries', { keyPath: 'key' });
+                        entries.createIndex('lastAccess', 'lastAccess');
+                    }
+                    if (!db.objectStoreNames.contains('bodies')) db.createObjectStore('bodies');
+                    if (!db.objectStoreNames.contains('parsed')) db.createObjectStore('parsed');
+                };
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => resolve(null);
+                request.onblocked = () => resolve(null);
+            } catch (error) {
+                resolve(null);
+            }
         });
-    } catch (error) {
-        log.error('Failed to store scan result:', error.message);
+
+        return this.dbPromise;
+    },
+
+    promisify(request) {
+        return new Promise((resolve, reject) => {
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        });
+    },
+
+    complete(tx) {
+        return new Promise((resolve, reject) => {
+            tx.oncomplete = () => resolve();
+            tx.onerror = () => reject(tx.error);
+            tx.onabort = () => reject(tx.error);
+        });
+    },
+
+    getOrigin(sender) {
+        if (sender?.origin) return sender.origin;
+        try {
+            return new URL(sender?.url).origin;
+        } catch {
+            return null;
+        }
+    },
+
+    /**
+     * Run a CACHE_REQUEST from a content script. Resolves to the op's result,
+     * or null on bad input or storage failure; never rejects.
+     */
+    async handle({ op, payload = {} }, sender) {
+        const origin = this.getOrigin(sender);
+        if (!origin) return null;
+
+        const url = payload?.url ?? payload?.entry?.url;
+        if (op !== 'clear' && typeof url !== 'string') return null;
+        const key = `${origin}|${url}`;
+
+        try {
+            switch (op) {
+                case 'get': return await this.get(key);
+                case 'put': return await this.put(key, payload.entry, payload.text);
+                case 'touch': return await this.touch(key);
+                case 'getParsed': return await this.read('parsed', key);
+                case 'putParsed': return await this.putParsed(key, payload);
+                case 'clear': return await this.clear(origin);
+            }
+        } catch (error) {
+            log.debug(`Resource cache ${op} failed: ${error?.message}`);
+        }
+        return null;
+    },
+
+    async read(storeName, key) {
+        const db = await this.open();
+        if (!db) return null;
+
+        return (await this.promisify(db.transaction(storeName).objectStore(storeName).get(key))) ?? null;
+    },
+
+    async get(key) {
+        const db = await this.open();
+        if (!db) return null;
+
+        const tx = db.transaction(['entries', 'bodies'], 'readonly');
+        const [entry, text] = await Promise.all([
+            this.promisify(tx.objectStore('entries').get(key)),
+            this.promisify(tx.objectStore('bodies').get(key))
+        ]);
+        if (!entry || typeof text !== 'string') return null;
+
+        const { url, etag, lastModified, hash } = entry;
+        return { url, etag, lastModified, hash, text };
+    },
+
+    async put(key, entry, text) {
+        const db = await this.open();
+        if (!db || typeof text !== 'string' || text.length > RESOURCE_CACHE_MAX_ENTRY_BYTES) return null;
+
+        const str = value => typeof value === 'string' ? value : null;
+        const tx = db.transaction(['entries', 'bodies', 'parsed'], 'readwrite');
+        tx.objectStore('entries').put({
+            key,
+            url: entry.url,
+            etag: str(entry.etag),
+            lastModified: str(entry.lastModified),
+            hash: str(entry.hash),
+            size: text.length,
+            lastAccess: Date.now()
+        });
+        tx.objectStore('bodies').put(text, key);
+        await this.complete(tx);
+
+        this.scheduleEviction();
+        return true;
+    },
+
+    async touch(key) {
+        const db = await this.open();
+        if (!db) return null;
+
+        const tx = db.transaction('entries', 'readwrite');
+        const entries = tx.objectStore('entries');
+        const entry = await this.promisify(entries.get(key));
+        if (entry) entries.put({ ...entry, lastAccess: Date.now() });
+        await this.complete(tx);
+        return !!entry;
+    },
+
+    async putParsed(key, { key: parseKey, items }) {
+        const db = await this.open();
+        if (!db || typeof parseKey !== 'string' || !Array.isArray(items)) return null;
+
+        const tx = db.transaction('parsed', 'readwrite');
+        tx.objectStore('parsed').put({ key: parseKey, items }, key);
+        await this.complete(tx);
+        return true;
+    },
+
+    /**
+     * Drop every entry for one origin
+     */
+    async clear(origin) {
+        const db = await this.open();
+        if (!db) return null;
+
+        const range = IDBKeyRange.bound(`${origin}|`, `${origin}|\uffff`);
+        const tx = db.transaction(['entries', 'bodies', 'parsed'], 'readwrite');
+        ['entries', 'bodies', 'parsed'].forEach(name => tx.objectStore(name).delete(range));
+        await this.complete(tx);
+        return true;
+    },
+
+    scheduleEviction() {
+        clearTimeout(this.evictTimer);
+        this.evictTimer = setTimeout(() => this.evict(), 1000);
+    },
+
+    /**
+     * Drop least-recently-used entries until the cache fits the byte budget
+     */
+    async evict(maxBytes = RESOURCE_CACHE_MAX_BYTES) {
+        const db = await this.open();
+        if (!db) return 0;
+
+        try {
+            const tx = db.transaction(['entries', 'bodies', 'parsed'], 'readwrite');
+            const entries = tx.objectStore('entries');
+            const byAccess = await this.promisify(entries.index('lastAccess').getAll());
+
+            let total = byAccess.reduce((sum, entry) => sum + entry.size, 0);
+            let removed = 0;
+
+            for (const entry of byAccess) {
+                if (total <= maxBytes) break;
+                entries.delete(entry.key);
+                tx.objectStore('bodies').delete(entry.key);
+                tx.objectStore('parsed').delete(entry.key);
+                total -= entry.size;
+                removed++;
+            }
+
+            await this.complete(tx);
+            if (removed > 0) log.debug(`Evicted ${removed} cached resource(s)`);
+            return removed;
+        } catch (error) {
+            return 0;
+        }
     }
-}
+};
+
+// ═══════════════════════════════════════════════════════════════════════════
+// URL PATTERN INDEX
+// Trie of rule patterns: host, then path segments; '*' matches one segment,
+// or the rest of the path when it ends a pattern
+// URL segments are keyed the way the element selector's getPatternKey()
+// builds patterns, so '/123abc' is looked up as '*abc'
+// ═══════════════════════════════════════════════════════════════════════════
+
+const RuleIndex = {
+    create() {
+        return { hosts: new Map(), size: 0 };
+    },
+
+    createNode() {
+        return { children: new Map(), value: undefined };
+    },
+
+    /**
+     * Split a pattern key ("host/path/*") into host and path segments
+     */
+    parse(pattern) {
+        const slash = pattern.indexOf('/');
+        const host = slash === -1 ? pattern : pattern.slice(0, slash);
+        const segments = slash === -1 ? [] : pattern.slice(slash).split('/').filter(Boolean);
+        return { host, segments };
+    },
+
+    /**
+     * Pattern segment for a URL path segment: a leading run of digits becomes
+     * '*', matching getPatternKey()'s replace(/\/\d+/g, '/*')
+     */
+    keyOf(segment) {
+        return segment.replace(/^\d+/, '*');
+    },
+
+    /**
+     * Trie node for an exact pattern key, if the path exists
+     */
+    lookup(index, pattern) {
+        const { host, segments } = this.parse(pattern);
+
+        let node = index.hosts.get(host);
+        for (const segment of segments) {
+            node = node?.children.get(segment);
+        }
+        return node || null;
+    },
+
+    get(index, pattern) {
+        return this.lookup(index, pattern)?.value;
+    },
+
+    insert(index, pattern, value) {
+        const { host, segments } = this.parse(pattern);
+
+        if (!index.hosts.has(host)) {
+            index.hosts.set(host, this.createNode());
+        }
+
+        let node = index.hosts.get(host);
+        for (const segment of segments) {
+            if (!node.children.has(segment)) {
+                node.children.set(segment, this.createNode());
+            }
+            node = node.children.get(segment);
+        }
+
+        if (node.value === undefined) index.size++;
+        node.value = value;
+    },
+
+    remove(index, pattern) {
+        const node = this.lookup(index, pattern);
+
+        if (node?.value !== undefined) {
+            node.value = undefined;
+            index.size--;
+        }
+    },
+
+    /**
+     * Value of the most specific pattern matching a URL: most path segments
+     * matched, then most literal segments, then exact length over a trailing '*'
+     */
+    match(index, url) {
+        let parsed;
+        try {
+            parsed = new URL(url);
+        } catch {
+            return null;
+        }
+
+        const root = index.hosts.get(parsed.hostname);
+        if (!root) return null;
+
+        const segments = parsed.pathname.split('/').filter(Boolean);
+        let best = null;
+
+        const consider = (value, depth, literals, exact) => {
+            if (!best ||
+                depth > best.depth ||
+                (depth === best.depth && literals > best.literals) ||
+                (depth === best.depth && literals === best.literals && exact && !best.exact)) {
+                best = { value, depth, literals, exact };
+            }
+        };
+
+        const visit = (node, depth, literals) => {
+            const wildcard = node.children.get('*');
+            if (wildcard?.value !== undefined) {
+                consider(wildcard.value, depth, literals, false);
+            }
+
+            if (depth === segments.length) {
+                if (node.value !== undefined) consider(node.value, depth, literals, true);
+                return;
+            }
+
+            const literal = node.children.get(this.keyOf(segments[depth]));
+            if (literal) visit(literal, depth + 1, literals + 1);
+            if (wildcard && wildcard !== literal) visit(wildcard, depth + 1, literals);
+        };
+
+        visit(root, 0, 0);
+        return best ? best.value : null;
+    }
+};
+
+// ═══════════════════════════════════════════════════════════════════════════
+// SELECTOR RULES
+// Saved element-selector rules keyed by URL pattern, with compiled plans
+// ═══════════════════════════════════════════════════════════════════════════
+
+const SelectorRules = {
+    // urlPattern -> rule, read from storage once per service worker lifetime
+    rules: null,
+    index: RuleIndex.create(),
+    loading: null,
+
+    // urlPattern -> compiled extraction plan, kept across lookups so repeat
+    // visits hand the page a ready plan instead of recompiling
+    compiled: new Map(),
+
+    load() {
+        if (!this.loading) {
+            this.loading = chrome.storage.local.get(RULES_STORAGE_KEY).then(data => {
+                this.rules = data[RULES_STORAGE_KEY] || {};
+                this.index = RuleIndex.create();
+                for (const pattern of Object.keys(this.rules)) {
+                    RuleIndex.insert(this.index, pattern, pattern);
+                }
+                log.info(`Indexed ${this.index.size} selector rules`);
+            }).catch(error => {
+                this.loading = null;
+                throw error;
+            });
+        }
+        return this.loading;
+    },
+
+    async persist() {
+        await chrome.storage.local.set({ [RULES_STORAGE_KEY]: this.rules });
+    },
+
+    async save(rule) {
+        if (!rule?.urlPattern || !rule.questionSelector || !rule.answerSelector) return false;
+
+        try {
+            await this.saveMany([rule]);
+            return true;
+        } catch (error) {
+            log.error('Failed to save selector rule:', error.message);
+            return false;
+        }
+    },
+
+    /**
+     * Store several rules with a single storage write; with persist: false
+     * they are only indexed, and a later persist() writes them out
+     */
+    async saveMany(rules, { persist = true } = {}) {
+        await this.load();
+
+        for (const rule of rules) {
+            this.rules[rule.urlPattern] = rule;
+            RuleIndex.insert(this.index, rule.urlPattern, rule.urlPattern);
+
+            if (rule.plan) {
+                this.compiled.set(rule.urlPattern, rule.plan);
+            } else {
+                this.compiled.delete(rule.urlPattern);
+            }
+        }
+
+        if (persist) await this.persist();
+    },
+
+    /**
+     * Most specific rule for a URL, with its cached plan
+     */
+    async find(url) {
+        if (!url) return null;
+        await this.load();
+
+        const pattern = RuleIndex.match(this.index, url);
+        return pattern ? this.withPlan(this.rules[pattern]) : null;
+    },
+
+    withPlan(rule) {
+        const plan = this.compiled.get(rule.urlPattern) || rule.plan;
+        if (plan && !this.compiled.has(rule.urlPattern)) {
+            this.compiled.set(rule.urlPattern, plan);
+        }
+        return plan ? { ...rule, plan } : rule;
+    },
+
+    /**
+     * Cache a plan the page compiled and persist it with its rule
+     */
+    async storePlan(urlPattern, plan) {
+        if (!urlPattern || !plan) return;
+        this.compiled.set(urlPattern, plan);
+
+        try {
+            await this.load();
+            if (!this.rules[urlPattern]) return;
+
+            this.rules[urlPattern].plan = plan;
+            await this.persist();
+        } catch (error) {
+            log.error('Failed to store compiled rule:', error.message);
+        }
+    }
+};
+
+// ═══════════════════════════════════════════════════════════════════════════
+// RULE IMPORT / EXPORT
+// Rule packs arrive in chunks and are parsed incrementally, so large packs
+// never sit in memory as one string or block the worker on one JSON.parse
+// ═══════════════════════════════════════════════════════════════════════════
+
+const RuleStream = {
+    create() {
+        return {
+            mode: null,         // 'array' (JSON array) or 'lines' (compact / NDJSON)
+            buffer: '',
+            pos: 0,
+            depth: 0,
+            start: -1,
+            inString: false,
+            escaped: false,
+            fields: RULE_EXPORT_FIELDS
+        };
+    },
+
+    /**
+     * Append text and return every record completed by it
+     */
+    feed(stream, text, end = false) {
+        stream.buffer += text;
+
+        if (!stream.mode) {
+            const first = stream.buffer.match(/\S/);
+            if (!first) return [];
+            stream.mode = first[0] === '[' ? 'array' : 'lines';
+        }
+
+        const records = stream.mode === 'array'
+            ? this.scanArray(stream)
+            : this.scanLines(stream, end);
+
+        if (end && stream.mode === 'array' && stream.depth !== 0) {
+            throw new Error('Rule file ended unexpectedly');
+        }
+
+        return records.filter(record => !this.readHeader(stream, record));
+    },
+
+    readHeader(stream, record) {
+        if (record && !Array.isArray(record) && record.format === RULE_EXPORT_FORMAT) {
+            if (Array.isArray(record.fields)) stream.fields = record.fields;
+            return true;
+        }
+        return false;
+    },
+
+    scanLines(stream, end) {
+        const lines = stream.buffer.split('\n');
+        stream.buffer = end ? '' : lines.pop();
+
+        return lines
+            .map(line => line.trim())
+            .filter(Boolean)
+            .map(line => this.parse(line));
+    },
+
+    /**
+     * Emit each element of a top-level array as soon as its closing bracket arrives
+     */
+    scanArray(stream) {
+        const records = [];
+        const buffer = stream.buffer;
+        let i = stream.pos;
+
+        for (; i < buffer.length; i++) {
+            const ch = buffer[i];
+
+            if (stream.inString) {
+                if (stream.escaped) {
+                    stream.escaped = false;
+                } else if (ch === '\\') {
+                    stream.escaped = true;
+                } else if (ch === '"') {
+                    stream.inString = false;
+                }
+                continue;
+            }
+
+            if (ch === '"') {
+                stream.inString = true;
+            } else if (ch === '{' || ch === '[') {
+                stream.depth++;
+                if (stream.depth === 2) stream.start = i;
+            } else if (ch === '}' || ch === ']') {
+                stream.depth--;
+                if (stream.depth === 1 && stream.start !== -1) {
+                    records.push(this.parse(buffer.slice(stream.start, i + 1)));
+                    stream.start = -1;
+                }
+            }
+        }
+
+        // Drop consumed text, keeping any element still in progress
+        const keep = stream.start === -1 ? i : stream.start;
+        stream.buffer = buffer.slice(keep);
+        stream.pos = i - keep;
+        if (stream.start !== -1) stream.start = 0;
+
+        return records;
+    },
+
+    parse(text) {
+        try {
+            return JSON.parse(text);
+        } catch {
+            return undefined;
+        }
+    }
+};
+
+const RuleTransfer = {
+    // importId -> { stream, pending, stats, touched, staged }
+    sessions: new Map(),
+
+    /**
+     * Handle one chunk of an import. Chunks arrive in order because the rules page
+     * waits for each response before sending the next.
+     */
+    async receive({ importId, text = '', done = false, abort = false }) {
+        this.prune();
+
+        if (abort) {
+            const session = this.sessions.get(importId);
+            this.sessions.delete(importId);
+            if (session) await this.finish(session);
+            return { success: true };
+        }
+
+        let session = this.sessions.get(importId);
+        if (!session) {
+            session = {
+                stream: RuleStream.create(),
+                pending: new Map(),
+                stats: { imported: 0, updated: 0, duplicates: 0, invalid: 0 },
+                touched: 0,
+                staged: 0
+            };
+            this.sessions.set(importId, session);
+        }
+        session.touched = Date.now();
+
+        try {
+            await SelectorRules.load();
+
+            for (const record of RuleStream.feed(session.stream, text, done)) {
+                this.accept(session, record);
+            }
+
+            if (done || session.pending.size >= RULE_IMPORT_BATCH_SIZE) {
+                await this.flush(session);
+            }
+
+            if (done) {
+                this.sessions.delete(importId);
+                await this.finish(session);
+                log.info('Rule import complete', session.stats);
+            }
+
+            return { success: true, done, stats: { ...session.stats } };
+        } catch (error) {
+            this.sessions.delete(importId);
+            await this.finish(session).catch(() => {});
+            log.error('Rule import failed:', error.message);
+            return { success: false, error: error.message, stats: { ...session.stats } };
+        }
+    },
+
+    /**
+     * Validate a record and queue it unless an identical rule already exists
+     */
+    accept(session, record) {
+        const rule = this.normalize(record, session.stream.fields);
+        if (!rule) {
+            session.stats.invalid++;
+            return;
+        }
+
+        const pattern = rule.urlPattern;
+        const existing = session.pending.get(pattern) ||
+            (RuleIndex.get(SelectorRules.index, pattern) !== undefined ? SelectorRules.rules[pattern] : null);
+
+        if (existing && this.sameSelectors(existing, rule)) {
+            session.stats.duplicates++;
+            return;
+        }
+
+        if (existing) {
+            session.stats.updated++;
+        } else {
+            session.stats.imported++;
+        }
+        session.pending.set(pattern, rule);
+    },
+
+    /**
+     * Index a batch of queued rules without writing storage; rewriting the
+     * whole rule set per batch would make large imports quadratic
+     */
+    async flush(session) {
+        if (session.pending.size === 0) return;
+
+        const batch = [...session.pending.values()];
+        session.pending.clear();
+        await SelectorRules.saveMany(batch, { persist: false });
+        session.staged += batch.length;
+    },
+
+    /**
+     * Write everything an import staged in one storage write, however it ended
+     */
+    async finish(session) {
+        if (session.staged === 0) return;
+
+        session.staged = 0;
+        await SelectorRules.persist();
+    },
+
+    /**
+     * Build a rule from a full rule object or a compact row (array in field order)
+     */
+    normalize(record, fields) {
+        const source = Array.isArray(record)
+            ? Object.fromEntries(fields.map((field, i) => [field, record[i]]))
+            : record;
+
+        if (!source || typeof source !== 'object') return null;
+
+        const isField = (value) => typeof value === 'string' &&
+            value.trim() !== '' &&
+            value.length <= MAX_RULE_FIELD_LENGTH;
+
+        const { urlPattern, questionSelector, answerSelector, correctSelector } = source;
+        if (!isField(urlPattern) || !isField(questionSelector) || !isField(answerSelector)) return null;
+        if (urlPattern.trim().startsWith('/')) return null;
+
+        const rule = {
+            questionSelector,
+            answerSelector,
+            correctSelector: isField(correctSelector) ? correctSelector : null,
+            grouping: source.grouping === 'proximity' ? 'proximity' : 'auto',
+            urlPattern: urlPattern.trim(),
+            created: typeof source.created === 'string' ? source.created : new Date().toISOString(),
+            imported: new Date().toISOString()
+        };
+
+        if (source.plan && typeof source.plan === 'object') {
+            rule.plan = source.plan;
+        }
+
+        return rule;
+    },
+
+    sameSelectors(a, b) {
+        return a.questionSelector === b.questionSelector &&
+            a.answerSelector === b.answerSelector &&
+            (a.correctSelector || null) === (b.correctSelector || null) &&
+            (a.grouping || 'auto') === (b.grouping || 'auto');
+    },
+
+    /**
+     * Forget imports whose page went away mid-stream, keeping what they staged
+     */
+    prune() {
+        const cutoff = Date.now() - RULE_IMPORT_TIMEOUT;
+        for (const [importId, session] of this.sessions) {
+            if (session.touched < cutoff) {
+                this.sessions.delete(importId);
+                this.finish(session).catch(error => log.error('Failed to save imported rules:', error.message));
+            }
+        }
+    },
+
+    /**
+     * Compact export: header line, then one row per rule (plans are left out,
+     * since the page recompiles them on first use)
+     */
+    async exportCompact() {
+        try {
+            await SelectorRules.load();
+
+            const rules = Object.values(SelectorRules.rules);
+            const lines = [JSON.stringify({
+                format: RULE_EXPORT_FORMAT,
+                version: 1,
+                fields: RULE_EXPORT_FIELDS,
+                count: rules.length
+            })];
+
+            for (const rule of rules) {
+                lines.push(JSON.stringify(RULE_EXPORT_FIELDS.map(field => rule[field] ?? null)));
+            }
+
+            return { success: true, count: rules.length, data: lines.join('\n') + '\n' };
+        } catch (error) {
+            log.error('Rule export failed:', error.message);
+            return { success: false, error: error.message };
+        }
+    }
+};
+
+// ═══════════════════════════════════════════════════════════════════════════
+// SCAN TRACES
+// Per-tab timeline of a scan in Chrome Trace Event Format: message hops are
+// recorded as they pass through, popup timings arrive as TRACE_EVENTS, and
+// each injected frame's spans are merged in when a trace is requested.
+// ═══════════════════════════════════════════════════════════════════════════
+
+const ScanTrace = {
+    tabs: new Map(),
+
+    begin(tabId) {
+        this.clear(tabId);
+        return this.ensure(tabId);
+    },
+
+    ensure(tabId) {
+        if (!this.tabs.has(tabId)) {
+            this.tabs.set(tabId, { events: [], pages: new Map(), collectTimer: null });
+        }
+        return this.tabs.get(tabId);
+    },
+
+    clear(tabId) {
+        clearTimeout(this.tabs.get(tabId)?.collectTimer);
+        this.tabs.delete(tabId);
+    },
+
+    push(tabId, events) {
+        const trace = this.tabs.get(tabId);
+        if (!trace || !Array.isArray(events)) return;
+
+        const room = TRACE_MAX_EVENTS - trace.events.length;
+        if (room > 0) trace.events.push(...events.slice(0, room));
+    },
+
+    /**
+     * Page -> content script and content script -> service worker legs of one message
+     */
+    hop(tabId, message, receivedAt) {
+        const { sent, relayed } = message.trace;
+        if (!Number.isFinite(sent) || !Number.isFinite(relayed)) return;
+
+        this.ensure(tabId);
+        this.push(tabId, [
+            this.complete(message.type, 'message', sent, relayed, TRACE_PID.EXTENSION, 1, { url: message.url }),
+            this.complete(message.type, 'message', relayed, receivedAt, TRACE_PID.EXTENSION, 2)
+        ]);
+    },
+
+    /**
+     * Complete ('X') event from wall-clock milliseconds
+     */
+    complete(name, cat, startMs, endMs, pid, tid, args = {}) {
+        return {
+            name,
+            cat,
+            ph: 'X',
+            ts: Math.round(startMs * 1000),
+            dur: Math.max(0, Math.round((endMs - startMs) * 1000)),
+            pid,
+            tid,
+            args
+        };
+    },
+
+    /**
+     * Store one frame's spans; the trace goes to the popup once frames stop reporting
+     */
+    addPage(tabId, frameId, events) {
+        if (!tabId || !Array.isArray(events)) return;
+
+        const trace = this.ensure(tabId);
+        const pid = TRACE_PID.PAGE_BASE + frameId;
+        trace.pages.set(frameId, events.slice(0, TRACE_MAX_EVENTS).map(event => ({ ...event, pid })));
+
+        clearTimeout(trace.collectTimer);
+        trace.collectTimer = setTimeout(() => {
+            trace.collectTimer = null;
+            notifyPopup(MSG.TRACE_DATA, { tabId, trace: this.build(tabId) });
+        }, TRACE_COLLECT_DELAY);
+    },
+
+    metadata() {
+        const names = [
+            [TRACE_PID.EXTENSION, 'Extension messaging', ['Page → content script', 'Content script → service worker']],
+            [TRACE_PID.POPUP, 'Popup', ['Service worker → popup', 'Handlers and render']]
+        ];
+
+        return names.flatMap(([pid, process, threads]) => [
+            { name: 'process_name', ph: 'M', pid, args: { name: process } },
+            ...threads.map((thread, index) => ({ name: 'thread_name', ph: 'M', pid, tid: index + 1, args: { name: thread } }))
+        ]);
+    },
+
+    /**
+     * Full trace for a tab, rebased so the first event starts at zero
+     */
+    build(tabId) {
+        const trace = this.tabs.get(tabId);
+        const events = [...(trace?.events || []), ...[...(trace?.pages.values() || [])].flat()];
+
+        const timed = events.filter(event => event.ph !== 'M');
+        const origin = timed.reduce((min, event) => Math.min(min, event.ts), timed.length ? Infinity : 0);
+
+        return {
+            traceEvents: [
+                ...this.metadata(),
+                ...events.map(event => event.ph === 'M' ? event : { ...event, ts: event.ts - origin })
+            ],
+            displayTimeUnit: 'ms',
+            otherData: {
+                version: chrome.runtime.getManifest().version,
+                startedAt: new Date(origin / 1000).toISOString()
+            }
+        };
+    }
+};
 
 // ═══════════════════════════════════════════════════════════════════════════
 // DOWNLOADS
@@ -723,9 +2090,9 @@ function handleDownload(format, content, filename) {
 
 chrome.runtime.onInstalled.addListener((details) => {
     log.info(`Extension ${details.reason} (v${chrome.runtime.getManifest().version})`);
-    // Only initialize storage on fresh install, not on updates
-    if (details.reason === 'install') {
-        chrome.storage.local.set({ scanHistory: [] });
+    // History used to live in chrome.storage; move it over once on update
+    if (details.reason === 'update') {
+        ScanHistory.migrateLegacy();
     }
 });
 
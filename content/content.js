@@ -13,9 +13,14 @@
     // ═══════════════════════════════════════════════════════════════════════════
 
     const PREFIX = 'LMS_QA_';
+    // Element selector messages carry their own prefix on top of PREFIX
+    const SELECTOR_PREFIX = 'LMS_QA_SELECTOR_';
     
     const CMD = Object.freeze({
         SCAN: 'SCAN',
+        CANCEL_SCAN: 'CANCEL_SCAN',
+        START_MONITOR: 'START_MONITOR',
+        STOP_MONITOR: 'STOP_MONITOR',
         TEST_API: 'TEST_API',
         SET_COMPLETION: 'SET_COMPLETION',
         EXPORT: 'EXPORT',
@@ -25,6 +30,9 @@
         INJECT: 'INJECT',
         PING: 'PING',
         DETECT_APIS: 'DETECT_APIS',
+        ACTIVATE_SELECTOR: 'ACTIVATE_SELECTOR',
+        APPLY_RULE: 'APPLY_RULE',
+        GET_TRACE: 'GET_TRACE',
         GET_FRAME_INFO: 'GET_FRAME_INFO'
     });
 
@@ -33,9 +41,13 @@
     // ═══════════════════════════════════════════════════════════════════════════
 
     let isInjected = false;
+    let selectorLoading = null;
     const isTopFrame = window === window.top;
     const frameId = Math.random().toString(36).substr(2, 9);
 
+    // Chunked page transfers in progress: transfer id -> streaming UTF-8 decoder
+    const transfers = new Map();
+
     // ═══════════════════════════════════════════════════════════════════════════
     // LOGGING
     // ═══════════════════════════════════════════════════════════════════════════
@@ -56,12 +68,22 @@
             return;
         }
 
+        // LMS_QA.diff comes from the shared scan diff module; the validator
+        // still loads if it fails
+        const diff = document.createElement('script');
+        diff.src = chrome.runtime.getURL('lib/scan-diff.js');
+        diff.async = false;
+        diff.onload = diff.onerror = function() { this.remove(); };
+
         const script = document.createElement('script');
         script.src = chrome.runtime.getURL('lib/lms-qa-validator.js');
+        script.async = false;
         
         script.onload = function() {
             this.remove();
             isInjected = true;
+            // The validator keeps its resource cache in extension storage, through us
+            sendToPage('CMD_CACHE_CONNECT');
             log.info('Validator injected');
         };
         
@@ -70,7 +92,34 @@
             sendToExtension('INJECTION_FAILED', { error: 'Failed to load validator script' });
         };
 
-        (document.head || document.documentElement).appendChild(script);
+        (document.head || document.documentElement).append(diff, script);
+    }
+
+    /**
+     * Load the element selector once; resolves when it is listening
+     */
+    function injectSelector() {
+        if (!selectorLoading) {
+            selectorLoading = new Promise((resolve, reject) => {
+                const script = document.createElement('script');
+                script.src = chrome.runtime.getURL('lib/element-selector.js');
+
+                script.onload = function() {
+                    this.remove();
+                    log.info('Element selector injected');
+                    resolve();
+                };
+
+                script.onerror = function() {
+                    selectorLoading = null;
+                    log.error('Failed to inject element selector');
+                    reject(new Error('Failed to load element selector'));
+                };
+
+                (document.head || document.documentElement).appendChild(script);
+            });
+        }
+        return selectorLoading;
     }
 
     // ═══════════════════════════════════════════════════════════════════════════
@@ -84,18 +133,78 @@
         }, '*');
     }
 
-    function sendToExtension(type, payload = {}) {
-        chrome.runtime.sendMessage({
-            type,
-            payload,
-            url: window.location.href
-        }, (response) => {
+    /**
+     * trace: { sent, relayed } wall-clock ms for the page -> content script hop
+     */
+    function sendToExtension(type, payload = {}, trace = null) {
+        postToExtension({ type, payload, ...(trace && { trace }) });
+    }
+
+    function postToExtension(message) {
+        chrome.runtime.sendMessage({ ...message, url: window.location.href }, (response) => {
             if (chrome.runtime.lastError) {
                 log.debug(`Message error: ${chrome.runtime.lastError.message}`);
             }
         });
     }
 
+    /**
+     * Forward a page BATCH as one extension message
+     */
+    function forwardBatch(messages) {
+        const relayed = Date.now();
+        const forwarded = (messages || [])
+            .map(({ type, payload, timestamp }) => ({
+                type: type.replace(PREFIX, ''),
+                payload,
+                trace: { sent: timestamp, relayed }
+            }))
+            .filter(message => !message.type.startsWith('CMD_'));
+
+        if (forwarded.length > 0) postToExtension({ type: 'BATCH', messages: forwarded });
+    }
+
+    /**
+     * Decode one transferred ArrayBuffer chunk and forward it as text;
+     * extension messaging is JSON-only, so buffers cannot go further as-is
+     */
+    function forwardChunk({ id, index, count, messageType, timestamp, buffer }) {
+        if (!(buffer instanceof ArrayBuffer) || typeof messageType !== 'string') return;
+
+        let decoder = transfers.get(id);
+        if (!decoder) {
+            decoder = new TextDecoder();
+            transfers.set(id, decoder);
+        }
+
+        const last = index === count - 1;
+        const text = decoder.decode(buffer, { stream: !last });
+        if (last) transfers.delete(id);
+
+        postToExtension({
+            type: 'CHUNK',
+            id: `${frameId}:${id}`,
+            index,
+            count,
+            messageType: messageType.replace(PREFIX, ''),
+            text,
+            trace: { sent: timestamp, relayed: Date.now() }
+        });
+    }
+
+    /**
+     * Run a page cache request against the service worker's store and post the
+     * result back under the request's id
+     */
+    function forwardCacheRequest({ id, op, payload }) {
+        chrome.runtime.sendMessage({ type: 'CACHE_REQUEST', op, payload }, (response) => {
+            if (chrome.runtime.lastError) {
+                log.debug(`Cache request failed: ${chrome.runtime.lastError.message}`);
+            }
+            sendToPage('CMD_CACHE_REPLY', { id, result: response?.result ?? null });
+        });
+    }
+
     // ═══════════════════════════════════════════════════════════════════════════
     // PAGE MESSAGE HANDLER
     // Forwards messages from validator (page context) to extension
@@ -106,14 +215,20 @@
         if (!event.data?.type?.startsWith(PREFIX)) return;
 
         const { type, payload, timestamp } = event.data;
-        const messageType = type.replace(PREFIX, '');
+        const messageType = type.startsWith(SELECTOR_PREFIX)
+            ? type.slice(SELECTOR_PREFIX.length)
+            : type.replace(PREFIX, '');
 
         // Skip command messages (those go TO the page, not FROM it)
         if (messageType.startsWith('CMD_')) return;
 
         log.debug(`From page: ${messageType}`);
 
-        sendToExtension(messageType, payload);
+        if (messageType === 'BATCH') return forwardBatch(event.data.messages);
+        if (messageType === 'CHUNK') return forwardChunk(event.data);
+        if (messageType === 'CACHE_REQUEST') return forwardCacheRequest(event.data);
+
+        sendToExtension(messageType, payload, timestamp ? { sent: timestamp, relayed: Date.now() } : null);
     });
 
     // ═══════════════════════════════════════════════════════════════════════════
@@ -137,6 +252,26 @@
             return { success: true };
         },
 
+        [CMD.CANCEL_SCAN]: () => {
+            sendToPage('CMD_CANCEL_SCAN');
+            return { success: true };
+        },
+
+        [CMD.START_MONITOR]: () => {
+            if (!isInjected) {
+                injectValidator();
+                setTimeout(() => sendToPage('CMD_START_MONITOR'), 100);
+            } else {
+                sendToPage('CMD_START_MONITOR');
+            }
+            return { success: true };
+        },
+
+        [CMD.STOP_MONITOR]: () => {
+            sendToPage('CMD_STOP_MONITOR');
+            return { success: true };
+        },
+
         [CMD.TEST_API]: (message) => {
             sendToPage('CMD_TEST_API', { apiIndex: message.apiIndex || 0 });
             return { success: true };
@@ -152,7 +287,7 @@
         },
 
         [CMD.EXPORT]: (message) => {
-            sendToPage('CMD_EXPORT', { format: message.format || 'json' });
+            sendToPage('CMD_EXPORT', { format: message.format || 'json', profile: !!message.profile });
             return { success: true };
         },
 
@@ -161,8 +296,8 @@
             return { success: true };
         },
 
-        [CMD.GET_STATE]: () => {
-            sendToPage('CMD_GET_STATE');
+        [CMD.GET_STATE]: (message) => {
+            sendToPage('CMD_GET_STATE', { force: !!message.force });
             return { success: true };
         },
 
@@ -171,6 +306,35 @@
             return { success: true };
         },
 
+        [CMD.ACTIVATE_SELECTOR]: () => {
+            // The picker overlays the top page; it reaches same-origin frames itself
+            if (!isTopFrame) return { success: true, skipped: true };
+
+            injectSelector()
+                .then(() => sendToPage('CMD_ACTIVATE_SELECTOR'))
+                .catch(error => sendToExtension('EXTRACTION_ERROR', { error: error.message }));
+            return { success: true };
+        },
+
+        [CMD.APPLY_RULE]: (message) => {
+            // Compiled plans address iframes from the top document
+            if (!isTopFrame) return { success: true, skipped: true };
+            if (!message.rule) return { success: false, error: 'No rule' };
+
+            injectSelector()
+                .then(() => sendToPage('CMD_APPLY_RULE', { rule: message.rule }))
+                .catch(error => sendToExtension('EXTRACTION_ERROR', { error: error.message }));
+            return { success: true };
+        },
+
+        [CMD.GET_TRACE]: () => {
+            // Only frames that ran the validator have spans to report
+            if (!isInjected) return { success: true, skipped: true };
+
+            sendToPage('CMD_GET_TRACE');
+            return { success: true };
+        },
+
         [CMD.PING]: () => {
             return { success: true, injected: isInjected };
         },
@@ -63,9 +63,18 @@
         correctSelector: null,
         questionMatches: [],
         answerMatches: [],
-        correctMatches: []
+        correctMatches: [],
+        // Ranked selector candidates per pick target ('question' | 'answer' | 'correct')
+        candidates: {}
     };
 
+    // State fields and highlight class for each pick target
+    const PICK_TARGETS = Object.freeze({
+        question: { selected: 'selectedQuestion', selector: 'questionSelector', matches: 'questionMatches', matchClass: 'lms-qa-selector-match-question' },
+        answer: { selected: 'selectedAnswer', selector: 'answerSelector', matches: 'answerMatches', matchClass: 'lms-qa-selector-match-answer' },
+        correct: { selected: 'selectedCorrect', selector: 'correctSelector', matches: 'correctMatches', matchClass: 'lms-qa-selector-match-correct' }
+    });
+
     // ═══════════════════════════════════════════════════════════════════════════
     // DOM UTILITIES - Cross-frame element access
     // ═══════════════════════════════════════════════════════════════════════════
@@ -142,6 +151,38 @@
             return target;
         },
 
+        /**
+         * Whitespace-normalized text of an element without cloning it. Subtrees
+         * matching skipSelector are not entered, and the walk stops once the
+         * text is known to exceed maxLength (the result is then a prefix).
+         */
+        collectText(element, maxLength = Infinity, skipSelector = 'script, style') {
+            const doc = element.ownerDocument || document;
+            const walker = doc.createTreeWalker(
+                element,
+                NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT,
+                {
+                    acceptNode: node => node.nodeType === Node.ELEMENT_NODE && node.matches(skipSelector)
+                        ? NodeFilter.FILTER_REJECT
+                        : NodeFilter.FILTER_ACCEPT
+                }
+            );
+
+            let text = '';
+            while (walker.nextNode()) {
+                if (walker.currentNode.nodeType !== Node.TEXT_NODE) continue;
+
+                let piece = walker.currentNode.data.replace(/\s+/g, ' ');
+                if (text.endsWith(' ') && piece.startsWith(' ')) piece = piece.slice(1);
+                text += piece;
+
+                // At most one leading and one trailing space are trimmed later
+                if (text.length > maxLength + 2) break;
+            }
+
+            return text.trim();
+        },
+
         /**
          * Get the owner document of an element
          */
@@ -161,24 +202,179 @@
         }
     };
 
+    // ═══════════════════════════════════════════════════════════════════════════
+    // DOCUMENT ORDER INDEX
+    // Ordinal positions for matched elements, built once per extraction
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    const DocumentOrder = {
+        /**
+         * Build an ordinal index for the given elements with one TreeWalker pass
+         * per document. Ordinals are global across frames (main document first,
+         * then same-origin iframes) and the walk stops once every element is found.
+         */
+        build(elements, docs = DOMUtils.getAllDocuments()) {
+            const pending = new Set(elements);
+            const index = new Map();
+            let pos = 0;
+
+            for (const doc of docs) {
+                if (pending.size === 0) break;
+
+                const root = doc.body || doc.documentElement;
+                if (!root) continue;
+
+                const walker = doc.createTreeWalker(root, NodeFilter.SHOW_ELEMENT, null, false);
+                while (walker.nextNode()) {
+                    if (pending.delete(walker.currentNode)) {
+                        index.set(walker.currentNode, pos);
+                        if (pending.size === 0) break;
+                    }
+                    pos++;
+                }
+            }
+
+            return index;
+        },
+
+        /**
+         * Sort indexed elements by ordinal; elements missing from the index are dropped
+         */
+        rank(elements, index) {
+            const ranked = elements
+                .filter(el => index.has(el))
+                .sort((a, b) => index.get(a) - index.get(b));
+
+            return {
+                elements: ranked,
+                positions: ranked.map(el => index.get(el))
+            };
+        },
+
+        /**
+         * First slot in a sorted position list that is > value (or >= value if inclusive)
+         */
+        bisect(positions, value, inclusive = false) {
+            let lo = 0;
+            let hi = positions.length;
+
+            while (lo < hi) {
+                const mid = (lo + hi) >>> 1;
+                if (positions[mid] < value || (!inclusive && positions[mid] === value)) {
+                    lo = mid + 1;
+                } else {
+                    hi = mid;
+                }
+            }
+
+            return lo;
+        }
+    };
+
+    // ═══════════════════════════════════════════════════════════════════════════
+    // SPATIAL INDEX
+    // Element rects read in one layout pass, bucketed into a uniform grid
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    const SpatialIndex = {
+        // Per-element record in the table: center x, center y, bottom
+        STRIDE: 3,
+
+        /**
+         * Read every rect up front (no DOM writes in between, so layout runs once)
+         * and bucket element slots by the grid cell containing their center
+         */
+        build(elements, cellSize = 500) {
+            const table = new Float64Array(elements.length * this.STRIDE);
+
+            elements.forEach((el, slot) => {
+                const rect = el.getBoundingClientRect();
+                const offset = slot * this.STRIDE;
+                table[offset] = rect.left + rect.width / 2;
+                table[offset + 1] = rect.top + rect.height / 2;
+                table[offset + 2] = rect.bottom;
+            });
+
+            const cells = new Map();
+            for (let slot = 0; slot < elements.length; slot++) {
+                const offset = slot * this.STRIDE;
+                const key = this.cellKey(
+                    Math.floor(table[offset] / cellSize),
+                    Math.floor(table[offset + 1] / cellSize)
+                );
+                if (!cells.has(key)) cells.set(key, []);
+                cells.get(key).push(slot);
+            }
+
+            return { elements, table, cells, cellSize };
+        },
+
+        cellKey(col, row) {
+            return `${col}:${row}`;
+        },
+
+        centerX(index, slot) {
+            return index.table[slot * this.STRIDE];
+        },
+
+        centerY(index, slot) {
+            return index.table[slot * this.STRIDE + 1];
+        },
+
+        /**
+         * Slots whose center lies within rangeX/rangeY of (x, y), in ascending slot order
+         */
+        within(index, x, y, rangeX, rangeY) {
+            const { cells, cellSize } = index;
+            const found = [];
+
+            const colStart = Math.floor((x - rangeX) / cellSize);
+            const colEnd = Math.floor((x + rangeX) / cellSize);
+            const rowStart = Math.floor((y - rangeY) / cellSize);
+            const rowEnd = Math.floor((y + rangeY) / cellSize);
+
+            for (let col = colStart; col <= colEnd; col++) {
+                for (let row = rowStart; row <= rowEnd; row++) {
+                    const slots = cells.get(this.cellKey(col, row));
+                    if (!slots) continue;
+                    for (const slot of slots) {
+                        if (Math.abs(this.centerX(index, slot) - x) <= rangeX &&
+                            Math.abs(this.centerY(index, slot) - y) <= rangeY) {
+                            found.push(slot);
+                        }
+                    }
+                }
+            }
+
+            return found.sort((a, b) => a - b);
+        }
+    };
+
     // ═══════════════════════════════════════════════════════════════════════════
     // STYLES (injected into page)
     // ═══════════════════════════════════════════════════════════════════════════
 
     const STYLES = `
-        .${HIGHLIGHT_CLASS} {
+        /* Scoped under the overlay so it outranks the .lms-qa-selector-active * rule */
+        #${OVERLAY_ID} .${HIGHLIGHT_CLASS} {
+            position: fixed !important;
+            top: 0 !important;
+            left: 0 !important;
+            display: none;
+            box-sizing: border-box !important;
             outline: 3px solid #4CAF50 !important;
             outline-offset: 2px !important;
             background-color: rgba(76, 175, 80, 0.1) !important;
-            cursor: crosshair !important;
+            pointer-events: none !important;
+            will-change: transform, width, height;
         }
 
-        .${HIGHLIGHT_CLASS}.answer-mode {
+        #${OVERLAY_ID} .${HIGHLIGHT_CLASS}.answer-mode {
             outline-color: #2196F3 !important;
             background-color: rgba(33, 150, 243, 0.1) !important;
         }
 
-        .${HIGHLIGHT_CLASS}.correct-mode {
+        #${OVERLAY_ID} .${HIGHLIGHT_CLASS}.correct-mode {
             outline-color: #FF9800 !important;
             background-color: rgba(255, 152, 0, 0.1) !important;
         }
@@ -358,6 +554,28 @@
             margin-top: 4px !important;
         }
 
+        .lms-selector-candidates {
+            display: flex !important;
+            flex-wrap: wrap !important;
+            gap: 4px !important;
+            margin: 6px 0 0 28px !important;
+        }
+
+        .lms-selector-candidate {
+            padding: 2px 6px !important;
+            border: 1px solid #4a4a6a !important;
+            border-radius: 10px !important;
+            background: transparent !important;
+            color: #aaa !important;
+            font-size: 10px !important;
+            cursor: pointer !important;
+        }
+
+        .lms-selector-candidate.active {
+            border-color: #4CAF50 !important;
+            color: #4CAF50 !important;
+        }
+
         .lms-selector-selector-display {
             font-family: monospace !important;
             font-size: 10px !important;
@@ -484,6 +702,123 @@
         document.getElementById('lms-selector-styles')?.remove();
     }
 
+    // ═══════════════════════════════════════════════════════════════════════════
+    // SELECTOR EVALUATION CACHE
+    // querySelectorAll results keyed by (selector, document, mutation epoch)
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    const SelectorCache = {
+        observer: null,
+        epochs: new WeakMap(),
+        results: new WeakMap(),
+        listeners: new Set(),
+
+        /**
+         * Begin caching. Each observed document's epoch advances on any DOM change
+         * not made by the picker itself, which invalidates its cached results.
+         */
+        start() {
+            if (this.observer) return;
+            this.observer = new MutationObserver(records => this.handleMutations(records));
+        },
+
+        stop() {
+            this.observer?.disconnect();
+            this.observer = null;
+            this.epochs = new WeakMap();
+            this.results = new WeakMap();
+            this.listeners.clear();
+        },
+
+        watch(doc) {
+            if (!this.observer || this.epochs.has(doc) || !doc.documentElement) return;
+
+            this.epochs.set(doc, 0);
+            this.results.set(doc, new Map());
+            this.observer.observe(doc.documentElement, {
+                childList: true,
+                subtree: true,
+                attributes: true,
+                attributeOldValue: true
+            });
+        },
+
+        handleMutations(records) {
+            const changed = new Set();
+
+            for (const record of records) {
+                if (this.isOwnMutation(record)) continue;
+                const doc = record.target.ownerDocument || record.target;
+                changed.add(doc);
+            }
+
+            changed.forEach(doc => {
+                this.epochs.set(doc, (this.epochs.get(doc) || 0) + 1);
+                this.listeners.forEach(fn => fn(doc));
+            });
+        },
+
+        /**
+         * Changes made by the picker (panel, overlay, styles, highlight classes)
+         * do not affect what page selectors match
+         */
+        isOwnMutation(record) {
+            const target = record.target;
+            if (target.closest?.(`#${PANEL_ID}, #${OVERLAY_ID}`)) return true;
+
+            if (record.type === 'childList') {
+                const nodes = [...record.addedNodes, ...record.removedNodes];
+                return nodes.length > 0 && nodes.every(node =>
+                    node.id === PANEL_ID || node.id === OVERLAY_ID || node.id === 'lms-selector-styles'
+                );
+            }
+
+            const name = record.attributeName;
+            if (name === 'style' || name === 'unselectable' || name.startsWith('data-lms-')) return true;
+
+            if (name === 'class') {
+                const strip = value => (value || '').split(/\s+/)
+                    .filter(c => c && !c.startsWith('lms-qa-selector-') && c !== 'answer-mode' && c !== 'correct-mode')
+                    .join(' ');
+                return strip(record.oldValue) === strip(target.getAttribute('class'));
+            }
+
+            return false;
+        },
+
+        /**
+         * Elements matching selector in doc; cached until doc next changes.
+         * Invalid selectors yield an empty list.
+         */
+        query(selector, doc = document) {
+            this.watch(doc);
+
+            const cache = this.results.get(doc);
+            const epoch = this.epochs.get(doc);
+            const hit = cache?.get(selector);
+            if (hit && hit.epoch === epoch) return hit.elements;
+
+            let elements;
+            try {
+                elements = Array.from(doc.querySelectorAll(selector));
+            } catch (e) {
+                elements = [];
+            }
+
+            cache?.set(selector, { epoch, elements });
+            return elements;
+        },
+
+        count(selector, doc = document) {
+            return this.query(selector, doc).length;
+        },
+
+        onChange(fn) {
+            this.listeners.add(fn);
+            return () => this.listeners.delete(fn);
+        }
+    };
+
     // ═══════════════════════════════════════════════════════════════════════════
     // CSS SELECTOR GENERATION
     // ═══════════════════════════════════════════════════════════════════════════
@@ -583,11 +918,12 @@
 
             if (classes.length === 0) return null;
 
+            const doc = DOMUtils.getOwnerDoc(element);
+
             // Try single class first
             for (const cls of classes) {
                 const selector = `.${CSS.escape(cls)}`;
-                const matches = document.querySelectorAll(selector);
-                if (matches.length > 1 && matches.length < 50) {
+                if (this.isPattern(SelectorCache.count(selector, doc))) {
                     return selector;
                 }
             }
@@ -595,8 +931,7 @@
             // Try class combinations
             if (classes.length >= 2) {
                 const selector = classes.slice(0, 3).map(c => `.${CSS.escape(c)}`).join('');
-                const matches = document.querySelectorAll(selector);
-                if (matches.length > 1 && matches.length < 50) {
+                if (this.isPattern(SelectorCache.count(selector, doc))) {
                     return selector;
                 }
             }
@@ -624,9 +959,8 @@
             if (classes.length === 0) return null;
 
             const selector = `${tag}.${CSS.escape(classes[0])}`;
-            const matches = document.querySelectorAll(selector);
 
-            if (matches.length > 1 && matches.length < 50) {
+            if (this.isPattern(SelectorCache.count(selector, DOMUtils.getOwnerDoc(element)))) {
                 return selector;
             }
 
@@ -637,6 +971,7 @@
          * Get selector using data attributes
          */
         getDataAttrSelector(element) {
+            const doc = DOMUtils.getOwnerDoc(element);
             const dataAttrs = Array.from(element.attributes)
                 .filter(attr => attr.name.startsWith('data-'))
                 .filter(attr => !this.isDynamicValue(attr.value));
@@ -646,8 +981,7 @@
                 if (['data-type', 'data-role', 'data-component', 'data-question',
                      'data-answer', 'data-id', 'data-index'].includes(attr.name)) {
                     const selector = `[${attr.name}="${CSS.escape(attr.value)}"]`;
-                    const matches = document.querySelectorAll(selector);
-                    if (matches.length > 1 && matches.length < 50) {
+                    if (this.isPattern(SelectorCache.count(selector, doc))) {
                         return selector;
                     }
                 }
@@ -656,8 +990,7 @@
             // Try any data attribute without value (just presence)
             for (const attr of dataAttrs) {
                 const selector = `[${attr.name}]`;
-                const matches = document.querySelectorAll(selector);
-                if (matches.length > 1 && matches.length < 50) {
+                if (this.isPattern(SelectorCache.count(selector, doc))) {
                     return selector;
                 }
             }
@@ -685,9 +1018,9 @@
                 .filter(c => !this.isDynamicClass(c));
 
             if (parentClasses.length > 0) {
+                const doc = DOMUtils.getOwnerDoc(element);
                 const selector = `.${CSS.escape(parentClasses[0])} > ${tag}`;
-                const matches = document.querySelectorAll(selector);
-                if (matches.length > 1 && matches.length < 50) {
+                if (this.isPattern(SelectorCache.count(selector, doc))) {
                     return selector;
                 }
 
@@ -696,8 +1029,7 @@
                     .filter(c => !this.isDynamicClass(c));
                 if (childClasses.length > 0) {
                     const selector2 = `.${CSS.escape(parentClasses[0])} > .${CSS.escape(childClasses[0])}`;
-                    const matches2 = document.querySelectorAll(selector2);
-                    if (matches2.length > 1 && matches2.length < 50) {
+                    if (this.isPattern(SelectorCache.count(selector2, doc))) {
                         return selector2;
                     }
                 }
@@ -724,8 +1056,7 @@
             if (parentClasses.length > 0) {
                 const tag = element.tagName.toLowerCase();
                 const selector = `.${CSS.escape(parentClasses[0])} > ${tag}`;
-                const matches = document.querySelectorAll(selector);
-                if (matches.length > 1 && matches.length < 50) {
+                if (this.isPattern(SelectorCache.count(selector, DOMUtils.getOwnerDoc(element)))) {
                     return selector;
                 }
             }
@@ -734,35 +1065,39 @@
         },
 
         /**
-         * Find the best selector from candidates by testing match count
+         * A selector is a useful pattern when it matches a handful of elements
          */
-        findBest(candidates, targetElement) {
-            // Filter to only selectors that match the target
-            const valid = candidates.filter(c => {
-                try {
-                    const matches = document.querySelectorAll(c.selector);
-                    return Array.from(matches).includes(targetElement);
-                } catch {
-                    return false;
-                }
-            });
-
-            if (valid.length === 0) return null;
-
-            // Sort by number of matches (prefer more matches for patterns)
-            // but not too many (< 100)
-            valid.sort((a, b) => {
-                const aCount = document.querySelectorAll(a.selector).length;
-                const bCount = document.querySelectorAll(b.selector).length;
+        isPattern(count) {
+            return count > 1 && count < 50;
+        },
 
-                // Prefer selectors with 2-50 matches
-                const aScore = (aCount >= 2 && aCount <= 50) ? 100 - aCount : 0;
-                const bScore = (bCount >= 2 && bCount <= 50) ? 100 - bCount : 0;
+        /**
+         * Candidates that match the target, annotated with their live match count
+         * and ordered best first
+         */
+        rank(candidates, targetElement) {
+            const doc = DOMUtils.getOwnerDoc(targetElement);
+
+            return candidates
+                .map(c => {
+                    const matches = SelectorCache.query(c.selector, doc);
+                    return { ...c, count: matches.length, matchesTarget: matches.includes(targetElement) };
+                })
+                .filter(c => c.matchesTarget)
+                .map(c => ({ ...c, score: this.score(c.count) }))
+                .sort((a, b) => b.score - a.score);
+        },
 
-                return bScore - aScore;
-            });
+        // Prefer selectors with 2-50 matches, fewer being more specific
+        score(count) {
+            return (count >= 2 && count <= 50) ? 100 - count : 0;
+        },
 
-            return valid[0];
+        /**
+         * Find the best selector from candidates by testing match count
+         */
+        findBest(candidates, targetElement) {
+            return this.rank(candidates, targetElement)[0] || null;
         }
     };
 
@@ -822,6 +1157,8 @@
 
     const Panel = {
         element: null,
+        // Pending requestAnimationFrame id for a coalesced match-count refresh
+        refreshFrame: 0,
 
         create() {
             if (this.element) return;
@@ -850,6 +1187,7 @@
                         <div class="lms-selector-step-desc">Hover over questions, click to select<br><small style="color:#888;">Right-click to exclude false positives</small></div>
                         <div class="lms-selector-selector-display" id="question-selector"></div>
                         <div class="lms-selector-match-count" id="question-count"></div>
+                        <div class="lms-selector-candidates" id="question-candidates"></div>
                     </div>
 
                     <div class="lms-selector-step answer-step" id="step-answer">
@@ -860,6 +1198,7 @@
                         <div class="lms-selector-step-desc">Click an answer choice</div>
                         <div class="lms-selector-selector-display" id="answer-selector"></div>
                         <div class="lms-selector-match-count" id="answer-count"></div>
+                        <div class="lms-selector-candidates" id="answer-candidates"></div>
                     </div>
 
                     <div class="lms-selector-step correct-step" id="step-correct">
@@ -871,6 +1210,7 @@
                         <button class="lms-selector-skip-btn" id="skip-correct">Skip this step</button>
                         <div class="lms-selector-selector-display" id="correct-selector"></div>
                         <div class="lms-selector-match-count" id="correct-count"></div>
+                        <div class="lms-selector-candidates" id="correct-candidates"></div>
                     </div>
 
                     <div class="lms-selector-preview" id="preview-container" style="display: none;">
@@ -905,6 +1245,21 @@
                 Selector.showPreview();
             });
 
+            // Switch a completed step to another ranked selector
+            this.element.addEventListener('click', (e) => {
+                const chip = e.target.closest('.lms-selector-candidate');
+                if (!chip) return;
+
+                const target = chip.dataset.target;
+                const candidate = State.candidates[target]?.[Number(chip.dataset.index)];
+                if (!candidate) return;
+
+                Selector.applySelector(target, candidate);
+                this.renderCandidates();
+                this.update();
+                if (State.step === STEP.PREVIEW) Selector.showPreview();
+            });
+
             // Make panel draggable
             this.initDrag();
         },
@@ -995,6 +1350,50 @@
             skipBtn.style.display = State.step === STEP.PICK_CORRECT ? 'block' : 'none';
         },
 
+        /**
+         * Ranked alternatives for each completed step with their match counts
+         */
+        renderCandidates() {
+            if (!this.element) return;
+
+            Object.entries(PICK_TARGETS).forEach(([target, fields]) => {
+                const list = this.element.querySelector(`#${target}-candidates`);
+                const candidates = State.candidates[target] || [];
+
+                if (candidates.length < 2) {
+                    list.innerHTML = '';
+                    return;
+                }
+
+                list.innerHTML = candidates.map((c, index) => {
+                    const active = c.selector === State[fields.selector] ? ' active' : '';
+                    const title = c.selector.replace(/"/g, '&quot;').replace(/</g, '&lt;');
+                    return `<button class="lms-selector-candidate${active}" data-target="${target}" data-index="${index}" title="${title}">${c.strategy} · ${c.count}</button>`;
+                }).join('');
+            });
+        },
+
+        /**
+         * Recount candidates after page changes, at most once per frame.
+         * Unchanged documents are answered from the selector cache.
+         */
+        scheduleCandidateRefresh() {
+            if (this.refreshFrame) return;
+
+            this.refreshFrame = requestAnimationFrame(() => {
+                this.refreshFrame = 0;
+
+                Object.entries(PICK_TARGETS).forEach(([target, fields]) => {
+                    const doc = DOMUtils.getOwnerDoc(State[fields.selected]);
+                    (State.candidates[target] || []).forEach(c => {
+                        c.count = SelectorCache.count(c.selector, doc);
+                    });
+                });
+
+                this.renderCandidates();
+            });
+        },
+
         showPreview(questions, answers) {
             const container = this.element.querySelector('#preview-container');
             const list = this.element.querySelector('#preview-list');
@@ -1003,13 +1402,8 @@
 
             // Helper to extract clean text from element
             const getCleanText = (el) => {
-                // Clone and remove scripts/styles
-                const clone = el.cloneNode(true);
-                clone.querySelectorAll('script, style, [aria-hidden="true"]').forEach(n => n.remove());
-
-                // Get text, decode HTML entities, normalize whitespace
-                let text = clone.textContent || '';
-                text = text.replace(/\s+/g, ' ').trim();
+                // Skip scripts/styles/hidden content; entities can shorten the text, so read extra
+                let text = DOMUtils.collectText(el, 200, 'script, style, [aria-hidden="true"]');
 
                 // Decode common HTML entities
                 const textarea = document.createElement('textarea');
@@ -1068,6 +1462,9 @@
 
     const Selector = {
         overlay: null,
+        hoverBox: null,
+        hoverFrame: 0,
+        pointer: null,
 
         activate() {
             log('Activating selector');
@@ -1075,6 +1472,9 @@
             this.createOverlay();
             Panel.create();
 
+            SelectorCache.start();
+            this.unwatchCache = SelectorCache.onChange(() => Panel.scheduleCandidateRefresh());
+
             State.step = STEP.PICK_QUESTION;
             Panel.update();
 
@@ -1088,6 +1488,7 @@
             });
 
             document.addEventListener('mousemove', this.handleMouseMove);
+            window.addEventListener('scroll', this.handleScroll, { capture: true, passive: true });
             document.addEventListener('click', this.handleClick, true);
             document.addEventListener('contextmenu', this.handleContextMenu, true);
             document.addEventListener('keydown', this.handleKeydown);
@@ -1099,6 +1500,9 @@
             log('Deactivating selector');
 
             document.removeEventListener('mousemove', this.handleMouseMove);
+            window.removeEventListener('scroll', this.handleScroll, { capture: true });
+            cancelAnimationFrame(this.hoverFrame);
+            this.hoverFrame = 0;
             document.removeEventListener('click', this.handleClick, true);
             document.removeEventListener('contextmenu', this.handleContextMenu, true);
             document.removeEventListener('keydown', this.handleKeydown);
@@ -1116,6 +1520,10 @@
             this.overlay?.remove();
             Panel.destroy();
             removeStyles();
+            this.unwatchCache?.();
+            cancelAnimationFrame(Panel.refreshFrame);
+            Panel.refreshFrame = 0;
+            SelectorCache.stop();
 
             window.__LMS_SELECTOR_INJECTED__ = false;
 
@@ -1135,6 +1543,7 @@
             State.questionMatches = [];
             State.answerMatches = [];
             State.correctMatches = [];
+            State.candidates = {};
 
             // Reset panel UI
             Panel.element.querySelector('#step-question').classList.remove('completed');
@@ -1147,6 +1556,7 @@
             Panel.element.querySelector('#answer-count').textContent = '';
             Panel.element.querySelector('#correct-count').textContent = '';
             Panel.element.querySelector('#preview-container').style.display = 'none';
+            Panel.renderCandidates();
 
             Panel.update();
         },
@@ -1154,37 +1564,85 @@
         createOverlay() {
             this.overlay = document.createElement('div');
             this.overlay.id = OVERLAY_ID;
+
+            // Single box repositioned over the hovered element; page elements are never restyled
+            this.hoverBox = document.createElement('div');
+            this.hoverBox.className = HIGHLIGHT_CLASS;
+            this.overlay.appendChild(this.hoverBox);
+
             document.body.appendChild(this.overlay);
         },
 
+        // Mouse moves only record the pointer; the hover update runs once per frame
         handleMouseMove: (e) => {
-            if (State.step === STEP.PREVIEW || State.step === STEP.DONE) return;
+            Selector.pointer = { x: e.clientX, y: e.clientY };
+            Selector.scheduleHover();
+        },
+
+        // Scrolling moves the hovered element under a still pointer
+        handleScroll: () => {
+            if (Selector.pointer) Selector.scheduleHover();
+        },
 
+        scheduleHover() {
+            if (!this.hoverFrame) {
+                this.hoverFrame = requestAnimationFrame(() => this.updateHover());
+            }
+        },
+
+        updateHover() {
+            this.hoverFrame = 0;
+            if (State.step === STEP.PREVIEW || State.step === STEP.DONE || !this.pointer) return;
+
+            // Read phase: hit test and geometry, before any style writes
             // Use DOMUtils to also check same-origin iframes
-            const target = DOMUtils.elementFromPoint(e.clientX, e.clientY);
+            const target = DOMUtils.elementFromPoint(this.pointer.x, this.pointer.y);
 
             // Ignore our own UI elements
             if (!target || target.closest(`#${PANEL_ID}`)) {
-                Selector.clearHover();
+                this.clearHover();
                 return;
             }
 
             // Ignore tiny elements and structural elements
-            if (Selector.shouldIgnoreElement(target)) {
-                Selector.clearHover();
+            const rect = target.getBoundingClientRect();
+            if (this.shouldIgnoreElement(target, rect)) {
+                this.clearHover();
                 return;
             }
 
-            if (target !== State.hoveredElement) {
-                Selector.clearHover();
-                State.hoveredElement = target;
+            const frameOffset = this.getFrameOffset(target);
+
+            // Write phase
+            State.hoveredElement = target;
 
-                let highlightClass = HIGHLIGHT_CLASS;
-                if (State.step === STEP.PICK_ANSWER) highlightClass += ' answer-mode';
-                if (State.step === STEP.PICK_CORRECT) highlightClass += ' correct-mode';
+            let mode = '';
+            if (State.step === STEP.PICK_ANSWER) mode = ' answer-mode';
+            if (State.step === STEP.PICK_CORRECT) mode = ' correct-mode';
 
-                target.classList.add(...highlightClass.split(' '));
+            const box = this.hoverBox;
+            box.className = HIGHLIGHT_CLASS + mode;
+            box.style.width = `${rect.width}px`;
+            box.style.height = `${rect.height}px`;
+            box.style.transform = `translate(${rect.left + frameOffset.x}px, ${rect.top + frameOffset.y}px)`;
+            box.style.display = 'block';
+        },
+
+        /**
+         * Offset of the element's iframe in the top document (rects are frame-relative)
+         */
+        getFrameOffset(element) {
+            const offset = { x: 0, y: 0 };
+            let frame = DOMUtils.isInIframe(element) ? element.ownerDocument.defaultView?.frameElement : null;
+
+            while (frame) {
+                const rect = frame.getBoundingClientRect();
+                offset.x += rect.left + frame.clientLeft;
+                offset.y += rect.top + frame.clientTop;
+                frame = frame.ownerDocument.defaultView?.frameElement || null;
             }
+
+            return offset;
         },
 
         handleClick: (e) => {
@@ -1248,11 +1706,10 @@
             }
         },
 
-        shouldIgnoreElement(el) {
+        shouldIgnoreElement(el, rect = el?.getBoundingClientRect()) {
             if (!el) return true;
             if (el === document.body || el === document.documentElement) return true;
 
-            const rect = el.getBoundingClientRect();
             if (rect.width < 20 || rect.height < 10) return true;
 
             const tag = el.tagName.toLowerCase();
@@ -1262,10 +1719,8 @@
         },
 
         clearHover() {
-            if (State.hoveredElement) {
-                State.hoveredElement.classList.remove(HIGHLIGHT_CLASS, 'answer-mode', 'correct-mode');
-                State.hoveredElement = null;
-            }
+            State.hoveredElement = null;
+            if (this.hoverBox) this.hoverBox.style.display = 'none';
         },
 
         clearHighlights() {
@@ -1284,52 +1739,64 @@
         },
 
         selectElement(element) {
-            const candidates = SelectorGenerator.generate(element);
-            const best = SelectorGenerator.findBest(candidates, element);
+            const candidates = SelectorGenerator.rank(SelectorGenerator.generate(element), element);
+            const best = candidates[0];
 
             if (!best) {
                 log('Could not generate selector for element', element);
                 return;
             }
 
-            const selector = best.selector;
-            // Query the element's owner document (handles elements from iframes)
-            const ownerDoc = DOMUtils.getOwnerDoc(element);
-            const matches = Array.from(ownerDoc.querySelectorAll(selector));
+            const target = State.step === STEP.PICK_QUESTION ? 'question'
+                : State.step === STEP.PICK_ANSWER ? 'answer'
+                : State.step === STEP.PICK_CORRECT ? 'correct'
+                : null;
+            if (!target) return;
+
+            State[PICK_TARGETS[target].selected] = element;
+            State.candidates[target] = candidates;
+            this.applySelector(target, best);
 
-            log(`Selected: ${selector} (${matches.length} matches, iframe: ${DOMUtils.isInIframe(element)})`);
+            log(`Selected: ${best.selector} (${best.count} matches, iframe: ${DOMUtils.isInIframe(element)})`);
 
             switch (State.step) {
                 case STEP.PICK_QUESTION:
-                    State.selectedQuestion = element;
-                    State.questionSelector = selector;
-                    State.questionMatches = matches;
-                    matches.forEach(el => el.classList.add('lms-qa-selector-match-question'));
                     State.step = STEP.PICK_ANSWER;
                     break;
 
                 case STEP.PICK_ANSWER:
-                    State.selectedAnswer = element;
-                    State.answerSelector = selector;
-                    State.answerMatches = matches;
-                    matches.forEach(el => el.classList.add('lms-qa-selector-match-answer'));
                     State.step = STEP.PICK_CORRECT;
                     break;
 
                 case STEP.PICK_CORRECT:
-                    State.selectedCorrect = element;
-                    State.correctSelector = selector;
-                    State.correctMatches = matches;
-                    matches.forEach(el => el.classList.add('lms-qa-selector-match-correct'));
                     State.step = STEP.PREVIEW;
                     this.showPreview();
                     break;
             }
 
             this.clearHover();
+            Panel.renderCandidates();
             Panel.update();
         },
 
+        /**
+         * Use a candidate selector for a pick target, replacing its match highlights.
+         * Matches come from the selector cache, so switching candidates is cheap.
+         */
+        applySelector(target, candidate) {
+            const fields = PICK_TARGETS[target];
+
+            State[fields.matches].forEach(el => el.classList.remove(fields.matchClass));
+
+            // Query the element's owner document (handles elements from iframes)
+            const ownerDoc = DOMUtils.getOwnerDoc(State[fields.selected]);
+            const matches = SelectorCache.query(candidate.selector, ownerDoc).slice();
+
+            State[fields.selector] = candidate.selector;
+            State[fields.matches] = matches;
+            matches.forEach(el => el.classList.add(fields.matchClass));
+        },
+
         showPreview() {
             Panel.showPreview(State.questionMatches, State.answerMatches);
         },
@@ -1344,12 +1811,16 @@
                 questionSelector: State.questionSelector,
                 answerSelector: State.answerSelector,
                 correctSelector: State.correctSelector || null,
+                grouping: 'auto',
                 urlPattern: URLMatcher.getPatternKey(),
                 created: new Date().toISOString(),
                 questionCount: State.questionMatches.length,
                 answerCount: State.answerMatches.length
             };
 
+            // Compile while the picked elements are on screen so the first reuse is a fast path
+            rule.plan = RuleCompiler.compile(rule);
+
             log('Saving rule', rule);
 
             // Send to extension for storage
@@ -1372,12 +1843,205 @@
         }
     };
 
+    // ═══════════════════════════════════════════════════════════════════════════
+    // RULE COMPILER
+    // Turns a saved rule into a reusable extraction plan
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    const RuleCompiler = {
+        VERSION: 1,
+        MAX_CONTAINER_DEPTH: 10,
+
+        /**
+         * Identity of the rule a plan was compiled from
+         */
+        keyOf(rule) {
+            return [
+                this.VERSION,
+                rule.questionSelector,
+                rule.answerSelector,
+                rule.correctSelector || '',
+                rule.grouping || 'auto'
+            ].join('\n');
+        },
+
+        /**
+         * Compile a rule against the current page. Records which frames hold
+         * questions and, when every answer sits inside a fixed ancestor of exactly
+         * one question, the depth of that ancestor so extraction can skip
+         * proximity grouping.
+         */
+        compile(rule) {
+            const frames = [];
+            const questions = [];
+            const answers = [];
+
+            this.getFrameTargets().forEach(target => {
+                const found = this.query(target.doc, rule.questionSelector);
+                if (found.length === 0) return;
+
+                frames.push({ index: target.index, src: target.src });
+                questions.push(...found);
+                answers.push(...this.query(target.doc, rule.answerSelector));
+            });
+
+            const containerDepth = rule.grouping === 'proximity'
+                ? 0
+                : this.findContainerDepth(questions, answers);
+
+            return {
+                version: this.VERSION,
+                key: this.keyOf(rule),
+                questionSelector: rule.questionSelector,
+                answerSelector: rule.answerSelector,
+                correctSelector: rule.correctSelector || null,
+                frames,
+                grouping: containerDepth > 0 ? 'descendant' : 'proximity',
+                containerDepth,
+                compiled: new Date().toISOString()
+            };
+        },
+
+        /**
+         * Use the rule's cached plan when it still fits the page, otherwise compile one
+         */
+        resolve(rule) {
+            const cached = rule.plan;
+            if (cached?.version === this.VERSION && cached.key === this.keyOf(rule)) {
+                const docs = this.resolveDocuments(cached);
+                if (docs) return { plan: cached, docs, fresh: false };
+            }
+
+            const plan = this.compile(rule);
+            return { plan, docs: this.resolveDocuments(plan) || [], fresh: true };
+        },
+
+        /**
+         * Main document plus accessible iframes, identified by position and path
+         */
+        getFrameTargets() {
+            const targets = [{ index: -1, src: null, doc: document }];
+
+            document.querySelectorAll('iframe').forEach((iframe, index) => {
+                try {
+                    if (iframe.contentDocument) {
+                        targets.push({ index, src: this.framePath(iframe), doc: iframe.contentDocument });
+                    }
+                } catch (e) {
+                    // Cross-origin iframe - can't access
+                }
+            });
+
+            return targets;
+        },
+
+        framePath(iframe) {
+            try {
+                const url = new URL(iframe.src, window.location.href);
+                return url.origin + url.pathname;
+            } catch (e) {
+                return iframe.getAttribute('src') || '';
+            }
+        },
+
+        /**
+         * Documents for a plan's frame targets, or null if any frame moved or closed
+         */
+        resolveDocuments(plan) {
+            if (!plan.frames?.length) return null;
+
+            const iframes = document.querySelectorAll('iframe');
+            const docs = [];
+
+            for (const frame of plan.frames) {
+                if (frame.index === -1) {
+                    docs.push(document);
+                    continue;
+                }
+
+                const iframe = iframes[frame.index];
+                if (!iframe || this.framePath(iframe) !== frame.src) return null;
+
+                try {
+                    if (!iframe.contentDocument) return null;
+                    docs.push(iframe.contentDocument);
+                } catch (e) {
+                    return null;
+                }
+            }
+
+            return docs;
+        },
+
+        query(doc, selector) {
+            try {
+                return Array.from(doc.querySelectorAll(selector));
+            } catch (e) {
+                // Invalid selector or access denied
+                return [];
+            }
+        },
+
+        queryAll(docs, selector) {
+            return docs.flatMap(doc => this.query(doc, selector));
+        },
+
+        ancestorAt(element, depth) {
+            let node = element;
+            for (let i = 0; i < depth && node; i++) {
+                node = node.parentElement;
+            }
+            return node;
+        },
+
+        /**
+         * Smallest ancestor depth that gives each question its own container
+         * holding all of its answers (0 if none does)
+         */
+        findContainerDepth(questions, answers) {
+            if (questions.length === 0 || answers.length === 0) return 0;
+
+            for (let depth = 1; depth <= this.MAX_CONTAINER_DEPTH; depth++) {
+                if (this.isolatesQuestions(questions, answers, depth)) return depth;
+            }
+
+            return 0;
+        },
+
+        isolatesQuestions(questions, answers, depth) {
+            const containers = new Set();
+
+            for (const question of questions) {
+                const container = this.ancestorAt(question, depth);
+                if (!container || container === container.ownerDocument.body || containers.has(container)) {
+                    return false;
+                }
+                containers.add(container);
+            }
+
+            // Containers must not nest, or the outer one would hold two questions
+            const countContainers = (element) => {
+                let count = 0;
+                for (let node = element.parentElement; node; node = node.parentElement) {
+                    if (containers.has(node)) count++;
+                }
+                return count;
+            };
+
+            return questions.every(q => countContainers(q) === 1) &&
+                answers.every(a => countContainers(a) === 1);
+        }
+    };
+
     // ═══════════════════════════════════════════════════════════════════════════
     // RULE EXTRACTOR
     // Uses saved selectors to extract Q&A with proximity-based grouping
     // ═══════════════════════════════════════════════════════════════════════════
 
     const RuleExtractor = {
+        // Element -> cleaned text, reset per extraction so edits between runs are seen
+        textMemo: new WeakMap(),
+
         /**
          * Apply a saved rule to extract Q&A from the current page
          */
@@ -1388,23 +2052,36 @@
             }
 
             log('Applying rule', rule);
+            this.textMemo = new WeakMap();
 
             try {
-                // Find all question and answer elements (also searches same-origin iframes)
-                const questionElements = DOMUtils.querySelectorAll(rule.questionSelector);
-                const answerElements = DOMUtils.querySelectorAll(rule.answerSelector);
-                const correctElements = rule.correctSelector
-                    ? DOMUtils.querySelectorAll(rule.correctSelector)
-                    : [];
-
-                log(`Found: ${questionElements.length} questions, ${answerElements.length} answers, ${correctElements.length} correct indicators`);
+                // Compiled plan names the frames to search and how answers are grouped
+                const { plan, docs, fresh } = RuleCompiler.resolve(rule);
+                const questionElements = RuleCompiler.queryAll(docs, plan.questionSelector);
 
                 if (questionElements.length === 0) {
                     return { success: false, error: 'No questions found with saved selector' };
                 }
 
-                // Group answers with their questions using DOM proximity
-                const qaGroups = this.groupByProximity(questionElements, answerElements, correctElements);
+                // Fast path: answers live inside each question's container
+                let qaGroups = plan.grouping === 'descendant'
+                    ? this.groupByContainer(questionElements, plan)
+                    : null;
+
+                if (!qaGroups) {
+                    const answerElements = RuleCompiler.queryAll(docs, plan.answerSelector);
+                    const correctElements = plan.correctSelector
+                        ? RuleCompiler.queryAll(docs, plan.correctSelector)
+                        : [];
+
+                    log(`Found: ${questionElements.length} questions, ${answerElements.length} answers, ${correctElements.length} correct indicators`);
+
+                    // Index document order once for every matched element across frames
+                    const order = DocumentOrder.build([...questionElements, ...answerElements], docs);
+
+                    // Group answers with their questions using DOM proximity
+                    qaGroups = this.groupByProximity(questionElements, answerElements, correctElements, order);
+                }
 
                 // Convert to flat item list for compatibility with existing renderer
                 const items = this.groupsToItems(qaGroups);
@@ -1428,7 +2105,7 @@
                 };
 
                 log('Extraction complete', results);
-                return { success: true, results, qaGroups };
+                return { success: true, results, qaGroups, plan, compiled: fresh };
 
             } catch (error) {
                 log('Extraction error', error);
@@ -1440,13 +2117,23 @@
          * Group answers with questions based on DOM proximity
          * Uses multiple strategies: common ancestor, document order, spatial position
          */
-        groupByProximity(questions, answers, correctIndicators) {
+        groupByProximity(questions, answers, correctIndicators, order = DocumentOrder.build([...questions, ...answers])) {
             const groups = [];
             const usedAnswers = new Set();
 
             // Create a set of correct answer elements for quick lookup
             const correctSet = new Set(correctIndicators);
 
+            // Answers sorted by document order, so each question's range is a slice
+            const rankedAnswers = DocumentOrder.rank(answers, order);
+
+            // Every element that is or contains an answer, for container lookups
+            const answerAncestors = this.buildAnswerAncestors(answers);
+
+            // Answer rects are only needed for the spatial fallback; read them once, lazily
+            let spatial = null;
+            const getSpatial = () => spatial || (spatial = SpatialIndex.build(answers));
+
             // For each question, find its associated answers
             questions.forEach((questionEl, qIndex) => {
                 const group = {
@@ -1460,17 +2147,16 @@
                 };
 
                 // Strategy 1: Find answers within same container
-                const container = this.findCommonContainer(questionEl, answers);
+                const container = this.findCommonContainer(questionEl, answers, answerAncestors);
 
                 // Strategy 2: Find answers by document order (between this Q and next Q)
                 const nextQuestion = questions[qIndex + 1];
-                const answersInRange = this.findAnswersBetween(questionEl, nextQuestion, answers, usedAnswers);
-
-                // Strategy 3: Find answers by spatial proximity
-                const nearbyAnswers = this.findNearbyAnswers(questionEl, answers, usedAnswers);
+                const answersInRange = this.findAnswersBetween(questionEl, nextQuestion, rankedAnswers, usedAnswers, order);
 
-                // Combine strategies, preferring document order
-                let associatedAnswers = answersInRange.length > 0 ? answersInRange : nearbyAnswers;
+                // Strategy 3: Fall back to spatial proximity only when document order finds nothing
+                let associatedAnswers = answersInRange.length > 0
+                    ? answersInRange
+                    : this.findNearbyAnswers(questionEl, answers, usedAnswers, 500, getSpatial());
 
                 // If we found a common container, filter to only answers in that container
                 if (container && container !== document.body) {
@@ -1498,23 +2184,67 @@
             return groups;
         },
 
+        /**
+         * Group using a descendant plan: each question's answers are the matches
+         * inside its container. Returns null if the page no longer fits the plan.
+         */
+        groupByContainer(questions, plan) {
+            const groups = [];
+            const containers = new Set();
+            let answerCount = 0;
+
+            for (let qIndex = 0; qIndex < questions.length; qIndex++) {
+                const questionEl = questions[qIndex];
+                const container = RuleCompiler.ancestorAt(questionEl, plan.containerDepth);
+                if (!container || containers.has(container)) return null;
+                containers.add(container);
+
+                const answers = RuleCompiler.query(container, plan.answerSelector);
+                const correctIndicators = plan.correctSelector
+                    ? RuleCompiler.query(container, plan.correctSelector)
+                    : [];
+                const correctSet = new Set(correctIndicators);
+                answerCount += answers.length;
+
+                groups.push({
+                    questionIndex: qIndex,
+                    question: {
+                        text: this.getElementText(questionEl),
+                        element: questionEl,
+                        confidence: 95
+                    },
+                    answers: answers.map(answerEl => ({
+                        text: this.getElementText(answerEl),
+                        element: answerEl,
+                        correct: this.isAnswerCorrect(answerEl, correctSet, correctIndicators),
+                        confidence: 90
+                    }))
+                });
+            }
+
+            log(`Found: ${questions.length} questions, ${answerCount} answers (descendant plan, depth ${plan.containerDepth})`);
+
+            return answerCount > 0 ? groups : null;
+        },
+
         /**
          * Find answers that appear between this question and the next in document order
          */
-        findAnswersBetween(questionEl, nextQuestionEl, allAnswers, usedAnswers) {
+        findAnswersBetween(questionEl, nextQuestionEl, rankedAnswers, usedAnswers, order) {
             const result = [];
 
             // Get document position of elements
-            const qPos = this.getDocumentPosition(questionEl);
-            const nextQPos = nextQuestionEl ? this.getDocumentPosition(nextQuestionEl) : Infinity;
-
-            for (const answer of allAnswers) {
-                if (usedAnswers.has(answer)) continue;
+            const qPos = this.getDocumentPosition(questionEl, order);
+            const nextQPos = nextQuestionEl ? this.getDocumentPosition(nextQuestionEl, order) : Infinity;
+            if (qPos === Infinity) return result;
 
-                const aPos = this.getDocumentPosition(answer);
+            // Answer must be after this question and before next question
+            const start = DocumentOrder.bisect(rankedAnswers.positions, qPos);
+            const end = DocumentOrder.bisect(rankedAnswers.positions, nextQPos, true);
 
-                // Answer must be after this question and before next question
-                if (aPos > qPos && aPos < nextQPos) {
+            for (let i = start; i < end; i++) {
+                const answer = rankedAnswers.elements[i];
+                if (!usedAnswers.has(answer)) {
                     result.push(answer);
                 }
             }
@@ -1525,49 +2255,62 @@
         /**
          * Find answers that are spatially close to the question
          */
-        findNearbyAnswers(questionEl, allAnswers, usedAnswers, maxDistance = 500) {
+        findNearbyAnswers(questionEl, allAnswers, usedAnswers, maxDistance = 500, spatial = SpatialIndex.build(allAnswers)) {
             const qRect = questionEl.getBoundingClientRect();
-            const qCenter = {
-                x: qRect.left + qRect.width / 2,
-                y: qRect.top + qRect.height / 2
-            };
+            const qCenterX = qRect.left + qRect.width / 2;
 
             const withDistance = [];
 
-            for (const answer of allAnswers) {
-                if (usedAnswers.has(answer)) continue;
+            // Horizontal offsets are half-weighted, so the search box is twice as wide as tall
+            const candidates = SpatialIndex.within(spatial, qCenterX, qRect.bottom, maxDistance * 2, maxDistance);
 
-                const aRect = answer.getBoundingClientRect();
-                const aCenter = {
-                    x: aRect.left + aRect.width / 2,
-                    y: aRect.top + aRect.height / 2
-                };
+            for (const slot of candidates) {
+                const answer = spatial.elements[slot];
+                if (usedAnswers.has(answer)) continue;
 
                 // Prefer vertical proximity (answers usually below questions)
-                const distance = Math.abs(aCenter.y - qRect.bottom) + Math.abs(aCenter.x - qCenter.x) * 0.5;
+                const distance = Math.abs(SpatialIndex.centerY(spatial, slot) - qRect.bottom) +
+                    Math.abs(SpatialIndex.centerX(spatial, slot) - qCenterX) * 0.5;
 
                 if (distance < maxDistance) {
                     withDistance.push({ element: answer, distance });
                 }
             }
 
-            // Sort by distance and return elements
+            // Sort by distance and return elements (slot order breaks ties, as before)
             withDistance.sort((a, b) => a.distance - b.distance);
             return withDistance.map(w => w.element);
         },
 
+        /**
+         * Collect each answer and all of its ancestors. Chains are shared, so the
+         * walk stops at the first ancestor already recorded by an earlier answer.
+         */
+        buildAnswerAncestors(answers) {
+            const ancestors = new Set();
+
+            for (const answer of answers) {
+                let node = answer;
+                while (node && !ancestors.has(node)) {
+                    ancestors.add(node);
+                    node = node.parentElement;
+                }
+            }
+
+            return ancestors;
+        },
+
         /**
          * Find the smallest common container for a question and potential answers
          */
-        findCommonContainer(questionEl, answers) {
+        findCommonContainer(questionEl, answers, answerAncestors = this.buildAnswerAncestors(answers)) {
             let container = questionEl.parentElement;
             let depth = 0;
             const maxDepth = 10;
 
             while (container && container !== document.body && depth < maxDepth) {
-                // Check if this container has any answers
-                const answersInContainer = answers.filter(a => container.contains(a));
-                if (answersInContainer.length > 0) {
+                // A container holds an answer exactly when it is on some answer's ancestor chain
+                if (answerAncestors.has(container)) {
                     return container;
                 }
                 container = container.parentElement;
@@ -1615,46 +2358,26 @@
         },
 
         /**
-         * Get document position for ordering elements
+         * Get document position for ordering elements (Infinity if not indexed)
          */
-        getDocumentPosition(element) {
-            let pos = 0;
-            const walker = document.createTreeWalker(
-                document.body,
-                NodeFilter.SHOW_ELEMENT,
-                null,
-                false
-            );
-
-            while (walker.nextNode()) {
-                if (walker.currentNode === element) {
-                    return pos;
-                }
-                pos++;
-            }
-
-            return pos;
+        getDocumentPosition(element, order) {
+            return order.get(element) ?? Infinity;
         },
 
         /**
          * Get clean text content from an element
          */
         getElementText(element) {
-            // Clone to avoid modifying original
-            const clone = element.cloneNode(true);
-
-            // Remove script and style elements
-            clone.querySelectorAll('script, style').forEach(el => el.remove());
+            if (this.textMemo.has(element)) return this.textMemo.get(element);
 
-            // Get text and clean it up
-            let text = clone.textContent || clone.innerText || '';
-            text = text.replace(/\s+/g, ' ').trim();
+            let text = DOMUtils.collectText(element, 500);
 
             // Limit length
             if (text.length > 500) {
                 text = text.substring(0, 497) + '...';
             }
 
+            this.textMemo.set(element, text);
             return text;
         },
 
@@ -1712,7 +2435,13 @@
         if (event.source !== window) return;
         if (!event.data?.type?.startsWith('LMS_QA_')) return;
 
-        const type = event.data.type.replace('LMS_QA_', '');
+        // The validator posts messages sent in the same tick as one BATCH
+        const messages = event.data.type === 'LMS_QA_BATCH' ? event.data.messages || [] : [event.data];
+        messages.forEach(handlePageMessage);
+    });
+
+    function handlePageMessage(data) {
+        const type = data.type.replace('LMS_QA_', '');
 
         switch (type) {
             case 'CMD_ACTIVATE_SELECTOR':
@@ -1724,9 +2453,17 @@
                 break;
 
             case 'CMD_APPLY_RULE':
-                const payload = event.data.payload || {};
+                const payload = data.payload || {};
                 const result = RuleExtractor.extract(payload.rule);
 
+                // Let the service worker cache a plan compiled for this visit
+                if (result.compiled) {
+                    Selector.sendMessage('RULE_COMPILED', {
+                        urlPattern: payload.rule.urlPattern || URLMatcher.getPatternKey(),
+                        plan: result.plan
+                    });
+                }
+
                 if (result.success) {
                     if (payload.hybrid) {
                         // Store results and request API detection
@@ -1753,7 +2490,7 @@
             case 'APIS_DETECTED':
                 // Merge API results with pending Q&A extraction
                 if (pendingHybridResults) {
-                    const apis = event.data.payload?.apis || [];
+                    const apis = data.payload?.apis || [];
                     log(`Hybrid mode: merging ${apis.length} API(s) with extraction results`);
 
                     // Merge APIs into results
@@ -1769,7 +2506,7 @@
                 }
                 break;
         }
-    });
+    }
 
     // ═══════════════════════════════════════════════════════════════════════════
     // PUBLIC API
@@ -1785,7 +2522,9 @@
             questionSelector: qSel,
             answerSelector: aSel,
             correctSelector: cSel
-        })
+        }),
+        // Not part of the API; lets the test suite reach internal helpers
+        _internals: Object.freeze({ DocumentOrder, RuleExtractor, SelectorCache, SelectorGenerator })
     };
 
     // ═══════════════════════════════════════════════════════════════════════════
@@ -32,7 +32,13 @@
         MAX_RECURSION_DEPTH: 20,
         MAX_API_SEARCH_DEPTH: 7,
         MAX_FETCH_TIMEOUT: 5000,
+        MAX_CONCURRENT_FETCHES: 8,
+        MAX_FETCHES_PER_HOST: 6,
         MAX_RESOURCES: 100,
+        MAX_ANALYSIS_TIME: 15000,
+        MAX_ANALYSIS_BYTES: 10 * 1024 * 1024,
+        // Larger files are fetched every time rather than sent to the extension cache
+        CACHE_MAX_ENTRY_BYTES: 8 * 1024 * 1024,
         MAX_LOGS: 500,
         DEBOUNCE_DELAY: 150
     });
@@ -85,6 +91,7 @@
         SCAN_STARTED: 'SCAN_STARTED',
         SCAN_COMPLETE: 'SCAN_COMPLETE',
         SCAN_ERROR: 'SCAN_ERROR',
+        SCAN_PARTIAL: 'SCAN_PARTIAL',
         PROGRESS: 'PROGRESS',
         STATE: 'STATE',
         CMI_DATA: 'CMI_DATA',
@@ -92,6 +99,7 @@
         SET_COMPLETION_RESULT: 'SET_COMPLETION_RESULT',
         AUTO_SELECT_RESULT: 'AUTO_SELECT_RESULT',
         CMD_SCAN: 'LMS_QA_CMD_SCAN',
+        CMD_CANCEL_SCAN: 'LMS_QA_CMD_CANCEL_SCAN',
         CMD_TEST_API: 'LMS_QA_CMD_TEST_API',
         CMD_SET_COMPLETION: 'LMS_QA_CMD_SET_COMPLETION',
         CMD_GET_STATE: 'LMS_QA_CMD_GET_STATE',
@@ -99,7 +107,28 @@
         CMD_AUTO_SELECT: 'LMS_QA_CMD_AUTO_SELECT',
         CMD_EXPORT: 'LMS_QA_CMD_EXPORT',
         CMD_DETECT_APIS: 'LMS_QA_CMD_DETECT_APIS',
-        APIS_DETECTED: 'APIS_DETECTED'
+        CMD_START_MONITOR: 'LMS_QA_CMD_START_MONITOR',
+        CMD_STOP_MONITOR: 'LMS_QA_CMD_STOP_MONITOR',
+        CMD_DIFF: 'LMS_QA_CMD_DIFF',
+        CMD_GET_TRACE: 'LMS_QA_CMD_GET_TRACE',
+        CMD_CACHE_CONNECT: 'LMS_QA_CMD_CACHE_CONNECT',
+        CMD_CACHE_REPLY: 'LMS_QA_CMD_CACHE_REPLY',
+        CACHE_REQUEST: 'CACHE_REQUEST',
+        DIFF_RESULT: 'DIFF_RESULT',
+        TRACE_DATA: 'TRACE_DATA',
+        APIS_DETECTED: 'APIS_DETECTED',
+        BATCH: 'BATCH',
+        CHUNK: 'CHUNK',
+        SNAPSHOT_UNCHANGED: 'SNAPSHOT_UNCHANGED'
+    });
+
+    // Page -> content script transport
+    const TRANSPORT = Object.freeze({
+        CHUNK_BYTES: 1024 * 1024,
+        // Message types whose payloads are serialized once and transferred as ArrayBuffers
+        LARGE: Object.freeze([MSG.SCAN_COMPLETE, MSG.STATE, 'EXPORT_DATA', MSG.TRACE_DATA, MSG.DIFF_RESULT]),
+        // Snapshot types and the top-level fields ignored when checking for changes
+        SNAPSHOTS: Object.freeze({ [MSG.STATE]: Object.freeze(['timestamp']) })
     });
 
     // Code detection patterns - if text matches these, it's likely code not content
@@ -162,7 +191,6 @@
             apis: [],
             resources: [],
             qa: [],
-            logs: [],
             warnings: [],
             scanning: false,
             lastScan: null
@@ -204,7 +232,6 @@
                 state.apis = [];
                 state.resources = [];
                 state.qa = [];
-                state.logs = [];
                 state.warnings = [];
                 state.scanning = false;
                 emit('reset');
@@ -234,53 +261,99 @@
 
     const Logger = (function() {
         const LOG_LEVEL = { DEBUG: 0, INFO: 1, WARN: 2, ERROR: 3 };
+        const LEVEL_NAMES = ['DEBUG', 'INFO', 'WARN', 'ERROR'];
         let currentLevel = LOG_LEVEL.INFO;
-
-        function formatEntry(level, message, data) {
-            return {
-                timestamp: new Date().toISOString(),
-                level,
-                message,
-                data: data ? JSON.parse(JSON.stringify(data)) : undefined
-            };
+        // Payloads are retained only for entries at or above this level
+        let captureLevel = LOG_LEVEL.INFO;
+
+        // Fixed-capacity ring: writing an entry overwrites the oldest slot and
+        // never copies, slices or notifies. Payloads are kept by reference and
+        // only cloned when the log is read.
+        const capacity = CONFIG.MAX_LOGS;
+        const times = new Float64Array(capacity);
+        const levels = new Uint8Array(capacity);
+        const messages = new Array(capacity).fill(null);
+        const payloads = new Array(capacity).fill(undefined);
+        let head = 0;
+        let size = 0;
+
+        function snapshot(data) {
+            if (data === undefined) return undefined;
+            try {
+                return JSON.parse(JSON.stringify(data));
+            } catch (e) {
+                return String(data);
+            }
         }
 
-        function log(level, levelName, message, data) {
+        function log(level, message, data) {
             if (level < currentLevel) return;
 
-            const entry = formatEntry(levelName, message, data);
-            StateManager.append('logs', entry);
-
-            const logs = StateManager.get('logs');
-            if (logs.length > CONFIG.MAX_LOGS) {
-                StateManager.set('logs', logs.slice(-CONFIG.MAX_LOGS));
-            }
+            times[head] = Date.now();
+            levels[head] = level;
+            messages[head] = message;
+            payloads[head] = level >= captureLevel ? data : undefined;
+            head = (head + 1) % capacity;
+            if (size < capacity) size++;
 
-            const consoleMethod = levelName === 'ERROR' ? 'error' : 
-                                  levelName === 'WARN' ? 'warn' : 'log';
+            const consoleMethod = level === LOG_LEVEL.ERROR ? 'error' :
+                                  level === LOG_LEVEL.WARN ? 'warn' : 'log';
             if (data) {
                 console[consoleMethod](`[LMS QA] ${message}`, data);
             } else {
                 console[consoleMethod](`[LMS QA] ${message}`);
             }
+        }
 
-            return entry;
+        function clear() {
+            messages.fill(null);
+            payloads.fill(undefined);
+            head = 0;
+            size = 0;
         }
 
+        // Logs belong to a scan, like the rest of the state
+        StateManager.on('reset', clear);
+
         return {
-            debug: (msg, data) => log(LOG_LEVEL.DEBUG, 'DEBUG', msg, data),
-            info: (msg, data) => log(LOG_LEVEL.INFO, 'INFO', msg, data),
-            warn: (msg, data) => log(LOG_LEVEL.WARN, 'WARN', msg, data),
-            error: (msg, data) => log(LOG_LEVEL.ERROR, 'ERROR', msg, data),
+            debug: (msg, data) => log(LOG_LEVEL.DEBUG, msg, data),
+            info: (msg, data) => log(LOG_LEVEL.INFO, msg, data),
+            warn: (msg, data) => log(LOG_LEVEL.WARN, msg, data),
+            error: (msg, data) => log(LOG_LEVEL.ERROR, msg, data),
             
             setLevel(level) {
                 currentLevel = LOG_LEVEL[level] ?? LOG_LEVEL.INFO;
             },
 
+            /**
+             * Lowest level whose data payloads are kept (default INFO)
+             */
+            setCaptureLevel(level) {
+                captureLevel = LOG_LEVEL[level] ?? LOG_LEVEL.INFO;
+            },
+
+            /**
+             * Entries oldest first, materialized and cloned on each call
+             */
             getLogs() {
-                return StateManager.get('logs');
+                const entries = new Array(size);
+                const start = (head - size + capacity) % capacity;
+
+                for (let i = 0; i < size; i++) {
+                    const slot = (start + i) % capacity;
+                    entries[i] = {
+                        timestamp: new Date(times[slot]).toISOString(),
+                        level: LEVEL_NAMES[levels[slot]],
+                        message: messages[slot],
+                        data: snapshot(payloads[slot])
+                    };
+                }
+
+                return entries;
             },
 
+            clear,
+
             time(label) {
                 const start = performance.now();
                 return () => {
@@ -292,6 +365,298 @@
         };
     })();
 
+    // ═══════════════════════════════════════════════════════════════════════════
+    // SECTION 3B: PROFILER
+    // Span timings and work counters for the current or most recent scan.
+    // Outside a scan, or inside Profiler.outside(), every call is a no-op.
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    const Profiler = {
+        COUNTERS: Object.freeze(['bytesFetched', 'regexEvaluations', 'nodesVisited', 'itemsEmitted']),
+        MAX_SPANS: 5000,
+        // Spans that overlap their siblings get their own trace lanes
+        CONCURRENT_SPANS: Object.freeze({ fetch: 'Fetch', 'resource.analyze': 'Analysis' }),
+        TRACE_PID: 1,
+        NOOP_SPAN: Object.freeze({ id: null, end() {}, count() {} }),
+
+        current: null,
+        last: null,
+        root: null,
+        // Open top-level phase span; counters roll up into it
+        phase: null,
+        // Span of the synchronous work currently running, for counter attribution
+        active: null,
+        // Depth of Profiler.outside() calls
+        paused: 0,
+
+        emptyCounters() {
+            return Object.fromEntries(this.COUNTERS.map(name => [name, 0]));
+        },
+
+        start(name, attrs = {}) {
+            const origin = performance.now();
+            this.current = {
+                name,
+                startedAt: Date.now(),
+                origin,
+                // Wall-clock ms at origin, shared time base with extension traces
+                epoch: performance.timeOrigin + origin,
+                duration: null,
+                counters: this.emptyCounters(),
+                spans: [],
+                dropped: 0
+            };
+            this.phase = null;
+            this.active = null;
+            this.root = this.span(name, attrs, null);
+            return this.root;
+        },
+
+        /**
+         * Open a span under `parent` (default: the open phase, else the root).
+         * Returns a handle with end(attrs) and count(counter, n).
+         */
+        span(name, attrs = {}, parent = this.phase || this.root) {
+            const profile = this.current;
+            if (!profile || this.paused) return this.NOOP_SPAN;
+            if (profile.spans.length >= this.MAX_SPANS) {
+                profile.dropped++;
+                return this.NOOP_SPAN;
+            }
+
+            const record = {
+                id: profile.spans.length,
+                parent: parent?.id ?? null,
+                name,
+                start: performance.now() - profile.origin,
+                duration: null,
+                attrs: { ...attrs },
+                counters: null
+            };
+            profile.spans.push(record);
+
+            const handle = {
+                id: record.id,
+                record,
+                end: (endAttrs) => {
+                    if (record.duration !== null) return;
+                    record.duration = performance.now() - profile.origin - record.start;
+                    Object.assign(record.attrs, endAttrs);
+                    if (this.phase === handle) this.phase = null;
+                },
+                count: (counter, n = 1) => this.count(counter, n, handle)
+            };
+            return handle;
+        },
+
+        /**
+         * Open a top-level span that collects counters until it ends
+         */
+        beginPhase(name, attrs = {}) {
+            this.phase?.end();
+            this.phase = this.span(name, attrs, this.root);
+            return this.phase;
+        },
+
+        /**
+         * Run fn inside a span; async results end the span when they settle.
+         * Array results are recorded as an item count.
+         */
+        measure(name, attrs, fn) {
+            const span = this.span(name, attrs);
+            const describe = (value) => Array.isArray(value) ? { items: value.length } : {};
+            const fail = (error) => {
+                span.end({ error: error?.message });
+                throw error;
+            };
+
+            let result;
+            try {
+                result = this.within(span, () => fn(span));
+            } catch (error) {
+                fail(error);
+            }
+
+            if (typeof result?.then === 'function') {
+                return result.then(value => {
+                    span.end(describe(value));
+                    return value;
+                }, fail);
+            }
+
+            span.end(describe(result));
+            return result;
+        },
+
+        /**
+         * Attribute counters from synchronous work in fn to span
+         */
+        within(span, fn) {
+            const previous = this.active;
+            this.active = span?.record ? span : previous;
+            try {
+                return fn();
+            } finally {
+                this.active = previous;
+            }
+        },
+
+        /**
+         * Run synchronous work that is not part of the scan (live monitoring,
+         * console calls) without billing it to the open phase
+         */
+        outside(fn) {
+            this.paused++;
+            try {
+                return fn();
+            } finally {
+                this.paused--;
+            }
+        },
+
+        count(counter, n = 1, span = this.active) {
+            const profile = this.current;
+            if (!profile || !n || this.paused) return;
+
+            profile.counters[counter] = (profile.counters[counter] || 0) + n;
+            this.addTo(this.phase, counter, n);
+            if (span !== this.phase) this.addTo(span, counter, n);
+        },
+
+        addTo(span, counter, n) {
+            const record = span?.record;
+            if (!record) return;
+            record.counters = record.counters || {};
+            record.counters[counter] = (record.counters[counter] || 0) + n;
+        },
+
+        /**
+         * Add counters gathered elsewhere (the analysis worker)
+         */
+        merge(counters, span = this.active) {
+            Object.entries(counters || {}).forEach(([counter, n]) => this.count(counter, n, span));
+        },
+
+        finish(attrs = {}) {
+            const profile = this.current;
+            if (!profile) return this.last;
+
+            this.phase?.end();
+            this.root.end(attrs);
+            profile.duration = this.root.record.duration;
+
+            this.current = null;
+            this.root = null;
+            this.active = null;
+            this.last = profile;
+            return profile;
+        },
+
+        /**
+         * Full trace of the running scan, else of the last one (null before any scan)
+         */
+        get() {
+            return this.current || this.last;
+        },
+
+        /**
+         * Phase-level totals, small enough to ride along with scan reports
+         */
+        summarize(profile = this.get()) {
+            if (!profile) return null;
+
+            const rootId = profile.spans[0]?.id;
+            const round = (ms) => ms === null ? null : Math.round(ms * 10) / 10;
+
+            return {
+                name: profile.name,
+                startedAt: profile.startedAt,
+                duration: round(profile.duration),
+                counters: { ...profile.counters },
+                phases: profile.spans
+                    .filter(span => span.parent === rootId && span.id !== rootId)
+                    .map(span => ({
+                        name: span.name,
+                        duration: round(span.duration),
+                        counters: { ...span.counters },
+                        ...span.attrs
+                    })),
+                spans: profile.spans.length,
+                dropped: profile.dropped
+            };
+        },
+
+        /**
+         * Chrome Trace Event Format events (microseconds since the epoch).
+         * Sequential spans share the main lane; concurrent fetch and analysis
+         * spans are packed into as few extra lanes as overlap requires.
+         */
+        toTraceEvents(profile = this.get(), pid = this.TRACE_PID) {
+            if (!profile) return [];
+
+            const us = (ms) => Math.round((profile.epoch + ms) * 1000);
+            const lanes = {};
+            const threads = [{ tid: 1, name: 'Main' }];
+            const events = [];
+
+            const laneFor = (span) => {
+                const kind = this.CONCURRENT_SPANS[span.name];
+                if (!kind) return 1;
+
+                const pool = lanes[kind] = lanes[kind] || [];
+                let lane = pool.find(l => l.freeAt <= span.start);
+                if (!lane) {
+                    lane = { tid: threads.length + 1, freeAt: 0 };
+                    pool.push(lane);
+                    threads.push({ tid: lane.tid, name: `${kind} ${pool.length}` });
+                }
+                lane.freeAt = span.start + (span.duration ?? 0);
+                return lane.tid;
+            };
+
+            const totals = this.emptyCounters();
+            const byStart = [...profile.spans].sort((a, b) => a.start - b.start);
+
+            byStart.forEach(span => {
+                const tid = laneFor(span);
+                events.push({
+                    name: span.name,
+                    cat: 'scan',
+                    ph: 'X',
+                    ts: us(span.start),
+                    dur: Math.round((span.duration ?? 0) * 1000),
+                    pid,
+                    tid,
+                    args: span.counters ? { ...span.attrs, counters: span.counters } : { ...span.attrs }
+                });
+            });
+
+            // Running counter totals at the end of each phase
+            const rootId = profile.spans[0]?.id;
+            profile.spans
+                .filter(span => span.parent === rootId && span.id !== rootId && span.duration !== null)
+                .forEach(span => {
+                    Object.entries(span.counters || {}).forEach(([counter, n]) => {
+                        totals[counter] = (totals[counter] || 0) + n;
+                    });
+                    events.push({ name: 'counters', ph: 'C', ts: us(span.start + span.duration), pid, args: { ...totals } });
+                });
+
+            return [
+                { name: 'process_name', ph: 'M', pid, args: { name: `Page: ${location.host}` } },
+                ...threads.map(t => ({ name: 'thread_name', ph: 'M', pid, tid: t.tid, args: { name: t.name } })),
+                ...events
+            ];
+        },
+
+        /**
+         * Page-only trace, loadable in chrome://tracing or Perfetto
+         */
+        toTrace(profile = this.get()) {
+            return { traceEvents: this.toTraceEvents(profile), displayTimeUnit: 'ms' };
+        }
+    };
+
     // ═══════════════════════════════════════════════════════════════════════════
     // SECTION 4: UTILITIES
     // ═══════════════════════════════════════════════════════════════════════════
@@ -310,11 +675,15 @@
             if (!text || text.length < 5) return true;
             
             // Check against code indicator patterns
+            let evaluated = 0;
             for (const pattern of CODE_INDICATORS) {
+                evaluated++;
                 if (pattern.test(text)) {
+                    Profiler.count('regexEvaluations', evaluated);
                     return true;
                 }
             }
+            Profiler.count('regexEvaluations', evaluated + 1);
 
             // Additional heuristics
             const codeCharCount = (text.match(/[{}\[\]();=<>!&|+\-*\/]/g) || []).length;
@@ -411,23 +780,59 @@
             return str.substring(0, maxLength - 3) + '...';
         },
 
-        async fetchWithTimeout(url, timeout = CONFIG.MAX_FETCH_TIMEOUT) {
+        async fetchWithTimeout(url, timeout = CONFIG.MAX_FETCH_TIMEOUT, signal = null, init = {}) {
             const controller = new AbortController();
             const timeoutId = setTimeout(() => controller.abort(), timeout);
+            const onAbort = () => controller.abort();
+
+            if (signal?.aborted) controller.abort();
+            signal?.addEventListener('abort', onAbort, { once: true });
 
+            const span = Profiler.span('fetch', { url });
             try {
-                const response = await fetch(url, { signal: controller.signal });
-                clearTimeout(timeoutId);
+                const response = await fetch(url, { ...init, signal: controller.signal });
+                span.end({ status: response.status });
                 return response;
             } catch (error) {
-                clearTimeout(timeoutId);
+                span.end({ error: error.name });
                 if (error.name === 'AbortError') {
-                    throw new Error(`Request timeout: ${url}`);
+                    throw new Error(signal?.aborted ? `Request cancelled: ${url}` : `Request timeout: ${url}`);
                 }
                 throw error;
+            } finally {
+                clearTimeout(timeoutId);
+                signal?.removeEventListener('abort', onAbort);
             }
         },
 
+        /**
+         * Content hash for cache keys: SHA-256 where SubtleCrypto is available
+         * (secure contexts), FNV-1a plus length otherwise
+         */
+        async hashText(text) {
+            if (window.crypto?.subtle) {
+                try {
+                    const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(text));
+                    const hex = Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
+                    return `sha256:${hex}`;
+                } catch { /* Fall through */ }
+            }
+
+            return `fnv1a:${this.fnv1a(text)}:${text.length}`;
+        },
+
+        /**
+         * 32-bit FNV-1a as hex; fast and synchronous, not collision resistant
+         */
+        fnv1a(text) {
+            let hash = 0x811c9dc5;
+            for (let i = 0; i < text.length; i++) {
+                hash ^= text.charCodeAt(i);
+                hash = Math.imul(hash, 0x01000193);
+            }
+            return (hash >>> 0).toString(16);
+        },
+
         isSameOrigin(url) {
             try {
                 const parsed = new URL(url, window.location.href);
@@ -445,6 +850,266 @@
                 seen.add(key);
                 return true;
             });
+        },
+
+        qaKey(item) {
+            return `${item.type}:${item.text.substring(0, 50)}`;
+        },
+
+        dedupeQA(items) {
+            return this.dedupeBy(items, item => this.qaKey(item));
+        },
+
+        /**
+         * querySelectorAll that also considers the root itself, for scoped re-extraction
+         */
+        queryAll(root, selector) {
+            const found = Array.from(root.querySelectorAll(selector));
+            if (root.nodeType === Node.ELEMENT_NODE && root.matches(selector)) {
+                found.unshift(root);
+            }
+            Profiler.count('nodesVisited', found.length);
+            return found;
+        },
+
+        // QA item -> source element, kept off the item so it stays cloneable for postMessage
+        origins: new WeakMap(),
+
+        trackOrigin(item, element) {
+            if (element) this.origins.set(item, element);
+            return item;
+        },
+
+        getOrigin(item) {
+            return this.origins.get(item) || null;
+        }
+    };
+
+    // ═══════════════════════════════════════════════════════════════════════════
+    // SECTION 4B: FETCH SCHEDULER
+    // Bounded-concurrency fetching with per-host limits and cancellation
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    const FetchScheduler = {
+        /**
+         * Run worker(task, signal) over tasks that each carry a `url`.
+         * At most `concurrency` tasks run at once and at most `perHost` per host.
+         * Results keep task order; a failed task resolves to null.
+         * Aborting options.signal stops queued tasks and aborts in-flight ones.
+         */
+        map(tasks, worker, options = {}) {
+            const {
+                concurrency = CONFIG.MAX_CONCURRENT_FETCHES,
+                perHost = CONFIG.MAX_FETCHES_PER_HOST,
+                signal = null
+            } = options;
+
+            const controller = new AbortController();
+            const onAbort = () => controller.abort();
+            if (signal?.aborted) controller.abort();
+            signal?.addEventListener('abort', onAbort, { once: true });
+
+            const results = new Array(tasks.length).fill(null);
+            const queue = tasks.map((task, index) => ({ task, index, host: this.getHost(task.url) }));
+            const hostCounts = new Map();
+            let active = 0;
+
+            return new Promise(resolve => {
+                const pump = () => {
+                    if (controller.signal.aborted) queue.length = 0;
+
+                    if (queue.length === 0 && active === 0) {
+                        signal?.removeEventListener('abort', onAbort);
+                        resolve(results);
+                        return;
+                    }
+
+                    while (active < concurrency && queue.length > 0) {
+                        const slot = queue.findIndex(entry => (hostCounts.get(entry.host) || 0) < perHost);
+                        if (slot === -1) break;
+
+                        const [entry] = queue.splice(slot, 1);
+                        active++;
+                        hostCounts.set(entry.host, (hostCounts.get(entry.host) || 0) + 1);
+
+                        Promise.resolve()
+                            .then(() => worker(entry.task, controller.signal))
+                            .then(result => { results[entry.index] = result ?? null; }, () => {})
+                            .finally(() => {
+                                active--;
+                                hostCounts.set(entry.host, hostCounts.get(entry.host) - 1);
+                                pump();
+                            });
+                    }
+                };
+
+                pump();
+            });
+        },
+
+        getHost(url) {
+            try {
+                return new URL(url, window.location.href).host;
+            } catch {
+                return '';
+            }
+        }
+    };
+
+    // ═══════════════════════════════════════════════════════════════════════════
+    // SECTION 4C: RESOURCE CACHE
+    // Fetched course files, revalidated with conditional requests. Entries live in
+    // the extension's IndexedDB, reached through the content script, never in the
+    // LMS origin's storage where the course's own scripts could read or alter them.
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    const ResourceCache = {
+        // Part of every parse-result key; bump when extraction logic changes
+        PARSER_VERSION: `${VERSION}/1`,
+        // Page-origin database used by earlier versions; deleted when found
+        LEGACY_DB_NAME: 'lms-qa-validator-cache',
+        REQUEST_TIMEOUT: 5000,
+        // Set when the content script announces itself; standalone use
+        // (console, test page) fetches without a cache
+        connected: false,
+        requestId: 0,
+        pending: new Map(),
+
+        connect() {
+            this.connected = true;
+            this.removeLegacy();
+        },
+
+        /**
+         * Run op against the extension's cache store. Resolves to its result,
+         * or null when not connected, on failure or after REQUEST_TIMEOUT.
+         */
+        request(op, payload = {}) {
+            if (!this.connected) return Promise.resolve(null);
+
+            const id = ++this.requestId;
+            return new Promise(resolve => {
+                const timer = setTimeout(() => {
+                    this.pending.delete(id);
+                    // No content script answering (extension reloaded): stop asking
+                    this.connected = false;
+                    Logger.debug(`Cache request timed out: ${op}`);
+                    resolve(null);
+                }, this.REQUEST_TIMEOUT);
+
+                this.pending.set(id, result => {
+                    clearTimeout(timer);
+                    resolve(result ?? null);
+                });
+                window.postMessage({ type: `${MSG.PREFIX}${MSG.CACHE_REQUEST}`, id, op, payload }, '*');
+            });
+        },
+
+        /**
+         * Deliver a CMD_CACHE_REPLY to its pending request
+         */
+        resolve({ id, result } = {}) {
+            const callback = this.pending.get(id);
+            if (!callback) return;
+
+            this.pending.delete(id);
+            callback(result);
+        },
+
+        get(url) {
+            return this.request('get', { url });
+        },
+
+        put(entry, text) {
+            if (text.length > CONFIG.CACHE_MAX_ENTRY_BYTES) return;
+            this.request('put', { entry, text });
+        },
+
+        touch(url) {
+            this.request('touch', { url });
+        },
+
+        async clear() {
+            this.removeLegacy();
+            await this.request('clear');
+        },
+
+        removeLegacy() {
+            try {
+                indexedDB.deleteDatabase(this.LEGACY_DB_NAME);
+            } catch (e) { /* Storage disabled */ }
+        },
+
+        /**
+         * Return the items previously extracted from this exact content, or run
+         * `compute` and store its result. Keyed by parser version, kind and
+         * content hash, so only changed files are parsed again. compute resolves
+         * to null (or throws) when it could not produce items; only arrays are
+         * stored, so a failed parse is retried on the next scan.
+         */
+        async memoize(url, hash, kind, compute) {
+            const key = `${this.PARSER_VERSION}|${kind}|${hash}`;
+
+            const stored = await this.request('getParsed', { url });
+            if (stored?.key === key) return stored.items;
+
+            const items = await compute();
+            if (Array.isArray(items)) this.request('putParsed', { url, key, items });
+
+            return items;
+        },
+
+        /**
+         * Fetch a text resource through the cache.
+         * Resolves to { text, hash, cached } or null for non-OK responses.
+         */
+        async fetchText(url, signal = null) {
+            const cached = await this.get(url);
+
+            // Same-origin copies are revalidated with our own conditional headers.
+            // The default cache mode then bypasses the HTTP cache (fetch switches it
+            // to no-store), so a 304 reaches us instead of being turned into a 200.
+            // Conditional headers are not CORS-safelisted and would force a preflight
+            // cross-origin; there the HTTP cache revalidates instead, and the content
+            // hash below decides whether the file changed.
+            let init = { cache: 'no-cache' };
+            if (cached && Utils.isSameOrigin(url) && (cached.etag || cached.lastModified)) {
+                const headers = {};
+                if (cached.etag) headers['If-None-Match'] = cached.etag;
+                if (cached.lastModified) headers['If-Modified-Since'] = cached.lastModified;
+                init = { headers };
+            }
+
+            let response;
+            try {
+                response = await Utils.fetchWithTimeout(url, CONFIG.MAX_FETCH_TIMEOUT, signal, init);
+            } catch (error) {
+                // Serve stale content when the request fails, but never mask a cancellation
+                if (cached && !signal?.aborted) {
+                    Logger.warn(`Using cached copy of ${url}: ${error.message}`);
+                    return { text: cached.text, hash: cached.hash, cached: true };
+                }
+                throw error;
+            }
+
+            if (response.status === 304 && cached) {
+                this.touch(url);
+                return { text: cached.text, hash: cached.hash, cached: true };
+            }
+            if (!response.ok) return null;
+
+            const text = await response.text();
+            Profiler.count('bytesFetched', text.length);
+            const hash = await Utils.hashText(text);
+
+            this.put({
+                url,
+                etag: response.headers.get('ETag'),
+                lastModified: response.headers.get('Last-Modified'),
+                hash
+            }, text);
+
+            return { text, hash, cached: cached?.hash === hash };
         }
     };
 
@@ -453,12 +1118,119 @@
     // ═══════════════════════════════════════════════════════════════════════════
 
     const Messenger = {
-        send(type, payload = {}) {
-            window.postMessage({
-                type: `${MSG.PREFIX}${type}`,
-                payload,
-                timestamp: Date.now()
-            }, '*');
+        outbox: [],
+        flushTimer: null,
+        transferId: 0,
+        // Hash of the last snapshot sent per type
+        snapshots: new Map(),
+
+        /**
+         * Queue a message for the content script. Messages sent in the same
+         * tick are posted together as one BATCH; known-large payloads are
+         * serialized once and transferred as ArrayBuffer chunks instead of
+         * structured-cloned. An unchanged snapshot is replaced by
+         * SNAPSHOT_UNCHANGED unless options.force.
+         */
+        send(type, payload = {}, options = {}) {
+            const message = { type: `${MSG.PREFIX}${type}`, payload, timestamp: Date.now() };
+            const large = TRANSPORT.LARGE.includes(type);
+
+            const volatile = TRANSPORT.SNAPSHOTS[type];
+            if (volatile) {
+                const { stable, text } = this.serialize(payload, volatile);
+                const hash = Utils.fnv1a(stable);
+                if (!options.force && this.snapshots.get(type) === hash) {
+                    message.type = `${MSG.PREFIX}${MSG.SNAPSHOT_UNCHANGED}`;
+                    message.payload = { of: type, hash };
+                } else if (large) {
+                    message.chunks = this.encode(text);
+                }
+                this.snapshots.set(type, hash);
+            } else if (large) {
+                message.chunks = this.encode(JSON.stringify(payload));
+            }
+
+            this.outbox.push(message);
+            if (!this.flushTimer) {
+                this.flushTimer = setTimeout(() => this.flush(), 0);
+            }
+        },
+
+        /**
+         * JSON for a snapshot from a single stringify: `stable` leaves out the
+         * volatile top-level fields (for hashing), `text` splices them back in
+         */
+        serialize(payload, volatile) {
+            const rest = { ...payload };
+            volatile.forEach(key => delete rest[key]);
+            const stable = JSON.stringify(rest);
+
+            const head = volatile
+                .filter(key => payload[key] !== undefined)
+                .map(key => `${JSON.stringify(key)}:${JSON.stringify(payload[key])}`)
+                .join(',');
+            if (!head) return { stable, text: stable };
+
+            return { stable, text: `{${head}${stable.length > 2 ? ',' : ''}${stable.slice(1)}` };
+        },
+
+        /**
+         * UTF-8 encode into transferable buffers of at most CHUNK_BYTES
+         */
+        encode(text) {
+            const bytes = new TextEncoder().encode(text);
+            if (bytes.length <= TRANSPORT.CHUNK_BYTES && bytes.byteLength === bytes.buffer.byteLength) {
+                return [bytes.buffer];
+            }
+
+            const chunks = [];
+            for (let offset = 0; offset < bytes.length; offset += TRANSPORT.CHUNK_BYTES) {
+                chunks.push(bytes.slice(offset, offset + TRANSPORT.CHUNK_BYTES).buffer);
+            }
+            return chunks;
+        },
+
+        /**
+         * Post queued messages in order: runs of small messages as one post,
+         * each large message as its chunks
+         */
+        flush() {
+            this.flushTimer = null;
+            const queue = this.outbox;
+            this.outbox = [];
+            let batch = [];
+
+            const postBatch = () => {
+                if (batch.length === 1) {
+                    window.postMessage(batch[0], '*');
+                } else if (batch.length > 1) {
+                    window.postMessage({ type: `${MSG.PREFIX}${MSG.BATCH}`, messages: batch, timestamp: Date.now() }, '*');
+                }
+                batch = [];
+            };
+
+            queue.forEach(message => {
+                if (!message.chunks) {
+                    batch.push(message);
+                    return;
+                }
+
+                postBatch();
+                const id = ++this.transferId;
+                message.chunks.forEach((buffer, index) => {
+                    window.postMessage({
+                        type: `${MSG.PREFIX}${MSG.CHUNK}`,
+                        id,
+                        index,
+                        count: message.chunks.length,
+                        messageType: message.type,
+                        timestamp: message.timestamp,
+                        buffer
+                    }, '*', [buffer]);
+                });
+            });
+
+            postBatch();
         },
 
         handleCommand(type, payload) {
@@ -469,6 +1241,10 @@
                     Scanner.run();
                     break;
 
+                case MSG.CMD_CANCEL_SCAN:
+                    Scanner.cancel();
+                    break;
+
                 case MSG.CMD_TEST_API:
                     SCORMAPI.test(payload?.apiIndex || 0);
                     break;
@@ -478,7 +1254,7 @@
                     break;
 
                 case MSG.CMD_GET_STATE:
-                    Messenger.send(MSG.STATE, Reporter.generate());
+                    Messenger.send(MSG.STATE, Reporter.generate(), { force: payload?.force });
                     break;
 
                 case MSG.CMD_GET_CMI_DATA:
@@ -495,7 +1271,34 @@
                     break;
 
                 case MSG.CMD_EXPORT:
-                    Exporter.export(payload?.format || 'json');
+                    Exporter.export(payload?.format || 'json', { profile: payload?.profile });
+                    break;
+
+                case MSG.CMD_START_MONITOR:
+                    LiveMonitor.start();
+                    break;
+
+                case MSG.CMD_STOP_MONITOR:
+                    LiveMonitor.stop();
+                    break;
+
+                case MSG.CMD_DIFF:
+                    Messenger.send(MSG.DIFF_RESULT, ScanDiff.compare(
+                        payload?.baseline,
+                        payload?.current || Reporter.generate()
+                    ));
+                    break;
+
+                case MSG.CMD_GET_TRACE:
+                    Messenger.send(MSG.TRACE_DATA, { events: Profiler.toTraceEvents() });
+                    break;
+
+                case MSG.CMD_CACHE_CONNECT:
+                    ResourceCache.connect();
+                    break;
+
+                case MSG.CMD_CACHE_REPLY:
+                    ResourceCache.resolve(payload);
                     break;
 
                 case MSG.CMD_DETECT_APIS:
@@ -1303,13 +2106,15 @@
             const quizzes = [];
             const processed = new Set();
 
-            this.processDocument(document, null, quizzes, processed);
+            Profiler.measure('dom.document', { url: document.URL },
+                () => this.processDocument(document, null, quizzes, processed));
             
             document.querySelectorAll('iframe').forEach(iframe => {
                 try {
                     const doc = iframe.contentDocument || iframe.contentWindow?.document;
                     if (doc) {
-                        this.processDocument(doc, iframe, quizzes, processed);
+                        Profiler.measure('dom.document', { url: doc.URL },
+                            () => this.processDocument(doc, iframe, quizzes, processed));
                     }
                 } catch (e) { /* Cross-origin */ }
             });
@@ -1318,20 +2123,73 @@
             return quizzes;
         },
 
-        processDocument(doc, iframe, quizzes, processed) {
-            const correctSelectors = [
-                'option[value="true"]', 'option[value="correct"]', 'option[value="1"]',
-                'input[type="radio"][value="true"]', 'input[type="radio"][value="correct"]',
-                'input[type="checkbox"][value="true"]', 'input[type="checkbox"][value="correct"]',
-                '[data-correct="true"]', '[data-answer="true"]'
-            ].join(',');
+        // Elements that mark a correct answer and seed quiz extraction
+        CORRECT_SELECTOR: [
+            'option[value="true"]', 'option[value="correct"]', 'option[value="1"]',
+            'input[type="radio"][value="true"]', 'input[type="radio"][value="correct"]',
+            'input[type="checkbox"][value="true"]', 'input[type="checkbox"][value="correct"]',
+            '[data-correct="true"]', '[data-answer="true"]'
+        ].join(','),
+
+        // Elements the label and radio group maps are built from
+        MAP_SELECTOR: 'label[for], input[type="radio"][name]',
+
+        /**
+         * One pass over the document collecting label[for] targets, radio groups
+         * and, unless mapsOnly, correct-answer candidates
+         */
+        buildIndex(doc, mapsOnly = false) {
+            const index = {
+                doc,
+                labelsFor: new Map(),
+                radiosByName: new Map(),
+                questionTexts: new Map(),
+                candidates: []
+            };
+
+            const selector = mapsOnly ? this.MAP_SELECTOR : `${this.MAP_SELECTOR}, ${this.CORRECT_SELECTOR}`;
+            const elements = doc.querySelectorAll(selector);
+            Profiler.count('nodesVisited', elements.length);
+
+            elements.forEach(el => {
+                if (el.tagName === 'LABEL' && el.hasAttribute('for')) {
+                    // First label wins, matching querySelector('label[for=...]')
+                    const id = el.getAttribute('for');
+                    if (!index.labelsFor.has(id)) index.labelsFor.set(id, el);
+                } else if (el.tagName === 'INPUT' && el.type === 'radio' && el.name) {
+                    if (!index.radiosByName.has(el.name)) index.radiosByName.set(el.name, []);
+                    index.radiosByName.get(el.name).push(el);
+                }
+
+                if (!mapsOnly && el.matches(this.CORRECT_SELECTOR)) {
+                    index.candidates.push(el);
+                }
+            });
+
+            return index;
+        },
+
+        /**
+         * Index for re-extracting one subtree: the document's maps (from a
+         * mapsOnly buildIndex shared across subtrees) with candidates found
+         * inside root only
+         */
+        scopeIndex(maps, root) {
+            const candidates = Array.from(root.querySelectorAll(this.CORRECT_SELECTOR));
+            if (root.matches?.(this.CORRECT_SELECTOR)) candidates.unshift(root);
+            Profiler.count('nodesVisited', candidates.length);
+
+            return { ...maps, candidates };
+        },
+
+        processDocument(doc, iframe, quizzes, processed, index = this.buildIndex(doc)) {
 
-            doc.querySelectorAll(correctSelectors).forEach(el => {
+            index.candidates.forEach(el => {
                 if (el.tagName === 'OPTION') {
                     const select = el.closest('select');
                     if (select && !processed.has(select)) {
                         processed.add(select);
-                        const quiz = this.extractSelect(select, doc, iframe);
+                        const quiz = this.extractSelect(select, index, iframe);
                         if (quiz) quizzes.push(quiz);
                     }
                 } else if (el.tagName === 'INPUT') {
@@ -1339,13 +2197,13 @@
                         const key = `radio:${el.name}`;
                         if (!processed.has(key)) {
                             processed.add(key);
-                            const quiz = this.extractRadioGroup(doc, el.name, iframe);
+                            const quiz = this.extractRadioGroup(index, el.name, iframe);
                             if (quiz) quizzes.push(quiz);
                         }
                     } else if (el.type === 'checkbox') {
                         if (!processed.has(el)) {
                             processed.add(el);
-                            const quiz = this.extractCheckbox(el, doc, iframe);
+                            const quiz = this.extractCheckbox(el, index, iframe);
                             if (quiz) quizzes.push(quiz);
                         }
                     }
@@ -1353,9 +2211,9 @@
             });
         },
 
-        extractSelect(select, doc, iframe) {
+        extractSelect(select, index, iframe) {
             const questionId = select.id || select.name || Utils.generateId('select');
-            const questionText = this.findQuestionText(select, doc);
+            const questionText = this.findQuestionText(select, index);
             
             const answers = [];
             Array.from(select.options).forEach(option => {
@@ -1375,15 +2233,15 @@
             return { type: 'select', questionId, questionText, answers, selectElement: select, iframe };
         },
 
-        extractRadioGroup(doc, groupName, iframe) {
-            const radios = doc.querySelectorAll(`input[type="radio"][name="${groupName}"]`);
+        extractRadioGroup(index, groupName, iframe) {
+            const radios = index.radiosByName.get(groupName) || [];
             if (radios.length === 0) return null;
 
-            const questionText = this.findQuestionText(radios[0], doc);
+            const questionText = this.findQuestionText(radios[0], index);
             const answers = [];
 
             radios.forEach(radio => {
-                const text = this.findLabelText(radio, doc) || radio.value;
+                const text = this.findLabelText(radio, index) || radio.value;
                 answers.push({
                     text,
                     correct: Utils.isCorrectAnswer(radio),
@@ -1395,9 +2253,9 @@
             return { type: 'radio', questionId: groupName, questionText, answers, iframe };
         },
 
-        extractCheckbox(checkbox, doc, iframe) {
-            const text = this.findLabelText(checkbox, doc) || checkbox.value;
-            const questionText = this.findQuestionText(checkbox, doc);
+        extractCheckbox(checkbox, index, iframe) {
+            const text = this.findLabelText(checkbox, index) || checkbox.value;
+            const questionText = this.findQuestionText(checkbox, index);
 
             return {
                 type: 'checkbox',
@@ -1413,26 +2271,32 @@
             };
         },
 
-        findQuestionText(element, doc) {
+        findQuestionText(element, index) {
             if (element.id) {
-                const label = doc.querySelector(`label[for="${element.id}"]`);
+                const label = index.labelsFor.get(element.id);
                 if (label) return label.textContent.trim();
             }
 
             const container = element.closest('.question, .form-group, .quiz-item, fieldset, [class*="question"]');
-            if (container) {
+            if (!container) return '';
+
+            // Inputs sharing a container share its question text
+            if (!index.questionTexts.has(container)) {
                 const textEl = container.querySelector('label, legend, .question-text, p:first-child');
-                if (textEl && textEl !== element.parentElement) {
-                    return textEl.textContent.trim();
-                }
+                index.questionTexts.set(container, textEl);
+            }
+
+            const textEl = index.questionTexts.get(container);
+            if (textEl && textEl !== element.parentElement) {
+                return textEl.textContent.trim();
             }
 
             return '';
         },
 
-        findLabelText(input, doc) {
+        findLabelText(input, index) {
             if (input.id) {
-                const label = doc.querySelector(`label[for="${input.id}"]`);
+                const label = index.labelsFor.get(input.id);
                 if (label) return label.textContent.trim();
             }
 
@@ -1498,22 +2362,22 @@
 
             quizzes.forEach(quiz => {
                 if (quiz.questionText) {
-                    items.push({
+                    items.push(Utils.trackOrigin({
                         type: ITEM_TYPE.QUESTION,
                         text: quiz.questionText,
                         source: `DOM:${quiz.type}:${quiz.questionId}`,
                         confidence: CONFIDENCE.HIGH
-                    });
+                    }, quiz.selectElement || quiz.answers[0]?.element));
                 }
 
                 quiz.answers.forEach(answer => {
-                    items.push({
+                    items.push(Utils.trackOrigin({
                         type: ITEM_TYPE.ANSWER,
                         text: answer.text,
                         correct: answer.correct,
                         source: `DOM:${quiz.type}:${quiz.questionId}`,
                         confidence: answer.correct ? CONFIDENCE.VERY_HIGH : CONFIDENCE.MEDIUM
-                    });
+                    }, answer.element));
                 });
             });
 
@@ -1551,7 +2415,13 @@
             return null;
         },
 
-        async extract() {
+        /**
+         * Fetch and parse all slides in parallel.
+         * options.onItems(items, { slideId, completed, total }) fires as each slide is parsed;
+         * options.signal cancels outstanding slide fetches.
+         */
+        async extract(options = {}) {
+            const { signal = null, onItems = null } = options;
             Logger.info('Extracting Storyline content...');
             
             const baseUrl = this.findBaseUrl();
@@ -1563,18 +2433,25 @@
             Logger.info(`Found Storyline at: ${baseUrl}`);
 
             try {
-                const courseData = await this.fetchCourseData(baseUrl);
+                const courseData = await Profiler.measure('storyline.data', { baseUrl },
+                    () => this.fetchCourseData(baseUrl, signal));
                 if (!courseData) return [];
 
                 const slideIds = this.extractSlideIds(courseData);
                 Logger.info(`Found ${slideIds.length} slides to analyze`);
 
-                const items = [];
-                for (const slideId of slideIds) {
-                    const slideItems = await this.fetchSlideContent(baseUrl, slideId);
-                    items.push(...slideItems);
-                }
-
+                let completed = 0;
+                const tasks = slideIds.map(slideId => ({ slideId, url: this.getSlideUrl(baseUrl, slideId) }));
+                const perSlide = await FetchScheduler.map(tasks, async (task, taskSignal) => {
+                    const slideItems = await this.fetchSlideContent(baseUrl, task.slideId, taskSignal);
+                    // A cancelled fetch comes back empty; it is not a finished slide
+                    if (taskSignal.aborted) return null;
+                    completed++;
+                    onItems?.(slideItems, { slideId: task.slideId, completed, total: tasks.length });
+                    return slideItems;
+                }, { signal });
+
+                const items = perSlide.flatMap(slideItems => slideItems || []);
                 return Utils.dedupeBy(items, item => `${item.type}:${item.text}`);
             } catch (error) {
                 Logger.error('Storyline extraction failed', { error: error.message });
@@ -1582,13 +2459,12 @@
             }
         },
 
-        async fetchCourseData(baseUrl) {
+        async fetchCourseData(baseUrl, signal = null) {
             try {
-                const response = await Utils.fetchWithTimeout(`${baseUrl}/html5/data/js/data.js`);
-                if (!response.ok) return null;
+                const fetched = await ResourceCache.fetchText(`${baseUrl}/html5/data/js/data.js`, signal);
+                if (!fetched) return null;
 
-                const text = await response.text();
-                const match = text.match(/globalProvideData\s*\(\s*'data'\s*,\s*'(.+)'\s*\)/);
+                const match = fetched.text.match(/globalProvideData\s*\(\s*'data'\s*,\s*'(.+)'\s*\)/);
                 if (!match) return null;
 
                 const json = this.unescapeJson(match[1]);
@@ -1626,27 +2502,38 @@
             return Array.from(ids);
         },
 
-        async fetchSlideContent(baseUrl, slideId) {
-            try {
-                const response = await Utils.fetchWithTimeout(`${baseUrl}/html5/data/js/${slideId}.js`);
-                if (!response.ok) return [];
+        getSlideUrl(baseUrl, slideId) {
+            return `${baseUrl}/html5/data/js/${slideId}.js`;
+        },
 
-                const text = await response.text();
-                return this.parseSlideContent(text, slideId);
+        async fetchSlideContent(baseUrl, slideId, signal = null) {
+            try {
+                const url = this.getSlideUrl(baseUrl, slideId);
+                const fetched = await ResourceCache.fetchText(url, signal);
+                if (!fetched) return [];
+
+                const items = await ResourceCache.memoize(url, fetched.hash, `slide:${slideId}`,
+                    () => Profiler.measure('storyline.parse', { slideId, bytes: fetched.text.length },
+                        () => this.parseSlideContent(fetched.text, slideId)));
+                return items || [];
             } catch (e) {
                 return [];
             }
         },
 
+        /**
+         * Items in a slide file, or null when it holds no readable slide data
+         */
         parseSlideContent(text, slideId) {
             const items = [];
             
             const match = text.match(/globalProvideData\s*\(\s*'slide'\s*,\s*'(.+)'\s*\)/);
-            if (!match) return items;
+            Profiler.count('regexEvaluations');
+            if (!match) return null;
 
             const json = this.unescapeJson(match[1]);
             const slideData = Utils.safeJsonParse(json);
-            if (!slideData) return items;
+            if (!slideData) return null;
 
             this.extractFromObject(slideData, slideId, items);
 
@@ -1731,14 +2618,16 @@
             const items = [];
 
             // Process main document
-            items.push(...this.extractFromDocument(document));
+            items.push(...Profiler.measure('storylineDOM.document', { url: document.URL },
+                () => this.extractFromDocument(document)));
 
             // Process iframes (Storyline often runs in an iframe)
             document.querySelectorAll('iframe').forEach(iframe => {
                 try {
                     const doc = iframe.contentDocument || iframe.contentWindow?.document;
                     if (doc) {
-                        items.push(...this.extractFromDocument(doc));
+                        items.push(...Profiler.measure('storylineDOM.document', { url: doc.URL },
+                            () => this.extractFromDocument(doc)));
                     }
                 } catch (e) { /* Cross-origin */ }
             });
@@ -1748,20 +2637,20 @@
         },
 
         /**
-         * Extract from a single document
+         * Extract from a single document, or from one subtree of it
          */
-        extractFromDocument(doc) {
+        extractFromDocument(doc, root = doc) {
             const items = [];
             const processed = new Set();
 
             // Method 1: Extract from data-acc-text attributes (most reliable)
-            items.push(...this.extractFromAccText(doc, processed));
+            items.push(...this.extractFromAccText(doc, processed, root));
 
             // Method 2: Extract from accessibility shadow elements
-            items.push(...this.extractFromAccShadow(doc, processed));
+            items.push(...this.extractFromAccShadow(doc, processed, root));
 
             // Method 3: Extract from aria-labeled elements
-            items.push(...this.extractFromAriaLabels(doc, processed));
+            items.push(...this.extractFromAriaLabels(doc, processed, root));
 
             return items;
         },
@@ -1770,9 +2659,9 @@
          * Extract from data-acc-text attributes
          * Storyline stores accessible text in these attributes
          */
-        extractFromAccText(doc, processed) {
+        extractFromAccText(doc, processed, root = doc) {
             const items = [];
-            const elements = doc.querySelectorAll('[data-acc-text]');
+            const elements = Utils.queryAll(root, '[data-acc-text]');
 
             elements.forEach(el => {
                 const text = el.getAttribute('data-acc-text')?.trim();
@@ -1788,13 +2677,13 @@
                 const isQuestion = this.isQuestionText(text, el);
                 const isCorrect = this.isCorrectAnswer(el);
 
-                items.push({
+                items.push(Utils.trackOrigin({
                     type: isQuestion ? ITEM_TYPE.QUESTION : ITEM_TYPE.ANSWER,
                     text,
                     correct: isCorrect,
                     source: 'StorylineDOM:acc-text',
                     confidence: isCorrect ? CONFIDENCE.VERY_HIGH : CONFIDENCE.HIGH
-                });
+                }, el));
             });
 
             return items;
@@ -1847,12 +2736,12 @@
          * Extract from accessibility shadow elements (acc-shadow-el)
          * These are hidden form elements for screen readers
          */
-        extractFromAccShadow(doc, processed) {
+        extractFromAccShadow(doc, processed, root = doc) {
             const items = [];
 
             // Find radio buttons and checkboxes in accessibility layer
-            const accRadios = doc.querySelectorAll('.acc-shadow-el.acc-radio, .acc-shadow-el input[type="radio"]');
-            const accCheckboxes = doc.querySelectorAll('.acc-shadow-el.acc-checkbox, .acc-shadow-el input[type="checkbox"]');
+            const accRadios = Utils.queryAll(root, '.acc-shadow-el.acc-radio, .acc-shadow-el input[type="radio"]');
+            const accCheckboxes = Utils.queryAll(root, '.acc-shadow-el.acc-checkbox, .acc-shadow-el input[type="checkbox"]');
 
             // Group radios by name for proper question/answer grouping
             const radioGroups = new Map();
@@ -1875,13 +2764,13 @@
                     processed.add(labelText);
 
                     const isCorrect = this.isCorrectAnswer(radio);
-                    items.push({
+                    items.push(Utils.trackOrigin({
                         type: ITEM_TYPE.ANSWER,
                         text: labelText,
                         correct: isCorrect,
                         source: `StorylineDOM:acc-radio:${groupName}`,
                         confidence: isCorrect ? CONFIDENCE.VERY_HIGH : CONFIDENCE.HIGH
-                    });
+                    }, radio));
                 });
             });
 
@@ -1895,13 +2784,13 @@
                 processed.add(labelText);
 
                 const isCorrect = this.isCorrectAnswer(checkbox);
-                items.push({
+                items.push(Utils.trackOrigin({
                     type: ITEM_TYPE.ANSWER,
                     text: labelText,
                     correct: isCorrect,
                     source: 'StorylineDOM:acc-checkbox',
                     confidence: isCorrect ? CONFIDENCE.VERY_HIGH : CONFIDENCE.HIGH
-                });
+                }, checkbox));
             });
 
             return items;
@@ -1910,11 +2799,11 @@
         /**
          * Extract from aria-label and aria-labelledby attributes
          */
-        extractFromAriaLabels(doc, processed) {
+        extractFromAriaLabels(doc, processed, root = doc) {
             const items = [];
 
             // Elements with aria-label that look like Q&A content
-            doc.querySelectorAll('[aria-label]').forEach(el => {
+            Utils.queryAll(root, '[aria-label]').forEach(el => {
                 const text = el.getAttribute('aria-label')?.trim();
                 if (!text || text.length < 15 || processed.has(text)) return;
                 if (Utils.isCodeLike(text)) return;
@@ -1927,13 +2816,13 @@
                 processed.add(text);
 
                 const isQuestion = this.isQuestionText(text, el);
-                items.push({
+                items.push(Utils.trackOrigin({
                     type: isQuestion ? ITEM_TYPE.QUESTION : ITEM_TYPE.ANSWER,
                     text,
                     correct: false,
                     source: 'StorylineDOM:aria-label',
                     confidence: CONFIDENCE.MEDIUM
-                });
+                }, el));
             });
 
             return items;
@@ -2108,9 +2997,14 @@
             map.set(url, { url, type: url.includes('.json') ? 'json' : 'js', priority, source });
         },
 
-        async analyze() {
+        /**
+         * Fetch resources in parallel (high priority first) and analyze them in a
+         * worker. Stops early once the time or byte budget is spent.
+         * options.onItems(items, { url, completed, total }) fires as each resource finishes.
+         */
+        async analyze(options = {}) {
+            const { signal = null, onItems = null } = options;
             const resources = StateManager.get('resources');
-            const items = [];
 
             const sorted = [...resources].sort((a, b) => {
                 if (a.priority === PRIORITY.HIGH && b.priority !== PRIORITY.HIGH) return -1;
@@ -2118,18 +3012,47 @@
                 return 0;
             });
 
-            for (const resource of sorted) {
-                try {
-                    const response = await Utils.fetchWithTimeout(resource.url);
-                    if (!response.ok) continue;
+            // Budget exhaustion aborts queued and in-flight fetches, as does the caller's signal
+            const controller = new AbortController();
+            const onAbort = () => controller.abort();
+            if (signal?.aborted) controller.abort();
+            signal?.addEventListener('abort', onAbort, { once: true });
 
-                    const text = await response.text();
-                    const found = this.analyzeContent(text, resource.url);
-                    items.push(...found);
-                } catch (e) { /* Skip failed fetches */ }
-            }
+            const deadline = performance.now() + CONFIG.MAX_ANALYSIS_TIME;
+            let bytes = 0;
+            let completed = 0;
+            const overBudget = () => performance.now() > deadline || bytes > CONFIG.MAX_ANALYSIS_BYTES;
 
-            return items;
+            try {
+                const perResource = await FetchScheduler.map(sorted, async (resource, taskSignal) => {
+                    if (overBudget()) {
+                        controller.abort();
+                        return null;
+                    }
+
+                    const fetched = await ResourceCache.fetchText(resource.url, taskSignal);
+                    const found = fetched
+                        ? await ResourceCache.memoize(resource.url, fetched.hash, 'resource', () => {
+                            bytes += fetched.text.length;
+                            return Profiler.measure('resource.analyze', { url: resource.url, bytes: fetched.text.length },
+                                span => AnalysisWorker.analyze(fetched.text, resource.url, span));
+                        })
+                        : null;
+
+                    completed++;
+                    onItems?.(found || [], { url: resource.url, completed, total: sorted.length });
+                    return found;
+                }, { signal: controller.signal });
+
+                if (overBudget()) {
+                    Logger.info(`Resource analysis budget reached (${(bytes / 1024).toFixed(0)} KB)`);
+                }
+
+                return perResource.flatMap(found => found || []);
+            } finally {
+                signal?.removeEventListener('abort', onAbort);
+                AnalysisWorker.terminate();
+            }
         },
 
         analyzeContent(text, source) {
@@ -2147,6 +3070,7 @@
             const sampleSize = Math.min(text.length, 2000);
             const sample = text.substring(0, sampleSize);
             const codeChars = (sample.match(/[{}\[\]();=<>!&|]/g) || []).length;
+            Profiler.count('regexEvaluations');
             if (codeChars / sampleSize > 0.1) {
                 Logger.debug(`Skipping ${source} - appears to be code`);
                 return items;
@@ -2158,6 +3082,7 @@
                     // Reset regex state
                     pattern.lastIndex = 0;
                     const matches = text.matchAll(pattern);
+                    Profiler.count('regexEvaluations');
                     
                     for (const match of matches) {
                         const content = match[1]?.trim();
@@ -2263,11 +3188,150 @@
         }
     };
 
+    // ═══════════════════════════════════════════════════════════════════════════
+    // SECTION 9B: RESOURCE ANALYSIS WORKER
+    // Runs ResourceDiscovery.analyzeContent off the page's main thread
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    const AnalysisWorker = {
+        worker: null,
+        workerUrl: null,
+        failed: false,
+        pending: new Map(),
+        nextId: 0,
+
+        /**
+         * Worker source assembled from the same pattern tables and methods the
+         * main thread uses, so both paths produce identical items
+         */
+        buildSource() {
+            const patterns = Object.entries(CONTENT_PATTERNS)
+                .map(([type, list]) => `${JSON.stringify(type)}: [${list.map(String).join(', ')}]`)
+                .join(',\n');
+
+            return `'use strict';
+const CONFIG = ${JSON.stringify({ MAX_RECURSION_DEPTH: CONFIG.MAX_RECURSION_DEPTH })};
+const ITEM_TYPE = ${JSON.stringify(ITEM_TYPE)};
+const CONFIDENCE = ${JSON.stringify(CONFIDENCE)};
+const CODE_INDICATORS = [${CODE_INDICATORS.map(String).join(', ')}];
+const CONTENT_PATTERNS = {${patterns}};
+const Logger = { debug() {} };
+const Profiler = {
+    counters: {},
+    count(counter, n = 1) { this.counters[counter] = (this.counters[counter] || 0) + n; }
+};
+const Utils = {
+${Utils.isCodeLike},
+${Utils.isNaturalLanguage},
+${Utils.safeJsonParse}
+};
+const ResourceDiscovery = {
+${ResourceDiscovery.analyzeContent},
+${ResourceDiscovery.extractFromJson}
+};
+self.onmessage = (event) => {
+    const { id, text, source } = event.data;
+    Profiler.counters = {};
+    try {
+        self.postMessage({ id, items: ResourceDiscovery.analyzeContent(text, source), counters: Profiler.counters });
+    } catch (e) {
+        self.postMessage({ id, error: String(e && e.message || e) });
+    }
+};`;
+        },
+
+        getWorker() {
+            if (this.worker || this.failed) return this.worker;
+
+            try {
+                const blob = new Blob([this.buildSource()], { type: 'text/javascript' });
+                this.workerUrl = URL.createObjectURL(blob);
+                this.worker = new Worker(this.workerUrl);
+                this.worker.onmessage = (event) => this.settle(event.data);
+                this.worker.onerror = () => this.fallback();
+            } catch (e) {
+                // Page CSP may forbid blob: workers
+                Logger.debug('Analysis worker unavailable, using main thread');
+                this.failed = true;
+                this.worker = null;
+            }
+
+            return this.worker;
+        },
+
+        /**
+         * Resolves to the items found in text, or null if the worker was
+         * terminated first; work counters are credited to span
+         */
+        analyze(text, source, span = null) {
+            const worker = this.getWorker();
+            if (!worker) return this.analyzeInline(text, source, span);
+
+            return new Promise(resolve => {
+                const id = ++this.nextId;
+                this.pending.set(id, { resolve, text, source, span });
+                worker.postMessage({ id, text, source });
+            });
+        },
+
+        async analyzeInline(text, source, span = null) {
+            // Yield between resources so the course UI stays responsive
+            await new Promise(resolve => setTimeout(resolve, 0));
+            return Profiler.within(span, () => ResourceDiscovery.analyzeContent(text, source));
+        },
+
+        /**
+         * Worker reply: { id, items, counters }, or { id, error } when analysis
+         * threw there, in which case the resource is retried on the main thread
+         */
+        settle({ id, items, counters, error }) {
+            const entry = this.pending.get(id);
+            if (!entry) return;
+            this.pending.delete(id);
+
+            if (error !== undefined) {
+                Logger.debug(`Worker analysis of ${entry.source} failed (${error}), retrying on main thread`);
+                entry.resolve(this.analyzeInline(entry.text, entry.source, entry.span));
+                return;
+            }
+
+            Profiler.merge(counters, entry.span);
+            entry.resolve(items);
+        },
+
+        /**
+         * Worker failed to load or crashed: finish outstanding jobs on the main thread
+         */
+        fallback() {
+            Logger.debug('Analysis worker failed, using main thread');
+            this.failed = true;
+            const pending = [...this.pending.values()];
+            this.pending.clear();
+            this.terminate();
+            pending.forEach(({ resolve, text, source, span }) => resolve(this.analyzeInline(text, source, span)));
+        },
+
+        terminate() {
+            this.worker?.terminate();
+            if (this.workerUrl) URL.revokeObjectURL(this.workerUrl);
+            this.worker = null;
+            this.workerUrl = null;
+            // Cut short, not empty: null keeps these out of the parse cache
+            this.pending.forEach(({ resolve }) => resolve(null));
+            this.pending.clear();
+        }
+    };
+
     // ═══════════════════════════════════════════════════════════════════════════
     // SECTION 10: SCANNER (Orchestrator)
     // ═══════════════════════════════════════════════════════════════════════════
 
     const Scanner = {
+        controller: null,
+        // Keys already streamed this run, so SCAN_PARTIAL carries only new items
+        streamed: new Set(),
+        sequence: 0,
+
         async run() {
             if (StateManager.get('scanning')) {
                 Logger.warn('Scan already in progress');
@@ -2277,30 +3341,54 @@
             const endTimer = Logger.time('Full scan');
             StateManager.reset();
             StateManager.set('scanning', true);
+            this.controller = new AbortController();
+            const signal = this.controller.signal;
+            this.streamed = new Set();
+            this.sequence = 0;
+            Profiler.start('scan', { url: window.location.href });
 
             Messenger.send(MSG.SCAN_STARTED);
 
             try {
                 this.reportProgress(1, 5, 'Discovering APIs...');
+                Profiler.beginPhase('apis');
                 SCORMAPI.discover();
+                Profiler.phase.end({ found: StateManager.get('apis').length });
 
                 this.reportProgress(2, 5, 'Checking for Storyline data files...');
-                const storylineItems = await StorylineExtractor.extract();
+                Profiler.beginPhase('storyline');
+                const storylineItems = await StorylineExtractor.extract({
+                    signal,
+                    onItems: (items, progress) => this.reportPartial('storyline', items, progress)
+                });
+                Profiler.phase.end({ items: storylineItems.length });
+                this.throwIfCancelled(signal);
 
                 this.reportProgress(3, 5, 'Extracting Storyline accessibility DOM...');
+                Profiler.beginPhase('storylineDOM');
                 const storylineDOMItems = StorylineDOMExtractor.extract();
+                this.reportPartial('storylineDOM', storylineDOMItems);
+                Profiler.phase.end({ items: storylineDOMItems.length });
 
                 this.reportProgress(4, 5, 'Scanning DOM for quizzes...');
+                Profiler.beginPhase('dom');
                 const domQuizzes = DOMQuizExtractor.extract();
                 const domItems = DOMQuizExtractor.toQAItems(domQuizzes);
+                this.reportPartial('dom', domItems);
+                Profiler.phase.end({ quizzes: domQuizzes.length, items: domItems.length });
 
                 this.reportProgress(5, 5, 'Analyzing resources...');
+                Profiler.beginPhase('resources');
                 ResourceDiscovery.discover();
-                const resourceItems = await ResourceDiscovery.analyze();
+                const resourceItems = await ResourceDiscovery.analyze({
+                    signal,
+                    onItems: (items, progress) => this.reportPartial('resources', items, progress)
+                });
+                Profiler.phase.end({ resources: StateManager.get('resources').length, items: resourceItems.length });
+                this.throwIfCancelled(signal);
 
-                const allItems = Utils.dedupeBy(
-                    [...storylineItems, ...storylineDOMItems, ...domItems, ...resourceItems],
-                    item => `${item.type}:${item.text.substring(0, 50)}`
+                const allItems = Utils.dedupeQA(
+                    [...storylineItems, ...storylineDOMItems, ...domItems, ...resourceItems]
                 );
 
                 StateManager.set('qa', allItems);
@@ -2308,8 +3396,10 @@
                 StateManager.set('lastScan', Date.now());
 
                 const scanTime = endTimer();
+                Profiler.finish({ items: allItems.length });
                 const report = Reporter.generate();
                 report.scanTime = scanTime;
+                report.profile = Profiler.summarize();
 
                 Logger.info('Scan complete', {
                     apis: report.apis.length,
@@ -2322,13 +3412,250 @@
 
             } catch (error) {
                 StateManager.set('scanning', false);
+                Profiler.finish({ error: error.message });
                 Logger.error('Scan failed', { error: error.message });
                 Messenger.send(MSG.SCAN_ERROR, { error: error.message });
+            } finally {
+                this.controller = null;
+            }
+        },
+
+        cancel() {
+            if (!this.controller) return false;
+            Logger.info('Cancelling scan...');
+            this.controller.abort();
+            return true;
+        },
+
+        throwIfCancelled(signal) {
+            if (signal.aborted) {
+                throw new Error('Scan cancelled');
             }
         },
 
         reportProgress(step, total, message) {
             Messenger.send(MSG.PROGRESS, { step, total, message });
+        },
+
+        /**
+         * Stream the items a phase found that have not been sent yet this run.
+         * Batches with no new items are still sent when they carry progress.
+         */
+        reportPartial(phase, items, progress = {}) {
+            const delta = items.filter(item => {
+                const key = Utils.qaKey(item);
+                if (this.streamed.has(key)) return false;
+                this.streamed.add(key);
+                return true;
+            });
+            Profiler.count('itemsEmitted', delta.length);
+
+            if (delta.length === 0 && !progress.total) return;
+
+            Messenger.send(MSG.SCAN_PARTIAL, {
+                phase,
+                seq: ++this.sequence,
+                items: delta,
+                streamed: this.streamed.size,
+                ...progress
+            });
+        }
+    };
+
+    // ═══════════════════════════════════════════════════════════════════════════
+    // SECTION 10B: LIVE MONITOR
+    // Re-extracts only the DOM regions that changed and merges them into state
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    const LiveMonitor = {
+        // Containers that own label/question relationships; a change anywhere
+        // inside one re-extracts the whole container
+        REGION_SELECTOR: '.slide-object, [class*="slide-object-"], .question, .quiz-item, .form-group, fieldset, [role="radiogroup"]',
+        ATTRIBUTES: [
+            'data-acc-text', 'aria-label', 'aria-labelledby', 'aria-checked',
+            'data-state', 'data-correct', 'data-answer', 'class', 'value'
+        ],
+
+        observer: null,
+        // Aborted by stop() to remove the iframe load listeners
+        listeners: null,
+        documents: new WeakSet(),
+        frames: new WeakSet(),
+        dirty: new Set(),
+        timer: null,
+
+        start() {
+            if (this.observer) return false;
+
+            this.observer = new MutationObserver(records => this.record(records));
+            this.listeners = new AbortController();
+            this.observeDocument(document);
+            Logger.info('Live monitoring started');
+            return true;
+        },
+
+        stop() {
+            if (!this.observer) return false;
+
+            this.observer.disconnect();
+            this.observer = null;
+            this.listeners.abort();
+            this.listeners = null;
+            this.documents = new WeakSet();
+            this.frames = new WeakSet();
+            this.dirty.clear();
+            clearTimeout(this.timer);
+            this.timer = null;
+            Logger.info('Live monitoring stopped');
+            return true;
+        },
+
+        isActive() {
+            return !!this.observer;
+        },
+
+        observeDocument(doc) {
+            if (!doc?.documentElement || this.documents.has(doc)) return;
+
+            this.documents.add(doc);
+            this.observer.observe(doc.documentElement, {
+                childList: true,
+                subtree: true,
+                characterData: true,
+                attributes: true,
+                attributeFilter: this.ATTRIBUTES
+            });
+
+            doc.querySelectorAll('iframe').forEach(iframe => this.watchFrame(iframe));
+        },
+
+        /**
+         * Observe a same-origin iframe now and again whenever it navigates
+         */
+        watchFrame(iframe) {
+            if (this.frames.has(iframe)) return;
+            this.frames.add(iframe);
+
+            const attach = () => {
+                if (!this.observer) return;
+                try {
+                    const doc = iframe.contentDocument;
+                    if (doc?.documentElement && !this.documents.has(doc)) {
+                        this.observeDocument(doc);
+                        this.markDirty(doc);
+                    }
+                } catch (e) { /* Cross-origin */ }
+            };
+
+            attach();
+            iframe.addEventListener('load', attach, { signal: this.listeners.signal });
+        },
+
+        record(records) {
+            for (const record of records) {
+                if (record.type === 'childList') {
+                    record.addedNodes.forEach(node => {
+                        if (node.nodeType !== Node.ELEMENT_NODE) return;
+                        if (node.tagName === 'IFRAME') {
+                            this.watchFrame(node);
+                        } else if (node.firstElementChild) {
+                            node.querySelectorAll('iframe').forEach(iframe => this.watchFrame(iframe));
+                        }
+                    });
+                }
+
+                const target = record.target.nodeType === Node.TEXT_NODE
+                    ? record.target.parentElement
+                    : record.target;
+                if (target) this.markDirty(target);
+            }
+        },
+
+        markDirty(node) {
+            this.dirty.add(node.closest?.(this.REGION_SELECTOR) || node);
+            this.schedule();
+        },
+
+        schedule() {
+            if (this.timer) return;
+            this.timer = setTimeout(() => this.flush(), CONFIG.DEBOUNCE_DELAY);
+        },
+
+        /**
+         * Drop items that came from changed or removed regions, re-extract those
+         * regions, and publish the merged list if anything actually changed
+         */
+        flush() {
+            this.timer = null;
+            if (!this.observer || this.dirty.size === 0) return;
+
+            // A full scan rebuilds everything; check again once it finishes
+            if (StateManager.get('scanning')) {
+                this.schedule();
+                return;
+            }
+
+            const start = performance.now();
+            const roots = this.topmost([...this.dirty]);
+            this.dirty.clear();
+
+            const qa = StateManager.get('qa');
+            const kept = qa.filter(item => {
+                const origin = Utils.getOrigin(item);
+                if (!origin) return true;
+                return origin.isConnected && !roots.some(root => root.contains(origin));
+            });
+
+            // Document-wide lookups are done once per flush, not once per region.
+            // Monitoring work never counts towards a scan profile.
+            const fresh = Profiler.outside(() => {
+                const context = { indexes: new Map(), storyline: StorylineDOMExtractor.isStorylinePage() };
+                return roots
+                    .filter(root => root.isConnected)
+                    .flatMap(root => this.extractFrom(root, context));
+            });
+
+            const merged = Utils.dedupeQA([...kept, ...fresh]);
+            if (this.signature(merged) === this.signature(qa)) return;
+
+            StateManager.set('qa', merged);
+            Logger.debug(`Incremental rescan of ${roots.length} region(s): ${(performance.now() - start).toFixed(1)}ms`);
+            Messenger.send(MSG.STATE, Reporter.generate());
+        },
+
+        topmost(nodes) {
+            return nodes.filter(node =>
+                !nodes.some(other => other !== node && other.contains(node))
+            );
+        },
+
+        /**
+         * Items inside root. context.indexes caches each document's label and
+         * radio maps; context.storyline is the page-level Storyline check.
+         */
+        extractFrom(root, context) {
+            const doc = root.ownerDocument || root;
+            const iframe = doc === document ? null : doc.defaultView?.frameElement || null;
+            const items = [];
+
+            if (context.storyline) {
+                items.push(...StorylineDOMExtractor.extractFromDocument(doc, root));
+            }
+
+            if (!context.indexes.has(doc)) {
+                context.indexes.set(doc, DOMQuizExtractor.buildIndex(doc, true));
+            }
+            const index = DOMQuizExtractor.scopeIndex(context.indexes.get(doc), root);
+
+            const quizzes = [];
+            DOMQuizExtractor.processDocument(doc, iframe, quizzes, new Set(), index);
+            items.push(...DOMQuizExtractor.toQAItems(quizzes));
+
+            return items;
+        },
+
+        signature(items) {
+            return items.map(item => `${item.type}:${item.correct ? 1 : 0}:${item.text}`).join('\n');
         }
     };
 
@@ -2341,7 +3668,7 @@
             const qa = StateManager.get('qa');
             const apis = StateManager.get('apis');
             const resources = StateManager.get('resources');
-            const logs = StateManager.get('logs');
+            const logs = Logger.getLogs();
             const warnings = StateManager.get('warnings');
 
             const questions = qa.filter(item => item.type === ITEM_TYPE.QUESTION);
@@ -2372,13 +3699,30 @@
         }
     };
 
+    // ═══════════════════════════════════════════════════════════════════════════
+    // SECTION 11B: SCAN DIFF
+    // Lives in lib/scan-diff.js, shared with the popup; the content script
+    // injects it ahead of this file
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    const ScanDiff = {
+        compare(baseline, current) {
+            if (!window.LMS_QA_DIFF) throw new Error('Scan diff is not loaded');
+            return window.LMS_QA_DIFF.compare(baseline, current);
+        }
+    };
+
     // ═══════════════════════════════════════════════════════════════════════════
     // SECTION 12: EXPORTER
     // ═══════════════════════════════════════════════════════════════════════════
 
     const Exporter = {
-        export(format = 'json') {
+        /**
+         * options.profile attaches the full span trace of the last scan
+         */
+        export(format = 'json', options = {}) {
             const report = Reporter.generate();
+            if (options.profile) report.profile = Profiler.get();
 
             let data, mimeType, filename;
             const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
@@ -2460,6 +3804,22 @@
                 lines.push(`${idx + 1}. ${item.text}`);
             });
 
+            const profile = report.profile && Profiler.summarize(report.profile);
+            if (profile) {
+                lines.push('');
+                lines.push('-'.repeat(60));
+                lines.push('SCAN PROFILE');
+                lines.push('-'.repeat(60));
+                lines.push('');
+                profile.phases.forEach(phase => {
+                    lines.push(`${phase.name}: ${phase.duration}ms`);
+                });
+                lines.push(`Total: ${profile.duration}ms`);
+                Object.entries(profile.counters).forEach(([counter, n]) => {
+                    lines.push(`${counter}: ${n}`);
+                });
+            }
+
             return lines.join('\n');
         }
     };
@@ -2471,27 +3831,42 @@
     window.LMS_QA = {
         version: VERSION,
         
-        getState: () => StateManager.get(),
+        getState: () => ({ ...StateManager.get(), logs: Logger.getLogs() }),
         getAPIs: () => StateManager.get('apis'),
         getQA: () => StateManager.get('qa'),
-        getLogs: () => StateManager.get('logs'),
+        getLogs: () => Logger.getLogs(),
 
         scan: () => Scanner.run(),
+        cancelScan: () => Scanner.cancel(),
+        startMonitoring: () => LiveMonitor.start(),
+        stopMonitoring: () => LiveMonitor.stop(),
+        isMonitoring: () => LiveMonitor.isActive(),
         testAPI: (index) => SCORMAPI.test(index),
         setCompletion: (opts) => SCORMAPI.setCompletion(opts),
+        setLogLevel: (level, capture = 'INFO') => {
+            Logger.setLevel(level);
+            Logger.setCaptureLevel(capture);
+        },
         getCmiData: () => SCORMAPI.getCmiData(),
         
-        getDOMQuizzes: () => DOMQuizExtractor.extract(),
-        autoSelect: () => DOMQuizExtractor.autoSelect(),
+        getDOMQuizzes: () => Profiler.outside(() => DOMQuizExtractor.extract()),
+        autoSelect: () => Profiler.outside(() => DOMQuizExtractor.autoSelect()),
 
-        getStorylineDOM: () => StorylineDOMExtractor.extract(),
+        getStorylineDOM: () => Profiler.outside(() => StorylineDOMExtractor.extract()),
         isStorylinePage: () => StorylineDOMExtractor.isStorylinePage(),
 
-        export: (format) => Exporter.export(format),
+        export: (format, options) => Exporter.export(format, options),
         getReport: () => Reporter.generate(),
+        getProfile: () => Profiler.get(),
+        getTrace: () => Profiler.toTrace(),
+        diff: (baseline, current = Reporter.generate()) => ScanDiff.compare(baseline, current),
 
         discoverAPIs: () => SCORMAPI.discover(),
-        discoverResources: () => ResourceDiscovery.discover()
+        discoverResources: () => ResourceDiscovery.discover(),
+        clearCache: () => ResourceCache.clear(),
+
+        // Not part of the API; lets the test suite reach internal helpers
+        _internals: Object.freeze({ FetchScheduler })
     };
 
     // ═══════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,310 @@
+/**
+ * LMS QA Validator - Scan Diff v1.0
+ * Compares two scan reports question by question
+ *
+ * Shared by the page (LMS_QA.diff) and the popup, which diffs stored scans
+ * itself rather than shipping both reports through the page and back
+ *
+ * @fileoverview Aligns questions and answers across course versions
+ */
+
+(function() {
+    'use strict';
+
+    const ITEM_TYPE = Object.freeze({
+        QUESTION: 'question',
+        ANSWER: 'answer'
+    });
+
+    /**
+     * 32-bit FNV-1a as hex; fast and synchronous, not collision resistant
+     */
+    function fnv1a(text) {
+        let hash = 0x811c9dc5;
+        for (let i = 0; i < text.length; i++) {
+            hash ^= text.charCodeAt(i);
+            hash = Math.imul(hash, 0x01000193);
+        }
+        return (hash >>> 0).toString(16);
+    }
+
+    // ═══════════════════════════════════════════════════════════════════════════
+    // SCAN DIFF
+    // Identical text pairs first, then trigram similarity pairs reworded items.
+    // Changes carry stable IDs derived from normalized question/answer text.
+    // ═══════════════════════════════════════════════════════════════════════════
+
+
+    const ScanDiff = {
+        SIMILARITY_THRESHOLD: 0.6,
+        // Trigrams shared by more entries than this are too common to rank candidates
+        MAX_POSTINGS: 64,
+
+        CHANGE: Object.freeze({
+            ADDED: 'added',
+            REMOVED: 'removed',
+            CHANGED: 'changed',
+            CORRECT: 'correct'
+        }),
+
+        /**
+         * Diff a baseline report against a current one (both Reporter.generate output)
+         */
+        compare(baseline, current) {
+            const changes = [];
+            const summary = { added: 0, removed: 0, changed: 0, correct: 0, unchanged: 0 };
+            const record = (change) => {
+                changes.push(change);
+                summary[change.kind]++;
+            };
+
+            const { pairs, removed, added } = this.align(this.group(baseline), this.group(current));
+
+            for (const { before, after, score } of pairs) {
+                if (!after.item) {
+                    // Answers listed before any question on both sides
+                } else if (before.key !== after.key) {
+                    record({
+                        kind: this.CHANGE.CHANGED,
+                        type: ITEM_TYPE.QUESTION,
+                        id: after.id,
+                        question: after.text,
+                        before: before.text,
+                        after: after.text,
+                        similarity: Math.round(score * 100) / 100
+                    });
+                } else {
+                    summary.unchanged++;
+                }
+
+                this.compareAnswers(before, after, record, summary);
+            }
+
+            removed.forEach(group => this.recordGroup(group, this.CHANGE.REMOVED, record));
+            added.forEach(group => this.recordGroup(group, this.CHANGE.ADDED, record));
+
+            return {
+                baseline: this.describe(baseline),
+                current: this.describe(current),
+                summary,
+                changes
+            };
+        },
+
+        /**
+         * Answers of a paired question keep the baseline question's ID in
+         * theirs, so rewording a question leaves its answers' IDs alone
+         */
+        compareAnswers(beforeGroup, afterGroup, record, summary) {
+            const { pairs, removed, added } = this.align(beforeGroup.answers, afterGroup.answers);
+            const scope = beforeGroup.id;
+
+            for (const { before, after, score } of pairs) {
+                const correctChanged = before.correct !== after.correct;
+                const base = {
+                    type: ITEM_TYPE.ANSWER,
+                    id: `${scope}/${after.id}`,
+                    question: afterGroup.text,
+                    before: before.text,
+                    after: after.text,
+                    correct: { before: before.correct, after: after.correct }
+                };
+
+                if (before.key !== after.key) {
+                    record({ kind: this.CHANGE.CHANGED, ...base, similarity: Math.round(score * 100) / 100 });
+                } else if (correctChanged) {
+                    record({ kind: this.CHANGE.CORRECT, ...base });
+                } else {
+                    summary.unchanged++;
+                }
+            }
+
+            removed.forEach(answer => record(this.answerChange(answer, scope, afterGroup.text || beforeGroup.text, this.CHANGE.REMOVED)));
+            added.forEach(answer => record(this.answerChange(answer, scope, afterGroup.text, this.CHANGE.ADDED)));
+        },
+
+        recordGroup(group, kind, record) {
+            if (group.item) {
+                record({
+                    kind,
+                    type: ITEM_TYPE.QUESTION,
+                    id: group.id,
+                    question: group.text,
+                    before: kind === this.CHANGE.REMOVED ? group.text : null,
+                    after: kind === this.CHANGE.ADDED ? group.text : null
+                });
+            }
+            group.answers.forEach(answer => record(this.answerChange(answer, group.id, group.text, kind)));
+        },
+
+        answerChange(answer, scope, question, kind) {
+            const removed = kind === this.CHANGE.REMOVED;
+            return {
+                kind,
+                type: ITEM_TYPE.ANSWER,
+                id: `${scope}/${answer.id}`,
+                question,
+                before: removed ? answer.text : null,
+                after: removed ? null : answer.text,
+                correct: { before: removed ? answer.correct : null, after: removed ? null : answer.correct }
+            };
+        },
+
+        describe(report) {
+            const items = report?.qa?.items || [];
+            return {
+                url: report?.url || null,
+                timestamp: report?.timestamp || null,
+                questions: items.filter(i => i.type === ITEM_TYPE.QUESTION).length,
+                answers: items.filter(i => i.type !== ITEM_TYPE.QUESTION).length,
+                correct: items.filter(i => i.correct).length
+            };
+        },
+
+        /**
+         * Split a report's flat item list into questions with their answers.
+         * Items before the first question form an untitled group.
+         */
+        group(report) {
+            const groups = [];
+            let current = null;
+
+            for (const item of report?.qa?.items || []) {
+                if (item.type === ITEM_TYPE.QUESTION) {
+                    current = { ...this.entry(item, 'q'), answers: [] };
+                    groups.push(current);
+                    continue;
+                }
+
+                if (!current) {
+                    current = { item: null, text: '', key: '', id: 'q-', grams: null, answers: [] };
+                    groups.push(current);
+                }
+                current.answers.push(this.entry(item, 'a'));
+            }
+
+            return groups;
+        },
+
+        /**
+         * An entry's ID depends only on its own normalized text
+         */
+        entry(item, prefix) {
+            const key = this.normalize(item.text);
+            return {
+                item,
+                text: item.text || '',
+                key,
+                id: `${prefix}-${fnv1a(key)}`,
+                correct: !!item.correct,
+                grams: null
+            };
+        },
+
+        normalize(text) {
+            return String(text || '').toLowerCase().replace(/[^\p{L}\p{N}]+/gu, ' ').trim();
+        },
+
+        trigrams(entry) {
+            if (!entry.grams) {
+                const padded = `  ${entry.key} `;
+                entry.grams = new Set();
+                for (let i = 0; i + 3 <= padded.length; i++) {
+                    entry.grams.add(padded.slice(i, i + 3));
+                }
+            }
+            return entry.grams;
+        },
+
+        /**
+         * Pair two entry lists. Identical keys pair in order; each leftover
+         * current entry then takes the most similar unpaired baseline entry found
+         * through a trigram index, if it clears the threshold.
+         */
+        align(before, after) {
+            const pairs = [];
+            const paired = new Uint8Array(before.length);
+            const byKey = new Map();
+
+            before.forEach((entry, i) => {
+                if (!byKey.has(entry.key)) byKey.set(entry.key, []);
+                byKey.get(entry.key).push(i);
+            });
+
+            const cursor = new Map();
+            const unpairedAfter = [];
+
+            after.forEach((entry, at) => {
+                const slots = byKey.get(entry.key);
+                const next = cursor.get(entry.key) || 0;
+
+                if (slots && next < slots.length) {
+                    cursor.set(entry.key, next + 1);
+                    paired[slots[next]] = 1;
+                    pairs.push({ before: before[slots[next]], after: entry, score: 1, at });
+                } else {
+                    unpairedAfter.push({ entry, at });
+                }
+            });
+
+            // Trigram postings over unpaired baseline entries
+            const postings = new Map();
+            before.forEach((entry, i) => {
+                if (paired[i]) return;
+                for (const gram of this.trigrams(entry)) {
+                    if (!postings.has(gram)) postings.set(gram, []);
+                    postings.get(gram).push(i);
+                }
+            });
+
+            const added = [];
+
+            for (const { entry, at } of unpairedAfter) {
+                const grams = this.trigrams(entry);
+                const shared = new Map();
+
+                for (const gram of grams) {
+                    const list = postings.get(gram);
+                    if (!list || list.length > this.MAX_POSTINGS) continue;
+                    for (const i of list) {
+                        if (!paired[i]) shared.set(i, (shared.get(i) || 0) + 1);
+                    }
+                }
+
+                let best = -1;
+                let bestScore = 0;
+                for (const [i, count] of shared) {
+                    // Dice coefficient over trigram sets
+                    const score = (2 * count) / (grams.size + this.trigrams(before[i]).size);
+                    if (score > bestScore) {
+                        best = i;
+                        bestScore = score;
+                    }
+                }
+
+                if (best !== -1 && bestScore >= this.SIMILARITY_THRESHOLD) {
+                    paired[best] = 1;
+                    pairs.push({ before: before[best], after: entry, score: bestScore, at });
+                } else {
+                    added.push(entry);
+                }
+            }
+
+            return {
+                pairs: pairs.sort((a, b) => a.at - b.at),
+                removed: before.filter((_, i) => !paired[i]),
+                added
+            };
+        }
+    };
+
+    // ═══════════════════════════════════════════════════════════════════════════
+    // PUBLIC API
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    window.LMS_QA_DIFF = Object.freeze({
+        CHANGE: ScanDiff.CHANGE,
+        compare: (baseline, current) => ScanDiff.compare(baseline, current)
+    });
+
+})();
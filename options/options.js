@@ -0,0 +1,111 @@
+/**
+ * LMS QA Validator - Rules Page
+ * Imports selector rule packs. Runs in a tab rather than the action popup,
+ * which closes when a file picker takes focus and would cut an import short.
+ *
+ * @fileoverview Streams a chosen rule file to the service worker chunk by chunk
+ */
+
+(function() {
+    'use strict';
+
+    const $ = {};
+
+    function cacheElements() {
+        ['btn-import-rules', 'rules-file', 'progress-container', 'progress-fill', 'progress-text', 'import-result']
+            .forEach(id => {
+                const key = id.replace(/-([a-z])/g, (_, c) => c.toUpperCase());
+                $[key] = document.getElementById(id);
+            });
+    }
+
+    function sendToServiceWorker(type, data = {}) {
+        return new Promise((resolve) => {
+            chrome.runtime.sendMessage({ type, ...data }, (response) => {
+                if (chrome.runtime.lastError) {
+                    resolve({ success: false, error: chrome.runtime.lastError.message });
+                } else {
+                    resolve(response);
+                }
+            });
+        });
+    }
+
+    // ═══════════════════════════════════════════════════════════════════════════
+    // UI
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    const UI = {
+        setProgress(done, total, message) {
+            $.progressContainer.classList.add('active');
+            $.progressFill.style.width = `${(done / total) * 100}%`;
+            $.progressText.textContent = message;
+        },
+
+        hideProgress() {
+            $.progressContainer.classList.remove('active');
+        },
+
+        showResult(message, kind) {
+            $.importResult.textContent = message;
+            $.importResult.className = `options-result ${kind}`;
+        }
+    };
+
+    // ═══════════════════════════════════════════════════════════════════════════
+    // IMPORT
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    /**
+     * Stream a rule pack to the service worker chunk by chunk; each chunk waits
+     * for the previous response, so the worker sees them in order
+     */
+    async function importRules(file) {
+        if (!file) return;
+
+        const importId = `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+        const reader = file.stream().getReader();
+        const decoder = new TextDecoder();
+        let bytes = 0;
+        let response = null;
+
+        $.btnImportRules.disabled = true;
+        UI.showResult('', '');
+
+        try {
+            while (true) {
+                const { value, done } = await reader.read();
+                if (value) bytes += value.byteLength;
+
+                response = await sendToServiceWorker('IMPORT_RULES_CHUNK', {
+                    importId,
+                    text: value ? decoder.decode(value, { stream: true }) : decoder.decode(),
+                    done
+                });
+                if (!response?.success) throw new Error(response?.error || 'Unknown');
+
+                UI.setProgress(bytes, file.size || 1, `Importing rules: ${response.stats.imported + response.stats.updated} saved`);
+                if (done) break;
+            }
+
+            const { imported, updated, duplicates, invalid } = response.stats;
+            UI.showResult(`${file.name}: ${imported} added, ${updated} updated, ${duplicates} duplicate, ${invalid} invalid`, 'success');
+        } catch (error) {
+            reader.cancel().catch(() => {});
+            UI.showResult(`Rule import failed: ${error.message}`, 'error');
+        } finally {
+            UI.hideProgress();
+            $.btnImportRules.disabled = false;
+            $.rulesFile.value = '';
+        }
+    }
+
+    // ═══════════════════════════════════════════════════════════════════════════
+    // INITIALIZATION
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    cacheElements();
+    $.btnImportRules.addEventListener('click', () => $.rulesFile.click());
+    $.rulesFile.addEventListener('change', (e) => importRules(e.target.files[0]));
+
+})();
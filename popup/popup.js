@@ -24,11 +24,13 @@
         SCAN_STARTED: 'SCAN_STARTED',
         SCAN_COMPLETE: 'SCAN_COMPLETE',
         SCAN_ERROR: 'SCAN_ERROR',
+        SCAN_PARTIAL: 'SCAN_PARTIAL',
         PROGRESS: 'PROGRESS',
         TEST_RESULT: 'TEST_RESULT',
         SET_COMPLETION_RESULT: 'SET_COMPLETION_RESULT',
         CMI_DATA: 'CMI_DATA',
         AUTO_SELECT_RESULT: 'AUTO_SELECT_RESULT',
+        TRACE_DATA: 'TRACE_DATA',
         STATE_UPDATE: 'STATE_UPDATE'
     });
 
@@ -39,6 +41,27 @@
         ERROR: { text: 'Error', class: 'error' }
     });
 
+    const EMPTY_STATE = Object.freeze({
+        QA: '<div class="empty-state">No Q&A found. Try scanning the page.</div>',
+        APIS: '<div class="empty-state">No SCORM/xAPI detected.</div>',
+        CORRECT: '<div class="empty-state">No correct answers found.</div>',
+        LOGS: '<div class="empty-state">No logs yet.</div>',
+        CHANGES: '<div class="empty-state">No changes since the previous scan.</div>'
+    });
+
+    const CHANGE_LABELS = Object.freeze({
+        added: 'Added',
+        removed: 'Removed',
+        changed: 'Changed',
+        correct: 'Key'
+    });
+
+    // Progress wording for SCAN_PARTIAL batches that report completed/total
+    const PARTIAL_PHASE_LABELS = Object.freeze({
+        storyline: { name: 'Storyline', unit: 'slides' },
+        resources: { name: 'Resources', unit: 'files' }
+    });
+
     // ═══════════════════════════════════════════════════════════════════════════
     // UTILITIES
     // ═══════════════════════════════════════════════════════════════════════════
@@ -80,9 +103,21 @@
         tabId: null,
         tabUrl: '',
         results: null,
+        // Saved selector rule matching this tab, if any
+        rule: null,
+        partialItems: [],
+        partialQuestions: 0,
+        partialCorrect: 0,
 
         reset() {
             this.results = null;
+            this.resetPartial();
+        },
+
+        resetPartial() {
+            this.partialItems = [];
+            this.partialQuestions = 0;
+            this.partialCorrect = 0;
         },
 
         hasResults() {
@@ -114,10 +149,12 @@
             'search-container', 'search-input', 'search-count',
             'results-tabs', 'qa-list', 'apis-list', 'correct-list', 'logs-list',
             'qa-count', 'apis-count', 'correct-count', 'logs-count',
+            'changes-panel', 'changes-list', 'changes-count', 'changes-summary', 'btn-compare',
             'scorm-controls', 'completion-status', 'completion-score',
             'btn-test-api', 'btn-set-completion',
-            'quick-actions', 'btn-auto-select',
-            'btn-export-json', 'btn-export-csv', 'btn-export-txt',
+            'quick-actions', 'btn-auto-select', 'btn-pick-elements', 'btn-apply-rule',
+            'btn-export-json', 'btn-export-csv', 'btn-export-txt', 'btn-export-trace',
+            'btn-export-rules', 'btn-import-rules',
             'toast'
         ];
 
@@ -237,6 +274,154 @@
             $.tabPanels?.forEach(panel => {
                 panel.classList.toggle('active', panel.id === `${tabId}-panel`);
             });
+
+            // Lists in hidden panels could not measure their rows
+            Object.values(Renderer.lists).forEach(list => list.refresh());
+        }
+    };
+
+    // ═══════════════════════════════════════════════════════════════════════════
+    // VIRTUAL LIST
+    // Materializes only the rows in view, reusing a small pool of nodes
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    const VirtualList = {
+        /**
+         * Turn a scrollable container into a windowed list.
+         * renderRow(element, item, index) fills a pooled row element in place.
+         * Rows may wrap, so heights start as estimates and are replaced by
+         * measurements as rows scroll into view.
+         */
+        create(container, { renderRow, emptyHTML = '', estimatedHeight = 32, overscan = 8 }) {
+            let items = [];
+            let heights = [];
+            const offsets = [0];
+            let validOffsets = 0;
+            let pool = [];
+            let spacer = null;
+            let viewport = null;
+            let frame = 0;
+
+            function ensureScaffold() {
+                if (spacer?.parentNode === container) return;
+
+                container.innerHTML = '';
+                spacer = document.createElement('div');
+                spacer.className = 'virtual-spacer';
+                viewport = document.createElement('div');
+                viewport.className = 'virtual-window';
+                spacer.appendChild(viewport);
+                container.appendChild(spacer);
+                pool = [];
+            }
+
+            function invalidateFrom(index) {
+                validOffsets = Math.min(validOffsets, index);
+            }
+
+            function updateOffsets() {
+                for (let i = validOffsets; i < items.length; i++) {
+                    offsets[i + 1] = offsets[i] + heights[i];
+                }
+                offsets.length = items.length + 1;
+                validOffsets = items.length;
+            }
+
+            // Index of the row containing vertical position y
+            function indexAt(y) {
+                let lo = 0;
+                let hi = items.length - 1;
+                while (lo < hi) {
+                    const mid = (lo + hi + 1) >> 1;
+                    if (offsets[mid] <= y) lo = mid;
+                    else hi = mid - 1;
+                }
+                return lo;
+            }
+
+            function render() {
+                frame = 0;
+
+                if (items.length === 0) {
+                    container.innerHTML = emptyHTML;
+                    spacer = null;
+                    return;
+                }
+
+                ensureScaffold();
+                updateOffsets();
+
+                const top = container.scrollTop;
+                const bottom = top + (container.clientHeight || estimatedHeight * 10);
+                const start = Math.max(0, indexAt(top) - overscan);
+                const end = Math.min(items.length, indexAt(bottom) + 1 + overscan);
+
+                while (pool.length < end - start) {
+                    const row = document.createElement('div');
+                    viewport.appendChild(row);
+                    pool.push(row);
+                }
+
+                pool.forEach((row, slot) => {
+                    const index = start + slot;
+                    if (index >= end) {
+                        row.style.display = 'none';
+                        return;
+                    }
+                    if (row.dataset.index !== String(index)) {
+                        renderRow(row, items[index], index);
+                        row.dataset.index = index;
+                    }
+                    row.style.display = '';
+                });
+
+                // Replace estimates with real heights for the rows now in view
+                for (let index = start; index < end; index++) {
+                    const measured = pool[index - start].offsetHeight;
+                    if (measured && measured !== heights[index]) {
+                        heights[index] = measured;
+                        invalidateFrom(index);
+                    }
+                }
+                updateOffsets();
+
+                viewport.style.transform = `translateY(${offsets[start]}px)`;
+                spacer.style.height = `${offsets[items.length]}px`;
+            }
+
+            function schedule() {
+                if (!frame) frame = requestAnimationFrame(render);
+            }
+
+            container.addEventListener('scroll', schedule, { passive: true });
+
+            return {
+                setItems(next) {
+                    items = next.slice();
+                    heights = items.map(() => estimatedHeight);
+                    validOffsets = 0;
+                    pool.forEach(row => { row.dataset.index = ''; });
+                    container.scrollTop = 0;
+                    render();
+                },
+
+                append(more) {
+                    if (more.length === 0) return;
+                    invalidateFrom(items.length);
+                    items.push(...more);
+                    heights.push(...more.map(() => estimatedHeight));
+                    schedule();
+                },
+
+                // Re-measure after the container becomes visible or resizes
+                refresh() {
+                    schedule();
+                },
+
+                get length() {
+                    return items.length;
+                }
+            };
         }
     };
 
@@ -249,6 +434,8 @@
             if (!results) return;
 
             State.results = results;
+            // Index new results up front so the first keystroke does not pay for it
+            Search.getIndex(State.getQAItems());
 
             this.renderQA(results.qa?.items || []);
             this.renderAPIs(results.apis || []);
@@ -267,42 +454,75 @@
             }
         },
 
+        lists: {},
+        // Question number shown on each Q&A row (answers carry their question's number)
+        qaNumbers: [],
+
+        initLists() {
+            if ($.qaList) {
+                this.lists.qa = VirtualList.create($.qaList, {
+                    emptyHTML: EMPTY_STATE.QA,
+                    renderRow: (row, item, index) => this.fillQARow(row, item, this.qaNumbers[index])
+                });
+            }
+            if ($.correctList) {
+                this.lists.correct = VirtualList.create($.correctList, {
+                    emptyHTML: EMPTY_STATE.CORRECT,
+                    renderRow: (row, item, index) => this.fillCorrectRow(row, item, index + 1)
+                });
+            }
+            if ($.logsList) {
+                this.lists.logs = VirtualList.create($.logsList, {
+                    emptyHTML: EMPTY_STATE.LOGS,
+                    estimatedHeight: 22,
+                    renderRow: (row, log) => this.fillLogRow(row, log)
+                });
+            }
+            if ($.changesList) {
+                this.lists.changes = VirtualList.create($.changesList, {
+                    emptyHTML: EMPTY_STATE.CHANGES,
+                    renderRow: (row, change) => this.fillChangeRow(row, change)
+                });
+            }
+        },
+
+        numberQuestions(items, startAt = 0) {
+            let questionNum = startAt;
+            return items.map(item => {
+                if (item.type === 'question') questionNum++;
+                return questionNum;
+            });
+        },
+
         renderQA(items) {
-            if (!$.qaList) return;
+            this.qaNumbers = this.numberQuestions(items);
+            this.lists.qa?.setItems(items);
+        },
+
+        fillQARow(row, item, questionNum) {
+            row.dataset.text = item.text || '';
 
-            if (items.length === 0) {
-                $.qaList.innerHTML = '<div class="empty-state">No Q&A found. Try scanning the page.</div>';
+            if (item.type === 'question') {
+                row.className = 'qa-item question';
+                row.innerHTML = `
+                    <span class="qa-num">Q${questionNum}</span>
+                    <span class="qa-text">${escapeHtml(item.text)}</span>
+                `;
                 return;
             }
 
-            let questionNum = 0;
-            $.qaList.innerHTML = items.map(item => {
-                if (item.type === 'question') {
-                    questionNum++;
-                    return `
-                        <div class="qa-item question" data-text="${escapeHtml(item.text)}">
-                            <span class="qa-num">Q${questionNum}</span>
-                            <span class="qa-text">${escapeHtml(item.text)}</span>
-                        </div>
-                    `;
-                } else {
-                    const correctClass = item.correct ? 'correct' : '';
-                    const marker = item.correct ? '✓' : '○';
-                    return `
-                        <div class="qa-item answer ${correctClass}" data-text="${escapeHtml(item.text)}">
-                            <span class="qa-marker">${marker}</span>
-                            <span class="qa-text">${escapeHtml(item.text)}</span>
-                        </div>
-                    `;
-                }
-            }).join('');
+            row.className = `qa-item answer ${item.correct ? 'correct' : ''}`;
+            row.innerHTML = `
+                <span class="qa-marker">${item.correct ? '✓' : '○'}</span>
+                <span class="qa-text">${escapeHtml(item.text)}</span>
+            `;
         },
 
         renderAPIs(apis) {
             if (!$.apisList) return;
 
             if (apis.length === 0) {
-                $.apisList.innerHTML = '<div class="empty-state">No SCORM/xAPI detected.</div>';
+                $.apisList.innerHTML = EMPTY_STATE.APIS;
                 return;
             }
 
@@ -319,36 +539,81 @@
         },
 
         renderCorrect(items) {
-            if (!$.correctList) return;
-
-            if (items.length === 0) {
-                $.correctList.innerHTML = '<div class="empty-state">No correct answers found.</div>';
-                return;
-            }
+            this.lists.correct?.setItems(items);
+        },
 
-            $.correctList.innerHTML = items.map((item, idx) => `
-                <div class="correct-item" data-text="${escapeHtml(item.text)}">
-                    <span class="correct-num">${idx + 1}.</span>
-                    <span class="correct-text">${escapeHtml(item.text)}</span>
-                </div>
-            `).join('');
+        fillCorrectRow(row, item, num) {
+            row.className = 'correct-item';
+            row.dataset.text = item.text || '';
+            row.innerHTML = `
+                <span class="correct-num">${num}.</span>
+                <span class="correct-text">${escapeHtml(item.text)}</span>
+            `;
         },
 
         renderLogs(logs) {
-            if (!$.logsList) return;
+            this.lists.logs?.setItems(logs.slice().reverse());
+        },
 
-            if (logs.length === 0) {
-                $.logsList.innerHTML = '<div class="empty-state">No logs yet.</div>';
-                return;
+        fillLogRow(row, log) {
+            row.className = `log-item ${log.level?.toLowerCase() || 'info'}`;
+            row.innerHTML = `
+                <span class="log-time">${log.timestamp?.split('T')[1]?.split('.')[0] || ''}</span>
+                <span class="log-level">${log.level || 'INFO'}</span>
+                <span class="log-msg">${escapeHtml(log.message)}</span>
+            `;
+        },
+
+        renderDiff(diff) {
+            const { added, removed, changed, correct } = diff.summary;
+            const when = diff.baseline?.timestamp ? new Date(diff.baseline.timestamp).toLocaleString() : 'previous scan';
+
+            if ($.changesSummary) {
+                $.changesSummary.textContent = `vs ${when}: ${added} added, ${removed} removed, ${changed} changed, ${correct} key change(s)`;
             }
+            UI.updateBadge($.changesCount, diff.changes.length);
+            this.lists.changes?.setItems(diff.changes);
+        },
 
-            $.logsList.innerHTML = logs.slice(-100).reverse().map(log => `
-                <div class="log-item ${log.level?.toLowerCase() || 'info'}">
-                    <span class="log-time">${log.timestamp?.split('T')[1]?.split('.')[0] || ''}</span>
-                    <span class="log-level">${log.level || 'INFO'}</span>
-                    <span class="log-msg">${escapeHtml(log.message)}</span>
-                </div>
-            `).join('');
+        fillChangeRow(row, change) {
+            row.className = `change-item ${change.kind}`;
+            row.dataset.text = change.after || change.before || '';
+
+            let text = escapeHtml(change.after ?? change.before);
+            if (change.kind === 'changed') {
+                text = `<span class="change-before">${escapeHtml(change.before)}</span> ${text}`;
+            } else if (change.kind === 'correct') {
+                text += change.correct.after ? ' — now correct' : ' — no longer correct';
+            }
+
+            row.innerHTML = `
+                <span class="change-kind">${CHANGE_LABELS[change.kind]} ${change.type === 'question' ? 'Q' : 'A'}</span>
+                <span class="change-text">${text}</span>
+            `;
+        },
+
+        /**
+         * Append items streamed in while a scan is still running
+         */
+        renderPartial(items) {
+            // Replace the previous results on the first batch
+            if (State.partialItems.length === 0) {
+                this.renderQA([]);
+                this.renderCorrect([]);
+            }
+
+            const numbers = this.numberQuestions(items, State.partialQuestions);
+            State.partialQuestions = numbers[numbers.length - 1] ?? State.partialQuestions;
+            this.qaNumbers.push(...numbers);
+            this.lists.qa?.append(items);
+
+            const correct = items.filter(i => i.correct);
+            State.partialCorrect += correct.length;
+            this.lists.correct?.append(correct);
+
+            State.partialItems.push(...items);
+            UI.updateBadge($.qaCount, State.partialItems.length);
+            UI.updateBadge($.correctCount, State.partialCorrect);
         },
 
         renderRelatedTabs(tabs) {
@@ -385,29 +650,150 @@
     // SEARCH & FILTER
     // ═══════════════════════════════════════════════════════════════════════════
 
+    /**
+     * Trigram index over Q&A text. Terms of three or more characters are
+     * answered from posting lists and verified with includes(); shorter terms
+     * fall back to scanning the current candidates.
+     */
+    const SearchIndex = {
+        build(items) {
+            const texts = items.map(item => (item.text || '').toLowerCase());
+            const sources = items.map(item => (item.source || '').toLowerCase());
+            const correct = items.map(item => !!item.correct);
+            const grams = new Map();
+
+            texts.forEach((text, id) => {
+                for (let i = 0; i + 3 <= text.length; i++) {
+                    const gram = text.substr(i, 3);
+                    let postings = grams.get(gram);
+                    if (!postings) {
+                        postings = [];
+                        grams.set(gram, postings);
+                    }
+                    // Ids are visited in order, so postings stay sorted and unique
+                    if (postings[postings.length - 1] !== id) postings.push(id);
+                }
+            });
+
+            return { size: items.length, texts, sources, correct, grams };
+        },
+
+        /**
+         * Split a query into text terms and filters.
+         * Supports "quoted phrases", is:correct and source:<text>.
+         */
+        parse(query) {
+            const parsed = { terms: [], correctOnly: false, source: null };
+            const tokens = query.toLowerCase().match(/"[^"]*"|\S+/g) || [];
+
+            tokens.forEach(token => {
+                if (token === 'is:correct') {
+                    parsed.correctOnly = true;
+                } else if (token.startsWith('source:') && token.length > 7) {
+                    parsed.source = token.slice(7);
+                } else {
+                    const term = token.replace(/^"|"$/g, '');
+                    if (term) parsed.terms.push(term);
+                }
+            });
+
+            return parsed;
+        },
+
+        /**
+         * Ids of items matching every term and filter, in original order
+         */
+        query(index, query) {
+            const { terms, correctOnly, source } = this.parse(query);
+
+            // Most selective terms first: long terms narrow via the index,
+            // short ones only filter what is left
+            const ordered = [...terms].sort((a, b) => b.length - a.length);
+            let ids = null;
+
+            for (const term of ordered) {
+                if (term.length >= 3) {
+                    const candidates = this.lookup(index, term);
+                    ids = ids ? this.intersect(ids, candidates) : candidates;
+                    ids = ids.filter(id => index.texts[id].includes(term));
+                } else {
+                    ids = (ids || this.all(index)).filter(id => index.texts[id].includes(term));
+                }
+                if (ids.length === 0) return ids;
+            }
+
+            ids = ids || this.all(index);
+            if (correctOnly) ids = ids.filter(id => index.correct[id]);
+            if (source) ids = ids.filter(id => index.sources[id].includes(source));
+            return ids;
+        },
+
+        lookup(index, term) {
+            const lists = [];
+            for (let i = 0; i + 3 <= term.length; i++) {
+                const postings = index.grams.get(term.substr(i, 3));
+                if (!postings) return [];
+                lists.push(postings);
+            }
+
+            lists.sort((a, b) => a.length - b.length);
+            return lists.reduce((acc, list) => this.intersect(acc, list));
+        },
+
+        intersect(a, b) {
+            const out = [];
+            let i = 0;
+            let j = 0;
+            while (i < a.length && j < b.length) {
+                if (a[i] === b[j]) {
+                    out.push(a[i]);
+                    i++;
+                    j++;
+                } else if (a[i] < b[j]) {
+                    i++;
+                } else {
+                    j++;
+                }
+            }
+            return out;
+        },
+
+        all(index) {
+            return Array.from({ length: index.size }, (_, id) => id);
+        }
+    };
+
     const Search = {
+        index: null,
+        indexedItems: null,
+
+        getIndex(items) {
+            if (this.indexedItems !== items) {
+                this.index = SearchIndex.build(items);
+                this.indexedItems = items;
+            }
+            return this.index;
+        },
+
         filter: debounce(function(query) {
             const items = State.getQAItems();
             if (items.length === 0) return;
 
-            const normalizedQuery = query.toLowerCase().trim();
-            
-            if (!normalizedQuery) {
+            if (!query.trim()) {
                 Renderer.renderQA(items);
+                Renderer.renderCorrect(items.filter(i => i.correct));
                 UI.setSearchCount(items.length, items.length);
                 return;
             }
 
-            const filtered = items.filter(item => 
-                item.text?.toLowerCase().includes(normalizedQuery)
-            );
+            const ids = SearchIndex.query(Search.getIndex(items), query);
+            const filtered = ids.map(id => items[id]);
 
             Renderer.renderQA(filtered);
             UI.setSearchCount(filtered.length, items.length);
 
             // Update correct tab too
-            const correctFiltered = filtered.filter(i => i.correct);
-            Renderer.renderCorrect(correctFiltered);
+            Renderer.renderCorrect(filtered.filter(i => i.correct));
         }, DEBOUNCE_DELAY),
 
         clear() {
@@ -452,6 +838,65 @@
         }
     };
 
+    // ═══════════════════════════════════════════════════════════════════════════
+    // TRACING
+    // Popup side of scan traces: service worker -> popup hops, handler time and
+    // time to the next painted frame, sent to the service worker after each scan
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    const Tracing = {
+        PID: 3,
+        MAX_EVENTS: 2000,
+        // Messages whose handlers re-render results; timed through the next frame
+        RENDERS: new Set([MSG.SCAN_COMPLETE, MSG.STATE_UPDATE]),
+        events: [],
+
+        now() {
+            return performance.timeOrigin + performance.now();
+        },
+
+        event(name, startMs, endMs, tid, args = {}) {
+            if (this.events.length >= this.MAX_EVENTS) return;
+            this.events.push({
+                name,
+                cat: 'popup',
+                ph: 'X',
+                ts: Math.round(startMs * 1000),
+                dur: Math.max(0, Math.round((endMs - startMs) * 1000)),
+                pid: this.PID,
+                tid,
+                args
+            });
+        },
+
+        /**
+         * Record one handled message; start is when its handler began
+         */
+        record(message, start) {
+            const end = this.now();
+            if (message.type === MSG.SCAN_STARTED) this.events = [];
+
+            if (message.sentAt) this.event(message.type, message.sentAt, start, 1);
+            this.event(message.type, start, end, 2);
+
+            if (this.RENDERS.has(message.type)) {
+                requestAnimationFrame(() => setTimeout(() => {
+                    this.event(`render ${message.type}`, start, this.now(), 2, { items: State.results?.qa?.total ?? 0 });
+                    if (message.type === MSG.SCAN_COMPLETE) this.flush();
+                }, 0));
+            } else if (message.type === MSG.SCAN_ERROR) {
+                this.flush();
+            }
+        },
+
+        flush() {
+            if (this.events.length === 0) return;
+            const events = this.events;
+            this.events = [];
+            Extension.sendToServiceWorker('TRACE_EVENTS', { events });
+        }
+    };
+
     // ═══════════════════════════════════════════════════════════════════════════
     // ACTIONS
     // ═══════════════════════════════════════════════════════════════════════════
@@ -473,10 +918,10 @@
         clear() {
             State.reset();
             
-            if ($.qaList) $.qaList.innerHTML = '<div class="empty-state">No Q&A found. Try scanning the page.</div>';
-            if ($.apisList) $.apisList.innerHTML = '<div class="empty-state">No SCORM/xAPI detected.</div>';
-            if ($.correctList) $.correctList.innerHTML = '<div class="empty-state">No correct answers found.</div>';
-            if ($.logsList) $.logsList.innerHTML = '<div class="empty-state">No logs yet.</div>';
+            Renderer.renderQA([]);
+            Renderer.renderCorrect([]);
+            Renderer.renderLogs([]);
+            if ($.apisList) $.apisList.innerHTML = EMPTY_STATE.APIS;
 
             UI.updateBadge($.qaCount, 0);
             UI.updateBadge($.apisCount, 0);
@@ -534,6 +979,42 @@
             `;
         },
 
+        async pickElements() {
+            try {
+                await Extension.sendToContent('ACTIVATE_SELECTOR');
+                window.close();
+            } catch (error) {
+                Toast.error('Failed to start the picker: ' + error.message);
+            }
+        },
+
+        /**
+         * Look up the saved rule for this tab; Apply Rule is enabled when one matches
+         */
+        async loadRule() {
+            const response = await Extension.sendToServiceWorker('GET_SELECTOR_RULE', { url: State.tabUrl });
+            State.rule = response?.rule || null;
+
+            if ($.btnApplyRule) {
+                $.btnApplyRule.disabled = !State.rule;
+                $.btnApplyRule.title = State.rule ? `Saved rule for ${State.rule.urlPattern}` : 'No saved rule for this page';
+            }
+        },
+
+        async applyRule() {
+            if (!State.rule) return;
+
+            try {
+                $.btnScan.disabled = true;
+                UI.setStatus(STATUS.SCANNING);
+                await Extension.sendToContent('APPLY_RULE', { rule: State.rule });
+            } catch (error) {
+                UI.setStatus(STATUS.ERROR);
+                Toast.error('Failed to apply rule: ' + error.message);
+                $.btnScan.disabled = false;
+            }
+        },
+
         export(format) {
             const results = State.results;
             if (!results) {
@@ -611,6 +1092,89 @@
             setTimeout(() => URL.revokeObjectURL(url), 1000);
         },
 
+        /**
+         * Ask each injected frame for its spans; the service worker merges them
+         * with message hops and replies with TRACE_DATA
+         */
+        async exportTrace() {
+            Tracing.flush();
+            try {
+                await Extension.sendToContent('GET_TRACE');
+                Toast.info('Collecting trace...');
+            } catch (error) {
+                Toast.error('Trace export failed: ' + error.message);
+            }
+        },
+
+        async exportRules() {
+            const response = await Extension.sendToServiceWorker('EXPORT_RULES');
+            if (!response?.success) {
+                Toast.error('Rule export failed: ' + (response?.error || 'Unknown'));
+                return;
+            }
+            if (response.count === 0) {
+                Toast.info('No saved rules to export');
+                return;
+            }
+
+            const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
+            this.download(response.data, `lms-qa-rules-${timestamp}.jsonl`, 'json');
+            Toast.success(`Exported ${response.count} rule(s)`);
+        },
+
+        /**
+         * Rule packs are imported from the rules page: the popup closes as soon
+         * as a file picker takes focus, which would cut the import short
+         */
+        openRuleImport() {
+            chrome.runtime.openOptionsPage();
+            window.close();
+        },
+
+        /**
+         * Diff the shown results against the last stored scan of the same course.
+         * Both reports are already here, so the diff runs in the popup.
+         */
+        async compareWithPrevious() {
+            const current = State.results;
+            if (!current?.qa?.items?.length) {
+                Toast.error('Scan the page first');
+                return;
+            }
+
+            const history = await Extension.sendToServiceWorker('GET_SCAN_HISTORY', {
+                query: { courseUrl: current.url || State.tabUrl, limit: 10 }
+            });
+
+            // The newest stored scan is usually the one on screen; compare with the one before it
+            const shownAt = Date.parse(current.timestamp) || Date.now();
+            const previous = (history?.scans || []).find(scan => scan.timestamp < shownAt);
+            if (!previous) {
+                Toast.info('No earlier scan of this course');
+                return;
+            }
+
+            const stored = await Extension.sendToServiceWorker('GET_SCAN_RESULT', { id: previous.id });
+            if (!stored?.results) {
+                Toast.error('Earlier scan results are no longer stored');
+                return;
+            }
+
+            let diff;
+            try {
+                diff = window.LMS_QA_DIFF.compare(stored.results, current);
+            } catch (error) {
+                Toast.error('Failed to compare: ' + error.message);
+                return;
+            }
+
+            Renderer.renderDiff(diff);
+            Tabs.activate('changes');
+
+            const total = diff.changes.length;
+            Toast.success(total ? `${total} change(s) since the previous scan` : 'No changes since the previous scan');
+        },
+
         async loadRelatedTabs() {
             const response = await Extension.sendToServiceWorker('GET_RELATED_TABS');
             Renderer.renderRelatedTabs(response?.tabs || []);
@@ -644,16 +1208,29 @@
         [MSG.SCAN_STARTED]: () => {
             UI.setStatus(STATUS.SCANNING);
             $.btnScan.disabled = true;
+            State.resetPartial();
         },
 
         [MSG.PROGRESS]: (payload) => {
             UI.setProgress(payload.step, payload.total, payload.message);
         },
 
+        [MSG.SCAN_PARTIAL]: (payload) => {
+            if (payload.items?.length) {
+                Renderer.renderPartial(payload.items);
+            }
+
+            const label = PARTIAL_PHASE_LABELS[payload.phase];
+            if (label && payload.total && $.progressText) {
+                $.progressText.textContent = `${label.name}: ${payload.completed} of ${payload.total} ${label.unit}`;
+            }
+        },
+
         [MSG.SCAN_COMPLETE]: (payload) => {
             UI.setStatus(STATUS.SUCCESS);
             UI.hideProgress();
             $.btnScan.disabled = false;
+            State.resetPartial();
 
             if (payload.results) {
                 Renderer.renderAll(payload.results);
@@ -710,12 +1287,26 @@
             }
         },
 
+        [MSG.TRACE_DATA]: (payload) => {
+            const spans = payload.trace?.traceEvents?.filter(event => event.ph === 'X').length || 0;
+            if (spans === 0) {
+                Toast.info('No scan trace yet; run a scan first');
+                return;
+            }
+
+            const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
+            Actions.download(JSON.stringify(payload.trace), `lms-qa-trace-${timestamp}.json`, 'json');
+            Toast.success(`Exported trace (${spans} spans)`);
+        },
+
     };
 
     chrome.runtime.onMessage.addListener((message) => {
         const handler = MessageHandlers[message.type];
         if (handler) {
+            const start = Tracing.now();
             handler(message.payload || message);
+            Tracing.record(message, start);
         }
     });
 
@@ -734,11 +1325,21 @@
 
         // Quick actions
         $.btnAutoSelect?.addEventListener('click', () => Actions.autoSelect());
+        $.btnPickElements?.addEventListener('click', () => Actions.pickElements());
+        $.btnApplyRule?.addEventListener('click', () => Actions.applyRule());
 
         // Export
         $.btnExportJson?.addEventListener('click', () => Actions.export('json'));
         $.btnExportCsv?.addEventListener('click', () => Actions.export('csv'));
         $.btnExportTxt?.addEventListener('click', () => Actions.export('txt'));
+        $.btnExportTrace?.addEventListener('click', () => Actions.exportTrace());
+
+        // Scan comparison
+        $.btnCompare?.addEventListener('click', () => Actions.compareWithPrevious());
+
+        // Selector rule packs
+        $.btnExportRules?.addEventListener('click', () => Actions.exportRules());
+        $.btnImportRules?.addEventListener('click', () => Actions.openRuleImport());
 
         // Search
         $.searchInput?.addEventListener('input', (e) => Search.filter(e.target.value));
@@ -806,6 +1407,7 @@
 
     async function init() {
         cacheElements();
+        Renderer.initLists();
         bindEvents();
         Tabs.init();
 
@@ -820,14 +1422,24 @@
         // Load existing state and related tabs in parallel
         const [existingState] = await Promise.all([
             Extension.sendToServiceWorker('GET_TAB_STATE'),
-            Actions.loadRelatedTabs()
+            Actions.loadRelatedTabs(),
+            Actions.loadRule()
         ]);
 
         if (existingState?.results) {
             Renderer.renderAll(existingState.results);
         }
 
-        UI.setStatus(STATUS.READY);
+        if (existingState?.scanning) {
+            // Opened mid-scan: SCAN_COMPLETE or SCAN_ERROR will re-enable scanning
+            UI.setStatus(STATUS.SCANNING);
+            $.btnScan.disabled = true;
+            if (existingState.partialItems?.length) {
+                Renderer.renderPartial(existingState.partialItems);
+            }
+        } else {
+            UI.setStatus(STATUS.READY);
+        }
 
         console.log('[LMS QA Popup] Initialized');
     }
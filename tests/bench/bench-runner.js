@@ -0,0 +1,211 @@
+/**
+ * LMS QA Validator - Benchmark Runner
+ * Runs each case from /bench/cases.json in a fixture iframe and posts timings
+ * back to the benchmark server (tests/bench/bench.js)
+ */
+
+(function() {
+    'use strict';
+
+    // Scanner.run reports PROGRESS steps 1-5 in this order
+    const SCAN_PHASES = ['apis', 'storyline', 'storylineDOM', 'dom', 'resources'];
+    const READY_TIMEOUT = 10000;
+
+    const $ = {
+        log: document.getElementById('bench-log'),
+        frame: document.getElementById('bench-frame')
+    };
+
+    function log(message) {
+        $.log.textContent += `${message}\n`;
+    }
+
+    const nextFrame = () => new Promise(resolve => requestAnimationFrame(() => setTimeout(resolve, 0)));
+
+    /**
+     * Load a fixture and wait until the named global exists in it
+     */
+    function loadFixture(url, readyGlobal) {
+        return new Promise((resolve, reject) => {
+            const timer = setTimeout(() => reject(new Error(`${url}: ${readyGlobal} not ready`)), READY_TIMEOUT);
+
+            $.frame.onload = async () => {
+                const win = $.frame.contentWindow;
+                while (!win[readyGlobal]) {
+                    await new Promise(r => setTimeout(r, 10));
+                }
+                clearTimeout(timer);
+                resolve(win);
+            };
+            $.frame.src = url;
+        });
+    }
+
+    // ═══════════════════════════════════════════════════════════════════════════
+    // CASES
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    const Cases = {
+        /**
+         * One Scanner.run; phase times come from the PROGRESS message timestamps
+         */
+        async scan(win, entry) {
+            if (entry.clearCache) await win.LMS_QA.clearCache();
+
+            const marks = [];
+            let finished = false;
+            const onMessage = (event) => {
+                // Same-tick messages arrive as one BATCH; large reports as CHUNKs
+                const data = event.data || {};
+                const messages = data.type === 'LMS_QA_BATCH' ? data.messages : [data];
+
+                messages.forEach(message => {
+                    const type = message.messageType || message.type;
+                    if (type === 'LMS_QA_PROGRESS') marks.push({ step: message.payload.step, at: message.timestamp });
+                    if (type === 'LMS_QA_SCAN_COMPLETE' && !finished) {
+                        marks.push({ step: SCAN_PHASES.length + 1, at: message.timestamp });
+                        finished = true;
+                    }
+                    if (type === 'LMS_QA_SCAN_ERROR') finished = true;
+                });
+            };
+            win.addEventListener('message', onMessage);
+
+            const start = performance.now();
+            await win.LMS_QA.scan();
+            const total = performance.now() - start;
+
+            // Messages are posted on the next tick; wait for the completion message
+            const deadline = performance.now() + READY_TIMEOUT;
+            while (!finished && performance.now() < deadline) {
+                await new Promise(r => setTimeout(r, 5));
+            }
+            win.removeEventListener('message', onMessage);
+
+            const phases = {};
+            marks.sort((a, b) => a.step - b.step);
+            for (let i = 0; i + 1 < marks.length; i++) {
+                phases[SCAN_PHASES[marks[i].step - 1]] = marks[i + 1].at - marks[i].at;
+            }
+
+            return { total, phases, items: win.LMS_QA.getQA().length };
+        },
+
+        /**
+         * One RuleExtractor.extract through the selector's public API
+         */
+        async rule(win, entry, context) {
+            const rule = entry.reusePlan && context.plan ? { ...entry.rule, plan: context.plan } : entry.rule;
+
+            const start = performance.now();
+            const result = win.LMS_QA_SELECTOR.applyRule(rule);
+            const total = performance.now() - start;
+
+            if (!result.success) throw new Error(result.error);
+            context.plan = result.plan;
+
+            return { total, items: result.results.qa.total, grouping: result.plan?.grouping };
+        },
+
+        /**
+         * Deliver SCAN_COMPLETE to the popup and wait for the next rendered frame
+         */
+        async popup(win, entry) {
+            const results = syntheticResults(entry.items);
+
+            const start = performance.now();
+            win.__LMS_QA_BENCH__.dispatch({ type: 'SCAN_COMPLETE', payload: { results } });
+            await nextFrame();
+            const total = performance.now() - start;
+
+            return { total, items: entry.items };
+        }
+    };
+
+    const READY_GLOBALS = {
+        scan: 'LMS_QA',
+        rule: 'LMS_QA_SELECTOR',
+        popup: '__LMS_QA_BENCH__'
+    };
+
+    function syntheticResults(count) {
+        const items = [];
+        for (let i = 0; i < count; i++) {
+            const isQuestion = i % 5 === 0;
+            items.push({
+                type: isQuestion ? 'question' : 'answer',
+                text: isQuestion
+                    ? `Question ${i / 5 + 1}: which of these statements is accurate for case ${i}?`
+                    : `Answer option ${i % 5} for question ${Math.floor(i / 5) + 1}`,
+                correct: !isQuestion && i % 5 === 2,
+                source: 'bench',
+                confidence: 90
+            });
+        }
+
+        return {
+            url: 'https://lms.bench.local/course/1/quiz',
+            timestamp: new Date().toISOString(),
+            apis: [],
+            qa: {
+                total: items.length,
+                questions: Math.ceil(count / 5),
+                answers: items.length - Math.ceil(count / 5),
+                correct: items.filter(i => i.correct).length,
+                items
+            },
+            logs: []
+        };
+    }
+
+    // ═══════════════════════════════════════════════════════════════════════════
+    // RUN
+    // ═══════════════════════════════════════════════════════════════════════════
+
+    async function runCase(entry) {
+        const win = await loadFixture(entry.url, READY_GLOBALS[entry.kind]);
+        const context = {};
+        const samples = [];
+        let last = null;
+
+        for (let i = 0; i < entry.warmup + entry.iterations; i++) {
+            last = await Cases[entry.kind](win, entry, context);
+            if (i >= entry.warmup) samples.push(last);
+        }
+
+        return {
+            name: entry.name,
+            samples: samples.map(s => s.total),
+            phases: samples.map(s => s.phases).filter(Boolean),
+            items: last?.items ?? 0,
+            grouping: last?.grouping
+        };
+    }
+
+    async function run() {
+        const cases = await (await fetch('/bench/cases.json')).json();
+        const results = [];
+
+        for (const entry of cases) {
+            log(`Running ${entry.name}...`);
+            try {
+                results.push(await runCase(entry));
+            } catch (error) {
+                log(`  failed: ${error.message}`);
+                results.push({ name: entry.name, error: error.message, samples: [] });
+            }
+        }
+
+        await fetch('/bench/results', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ userAgent: navigator.userAgent, results })
+        });
+        log('Done');
+    }
+
+    run().catch(error => {
+        log(`Runner failed: ${error.message}`);
+        fetch('/bench/results', { method: 'POST', body: JSON.stringify({ error: error.message, results: [] }) });
+    });
+})();
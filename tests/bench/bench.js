@@ -0,0 +1,316 @@
+#!/usr/bin/env node
+/**
+ * LMS QA Validator - Benchmark Harness
+ * Serves the extension and generated fixtures from a local static server,
+ * drives them in headless Chromium and reports ops/s, p50 and p95.
+ *
+ * Uses only Node built-ins and a local Chrome/Chromium; nothing is fetched
+ * from the network.
+ *
+ * Usage:
+ *   node tests/bench/bench.js [options]
+ *
+ * Options:
+ *   --chrome <path>      Chrome/Chromium binary (default: $CHROME_PATH or PATH lookup)
+ *   --iterations <n>     Measured runs per case (default 10)
+ *   --warmup <n>         Unmeasured runs per case (default 2)
+ *   --filter <text>      Only cases whose name contains text
+ *   --save <file>        Write results as JSON
+ *   --baseline <file>    Compare p50 with a saved run
+ *   --tolerance <ratio>  Allowed p50 growth over baseline (default 0.2)
+ *   --serve              Only start the server and print the runner URL
+ *
+ * Exits 1 when a case fails, exceeds its p95 budget in thresholds.json,
+ * or regresses past the baseline tolerance.
+ */
+
+'use strict';
+
+const fs = require('fs');
+const http = require('http');
+const os = require('os');
+const path = require('path');
+const { spawn } = require('child_process');
+
+const fixtures = require('./fixtures');
+
+const ROOT = path.resolve(__dirname, '..', '..');
+const THRESHOLDS_FILE = path.join(__dirname, 'thresholds.json');
+const RUN_TIMEOUT = 10 * 60 * 1000;
+
+const MIME_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.json': 'application/json; charset=utf-8',
+    '.png': 'image/png',
+    '.svg': 'image/svg+xml'
+};
+
+const CHROME_CANDIDATES = [
+    'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+    '/Applications/Chromium.app/Contents/MacOS/Chromium'
+];
+
+// ═══════════════════════════════════════════════════════════════════════════
+// OPTIONS
+// ═══════════════════════════════════════════════════════════════════════════
+
+function parseArgs(argv) {
+    const options = {
+        chrome: process.env.CHROME_PATH || null,
+        iterations: 10,
+        warmup: 2,
+        filter: '',
+        save: null,
+        baseline: null,
+        tolerance: 0.2,
+        serve: false
+    };
+
+    for (let i = 0; i < argv.length; i++) {
+        const flag = argv[i].replace(/^--/, '');
+        if (flag === 'serve') {
+            options.serve = true;
+            continue;
+        }
+        if (!(flag in options)) throw new Error(`Unknown option --${flag}`);
+
+        const value = argv[++i];
+        options[flag] = typeof options[flag] === 'number' ? Number(value) : value;
+    }
+
+    return options;
+}
+
+function findChrome(explicit) {
+    if (explicit) return explicit;
+
+    for (const candidate of CHROME_CANDIDATES) {
+        if (path.isAbsolute(candidate)) {
+            if (fs.existsSync(candidate)) return candidate;
+            continue;
+        }
+        for (const dir of (process.env.PATH || '').split(path.delimiter)) {
+            const full = path.join(dir, candidate);
+            if (fs.existsSync(full)) return full;
+        }
+    }
+
+    return null;
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// STATIC SERVER
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * popup.html with the chrome.* shim loaded ahead of popup.js
+ */
+function benchPopupHtml() {
+    const html = fs.readFileSync(path.join(ROOT, 'popup', 'popup.html'), 'utf8');
+    return html
+        .replace('<head>', '<head>\n    <base href="/popup/">')
+        .replace('<script src="popup.js"></script>',
+            '<script src="/tests/bench/chrome-shim.js"></script>\n    <script src="popup.js"></script>');
+}
+
+function createServer(options, onResults) {
+    return http.createServer((req, res) => {
+        const url = new URL(req.url, 'http://localhost');
+        const send = (status, body, type = MIME_TYPES['.html']) => {
+            res.writeHead(status, { 'Content-Type': type, 'Cache-Control': 'no-cache' });
+            res.end(body);
+        };
+
+        if (req.method === 'POST' && url.pathname === '/bench/results') {
+            let body = '';
+            req.on('data', chunk => { body += chunk; });
+            req.on('end', () => {
+                send(204, '');
+                onResults(JSON.parse(body || '{}'));
+            });
+            return;
+        }
+
+        if (url.pathname === '/bench/cases.json') {
+            return send(200, JSON.stringify(fixtures.cases(options)), MIME_TYPES['.json']);
+        }
+        if (url.pathname === '/bench/popup.html') {
+            return send(200, benchPopupHtml());
+        }
+        if (url.pathname.startsWith('/bench/fixtures/')) {
+            const rel = url.pathname.slice('/bench/fixtures/'.length);
+            const body = fixtures.route(rel);
+            if (body === null) return send(404, 'Not found');
+            return send(200, body, MIME_TYPES[path.extname(rel)] || MIME_TYPES['.html']);
+        }
+
+        // Repository files, read-only and confined to the repo root
+        const file = path.normalize(path.join(ROOT, decodeURIComponent(url.pathname)));
+        if (!file.startsWith(ROOT + path.sep)) return send(403, 'Forbidden');
+
+        fs.readFile(file, (error, data) => {
+            if (error) return send(404, 'Not found');
+            send(200, data, MIME_TYPES[path.extname(file)] || 'application/octet-stream');
+        });
+    });
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// STATISTICS
+// ═══════════════════════════════════════════════════════════════════════════
+
+function percentile(sorted, p) {
+    if (sorted.length === 0) return NaN;
+    const rank = Math.ceil((p / 100) * sorted.length) - 1;
+    return sorted[Math.min(Math.max(rank, 0), sorted.length - 1)];
+}
+
+function summarize(result) {
+    const sorted = [...result.samples].sort((a, b) => a - b);
+    const mean = sorted.reduce((sum, v) => sum + v, 0) / (sorted.length || 1);
+
+    const phases = {};
+    for (const sample of result.phases || []) {
+        for (const [phase, ms] of Object.entries(sample)) {
+            (phases[phase] = phases[phase] || []).push(ms);
+        }
+    }
+    for (const phase of Object.keys(phases)) {
+        phases[phase] = percentile(phases[phase].sort((a, b) => a - b), 50);
+    }
+
+    return {
+        name: result.name,
+        error: result.error || null,
+        runs: sorted.length,
+        items: result.items,
+        opsPerSec: mean > 0 ? 1000 / mean : 0,
+        p50: percentile(sorted, 50),
+        p95: percentile(sorted, 95),
+        phases
+    };
+}
+
+/**
+ * Failures: case errors, p95 over budget, p50 regressions against a baseline
+ */
+function check(summaries, thresholds, baseline, tolerance) {
+    const failures = [];
+    const previous = new Map((baseline?.summaries || []).map(s => [s.name, s]));
+
+    for (const s of summaries) {
+        if (s.error) {
+            failures.push(`${s.name}: ${s.error}`);
+            continue;
+        }
+
+        const budget = thresholds[s.name]?.p95;
+        if (budget && s.p95 > budget) {
+            failures.push(`${s.name}: p95 ${s.p95.toFixed(1)}ms over budget ${budget}ms`);
+        }
+
+        const before = previous.get(s.name);
+        if (before?.p50 > 0 && s.p50 > before.p50 * (1 + tolerance)) {
+            failures.push(`${s.name}: p50 ${s.p50.toFixed(1)}ms vs baseline ${before.p50.toFixed(1)}ms`);
+        }
+    }
+
+    return failures;
+}
+
+function printTable(summaries) {
+    const rows = summaries.map(s => [
+        s.name,
+        s.error ? 'ERROR' : s.opsPerSec.toFixed(1),
+        s.error ? '' : s.p50.toFixed(1),
+        s.error ? '' : s.p95.toFixed(1),
+        String(s.items ?? ''),
+        Object.entries(s.phases).map(([phase, ms]) => `${phase}=${ms}`).join(' ')
+    ]);
+    const header = ['case', 'ops/s', 'p50 ms', 'p95 ms', 'items', 'phases (p50 ms)'];
+    const widths = header.map((h, i) => Math.max(h.length, ...rows.map(r => r[i].length)));
+    const line = (cells) => cells.map((c, i) => c.padEnd(widths[i])).join('  ');
+
+    console.log(line(header));
+    console.log(widths.map(w => '-'.repeat(w)).join('  '));
+    rows.forEach(row => console.log(line(row)));
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// MAIN
+// ═══════════════════════════════════════════════════════════════════════════
+
+async function main() {
+    const options = parseArgs(process.argv.slice(2));
+    let finish;
+    const resultsReceived = new Promise(resolve => { finish = resolve; });
+
+    const server = createServer(options, finish);
+    await new Promise(resolve => server.listen(0, '127.0.0.1', resolve));
+    const runnerUrl = `http://127.0.0.1:${server.address().port}/tests/bench/bench-runner.html`;
+
+    if (options.serve) {
+        console.log(`Benchmark runner: ${runnerUrl}`);
+        return;
+    }
+
+    const chromePath = findChrome(options.chrome);
+    if (!chromePath) {
+        server.close();
+        throw new Error('Chrome/Chromium not found; pass --chrome or set CHROME_PATH (or use --serve and open the runner URL)');
+    }
+
+    const profileDir = fs.mkdtempSync(path.join(os.tmpdir(), 'lms-qa-bench-'));
+    const chrome = spawn(chromePath, [
+        '--headless=new',
+        '--disable-gpu',
+        '--no-first-run',
+        '--no-default-browser-check',
+        '--disable-extensions',
+        `--user-data-dir=${profileDir}`,
+        runnerUrl
+    ], { stdio: 'ignore' });
+
+    const timeout = setTimeout(() => finish({ error: 'Timed out waiting for results', results: [] }), RUN_TIMEOUT);
+    const payload = await resultsReceived;
+    clearTimeout(timeout);
+
+    chrome.kill();
+    server.close();
+    fs.rmSync(profileDir, { recursive: true, force: true });
+
+    if (payload.error) throw new Error(payload.error);
+
+    const summaries = payload.results.map(summarize);
+    printTable(summaries);
+
+    if (options.save) {
+        fs.writeFileSync(options.save, JSON.stringify({
+            date: new Date().toISOString(),
+            userAgent: payload.userAgent,
+            summaries
+        }, null, 2));
+    }
+
+    const thresholds = JSON.parse(fs.readFileSync(THRESHOLDS_FILE, 'utf8'));
+    const baseline = options.baseline ? JSON.parse(fs.readFileSync(options.baseline, 'utf8')) : null;
+    const failures = check(summaries, thresholds, baseline, options.tolerance);
+
+    if (failures.length > 0) {
+        console.error(`\n${failures.length} regression(s):`);
+        failures.forEach(f => console.error(`  ${f}`));
+        process.exitCode = 1;
+    }
+}
+
+if (require.main === module) {
+    main().catch(error => {
+        console.error(error.message);
+        process.exitCode = 1;
+    });
+}
+
+module.exports = { summarize, percentile, check };
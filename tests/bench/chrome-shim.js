@@ -0,0 +1,47 @@
+/**
+ * LMS QA Validator - Benchmark chrome.* shim
+ * Lets popup/popup.js run in a plain page so the runner can time rendering
+ *
+ * @fileoverview Minimal extension API surface used by the popup
+ */
+
+(function() {
+    'use strict';
+
+    const listeners = [];
+
+    // Service worker replies the popup expects during init
+    const responses = {
+        GET_TAB_STATE: () => null,
+        GET_RELATED_TABS: () => ({ tabs: [] })
+    };
+
+    window.chrome = {
+        runtime: {
+            lastError: null,
+            onMessage: {
+                addListener: (fn) => listeners.push(fn)
+            },
+            sendMessage(message, callback) {
+                const reply = responses[message?.type]?.(message) ?? null;
+                setTimeout(() => callback?.(reply), 0);
+            }
+        },
+        tabs: {
+            query: async () => [{ id: 1, url: 'https://lms.bench.local/course/1/quiz' }],
+            sendMessage: (tabId, message, callback) => setTimeout(() => callback?.({ success: true }), 0),
+            update() {},
+            get: (tabId, callback) => callback?.(null)
+        },
+        windows: {
+            update() {}
+        }
+    };
+
+    // Runner hook: deliver a message as if the service worker sent it
+    window.__LMS_QA_BENCH__ = {
+        dispatch(message) {
+            listeners.forEach(fn => fn(message, {}, () => {}));
+        }
+    };
+})();
@@ -0,0 +1,229 @@
+/**
+ * LMS QA Validator - Benchmark Fixtures
+ * Synthetic LMS pages generated on request by the benchmark server
+ *
+ * Routes (all under /bench/fixtures/<kind>-<size>/):
+ * - storyline-N: Storyline player page with N slides (data.js + one file per slide)
+ * - form-N:      form quiz with N select/checkbox/radio questions
+ * - acctext-N:   Storyline accessibility DOM with N data-acc-text objects
+ * - rules-N:     N question containers for descendant-plan rule extraction
+ * - flatrules-N: N questions with sibling answers for proximity rule extraction
+ *
+ * @fileoverview Deterministic fixture generators (no randomness, so runs compare)
+ */
+
+'use strict';
+
+const VALIDATOR_SCRIPT = '<script src="/lib/lms-qa-validator.js"></script>';
+const SELECTOR_SCRIPT = '<script src="/lib/element-selector.js"></script>';
+
+const TOPICS = [
+    'network security', 'data retention', 'incident response', 'access control',
+    'password policy', 'phishing awareness', 'privacy law', 'safe harbor rules'
+];
+
+function page(title, body, scripts = VALIDATOR_SCRIPT) {
+    return `<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="UTF-8"><title>${title}</title></head>
+<body>
+${body}
+${scripts}
+</body>
+</html>
+`;
+}
+
+function questionText(i) {
+    return `Question ${i + 1}: which statement about ${TOPICS[i % TOPICS.length]} is accurate in case ${i}?`;
+}
+
+function answerText(i, k) {
+    return `Option ${k + 1} for question ${i + 1} covering ${TOPICS[(i + k) % TOPICS.length]}`;
+}
+
+/**
+ * Escape JSON for Storyline's globalProvideData('...', '<json>') wrapper
+ */
+function provideData(kind, data) {
+    const json = JSON.stringify(data).replace(/'/g, "\\'").replace(/"/g, '\\"');
+    return `window.globalProvideData('${kind}', '${json}');\n`;
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// STORYLINE
+// ═══════════════════════════════════════════════════════════════════════════
+
+const slideId = (i) => `6Bench${String(i).padStart(5, '0')}`;
+
+function storylineData(slides) {
+    return provideData('data', {
+        scenes: [{ id: 'scene1', slides: Array.from({ length: slides }, (_, i) => ({ id: slideId(i) })) }],
+        quizzes: []
+    });
+}
+
+function storylineSlide(index) {
+    const objects = [{ kind: 'text', accType: 'text', caption: questionText(index) }];
+    for (let k = 0; k < 4; k++) {
+        objects.push({
+            kind: 'button',
+            accType: 'text',
+            caption: answerText(index, k),
+            states: k === 1 ? ['_Review', '_Selected'] : ['_Selected', '_Incorrect_Review']
+        });
+    }
+    return provideData('slide', { id: slideId(index), slideLayers: [{ objects }] });
+}
+
+function storylineRoute(size, rest) {
+    if (rest === 'index.html') {
+        return page(`Storyline ${size}`, '<iframe src="story_html5.html" title="course"></iframe>');
+    }
+    if (rest === 'story_html5.html') {
+        return page('Story', '<div id="slide"></div>', '');
+    }
+    if (rest === 'html5/data/js/data.js') {
+        return storylineData(size);
+    }
+
+    const slide = rest.match(/^html5\/data\/js\/6Bench(\d+)\.js$/);
+    if (slide && Number(slide[1]) < size) {
+        return storylineSlide(Number(slide[1]));
+    }
+    return null;
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// DOM PAGES
+// ═══════════════════════════════════════════════════════════════════════════
+
+function formQuiz(size) {
+    const blocks = [];
+
+    for (let i = 0; i < size; i++) {
+        const answers = [0, 1, 2, 3].map(k => ({ text: answerText(i, k), correct: k === i % 4 }));
+
+        switch (i % 3) {
+            case 0:
+                blocks.push(`<div class="question">
+    <label>${questionText(i)}</label>
+    <select name="q${i}">
+        <option value="">Select...</option>
+        ${answers.map(a => `<option value="${a.correct}">${a.text}</option>`).join('\n        ')}
+    </select>
+</div>`);
+                break;
+            case 1:
+                blocks.push(`<div class="question">
+    <label>${questionText(i)}</label>
+    ${answers.map(a => `<label><input type="checkbox" name="q${i}" value="${a.correct}"> ${a.text}</label>`).join('\n    ')}
+</div>`);
+                break;
+            default:
+                blocks.push(`<div class="question">
+    <label>${questionText(i)}</label>
+    ${answers.map(a => `<label><input type="radio" name="q${i}" value="${a.correct}"> ${a.text}</label>`).join('\n    ')}
+</div>`);
+        }
+    }
+
+    return page(`Form quiz ${size}`, `<form class="quiz">\n${blocks.join('\n')}\n</form>`);
+}
+
+function accTextPage(size) {
+    const objects = [];
+
+    for (let i = 0; i < size; i++) {
+        const isQuestion = i % 5 === 0;
+        const text = isQuestion ? questionText(i / 5) : answerText(Math.floor(i / 5), i % 5);
+        objects.push(`<div class="slide-object slide-object-${isQuestion ? 'textinput' : 'button'}" data-acc-text="${text}">
+    <div class="slide-object-content"><svg class="vector-slide-content" width="10" height="10"></svg><span>${text}</span></div>
+</div>`);
+    }
+
+    return page(`Acc-text ${size}`, `<div class="slide-layer base-layer">\n${objects.join('\n')}\n</div>`);
+}
+
+function ruleQuiz(size, flat) {
+    const blocks = [];
+
+    for (let i = 0; i < size; i++) {
+        const answers = [0, 1, 2, 3].map(k =>
+            `<li class="answer-choice"${k === i % 4 ? ' data-correct="true"' : ''}>${answerText(i, k)}</li>`
+        );
+
+        blocks.push(flat
+            ? `<p class="quiz-question">${questionText(i)}</p>\n${answers.map(a => a.replace(/<(\/?)li/g, '<$1div')).join('\n')}`
+            : `<div class="quiz-item">\n    <p class="quiz-question">${questionText(i)}</p>\n    <ul>${answers.join('')}</ul>\n</div>`);
+    }
+
+    return page(`Rules ${size}`, `<main>\n${blocks.join('\n')}\n</main>`, SELECTOR_SCRIPT);
+}
+
+// Rule shared by the rules-N and flatrules-N fixtures
+const RULE = Object.freeze({
+    questionSelector: '.quiz-question',
+    answerSelector: '.answer-choice',
+    correctSelector: "[data-correct='true']",
+    urlPattern: 'bench.local/rules'
+});
+
+/**
+ * Body for a fixture path ("storyline-200/index.html"), or null if unknown
+ */
+function route(path) {
+    const match = path.match(/^([a-z]+)-(\d+)\/(.+)$/);
+    if (!match) return null;
+
+    const [, kind, sizeText, rest] = match;
+    const size = Number(sizeText);
+
+    if (kind === 'storyline') return storylineRoute(size, rest);
+    if (rest !== 'index.html') return null;
+
+    switch (kind) {
+        case 'form': return formQuiz(size);
+        case 'acctext': return accTextPage(size);
+        case 'rules': return ruleQuiz(size, false);
+        case 'flatrules': return ruleQuiz(size, true);
+        default: return null;
+    }
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// BENCHMARK CASES
+// ═══════════════════════════════════════════════════════════════════════════
+
+const fixtureUrl = (kind, size) => `/bench/fixtures/${kind}-${size}/index.html`;
+
+/**
+ * Case list handed to the browser runner
+ */
+function cases({ iterations = 10, warmup = 2, filter = '' } = {}) {
+    const list = [];
+    const add = (entry) => list.push({ iterations, warmup, ...entry });
+
+    for (const slides of [50, 200]) {
+        add({ name: `scan/storyline-${slides}/cold`, kind: 'scan', url: fixtureUrl('storyline', slides), clearCache: true });
+        add({ name: `scan/storyline-${slides}/warm`, kind: 'scan', url: fixtureUrl('storyline', slides), clearCache: false });
+    }
+    for (const questions of [50, 500]) {
+        add({ name: `scan/form-${questions}`, kind: 'scan', url: fixtureUrl('form', questions), clearCache: false });
+    }
+    for (const objects of [500, 5000]) {
+        add({ name: `scan/acctext-${objects}`, kind: 'scan', url: fixtureUrl('acctext', objects), clearCache: false });
+    }
+    for (const questions of [100, 1000]) {
+        add({ name: `rule/descendant-${questions}/compile`, kind: 'rule', url: fixtureUrl('rules', questions), rule: RULE, reusePlan: false });
+        add({ name: `rule/descendant-${questions}/cached-plan`, kind: 'rule', url: fixtureUrl('rules', questions), rule: RULE, reusePlan: true });
+        add({ name: `rule/proximity-${questions}`, kind: 'rule', url: fixtureUrl('flatrules', questions), rule: RULE, reusePlan: true });
+    }
+    for (const items of [1000, 10000]) {
+        add({ name: `popup/render-${items}`, kind: 'popup', url: '/bench/popup.html', items });
+    }
+
+    return list.filter(entry => entry.name.includes(filter));
+}
+
+module.exports = { route, cases, RULE };
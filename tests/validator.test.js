@@ -29,15 +29,44 @@
         
         try {
             fn();
-            results.passed++;
-            results.tests.push({ name, passed: true, time: performance.now() - start });
+            pass(name, start);
         } catch (error) {
-            results.failed++;
-            results.tests.push({ name, passed: false, error: error.message, time: performance.now() - start });
-            console.error(`FAIL: ${name}`, error);
+            fail(name, start, error);
         }
     }
 
+    // Async tests are queued and run one at a time after the synchronous suites
+    const asyncTests = [];
+
+    function testAsync(name, fn) {
+        asyncTests.push({ name, fn });
+    }
+
+    async function runAsyncTests() {
+        for (const { name, fn } of asyncTests.splice(0)) {
+            results.total++;
+            const start = performance.now();
+
+            try {
+                await fn();
+                pass(name, start);
+            } catch (error) {
+                fail(name, start, error);
+            }
+        }
+    }
+
+    function pass(name, start) {
+        results.passed++;
+        results.tests.push({ name, passed: true, time: performance.now() - start });
+    }
+
+    function fail(name, start, error) {
+        results.failed++;
+        results.tests.push({ name, passed: false, error: error.message, time: performance.now() - start });
+        console.error(`FAIL: ${name}`, error);
+    }
+
     function assertEqual(actual, expected, message = '') {
         if (actual !== expected) {
             throw new Error(`${message} Expected ${JSON.stringify(expected)}, got ${JSON.stringify(actual)}`);
@@ -74,6 +103,52 @@
         }
     }
 
+    /**
+     * Append throwaway markup to the page; remove() the returned root when done
+     */
+    function mountFixture(html) {
+        const root = document.createElement('div');
+        root.innerHTML = html;
+        document.body.appendChild(root);
+        return root;
+    }
+
+    /**
+     * Resolve with every LMS_QA_ message posted on the page once done(messages)
+     * is true. Start collecting before triggering the messages.
+     */
+    function collectMessages(done, timeout = 5000) {
+        return new Promise((resolve, reject) => {
+            const messages = [];
+            const stop = () => {
+                clearTimeout(timer);
+                window.removeEventListener('message', onMessage);
+            };
+            const onMessage = (event) => {
+                if (event.source !== window || !event.data?.type?.startsWith('LMS_QA_')) return;
+                messages.push(event.data);
+                if (done(messages)) {
+                    stop();
+                    resolve(messages);
+                }
+            };
+            const timer = setTimeout(() => {
+                stop();
+                reject(new Error(`Timed out after ${messages.length} message(s)`));
+            }, timeout);
+
+            window.addEventListener('message', onMessage);
+        });
+    }
+
+    /**
+     * Decode CHUNK buffers the way the content script does
+     */
+    function decodeChunks(chunks) {
+        const decoder = new TextDecoder();
+        return chunks.map((chunk, i) => decoder.decode(chunk.buffer, { stream: i < chunks.length - 1 })).join('');
+    }
+
     // Render results
     function renderResults() {
         const totalTime = results.tests.reduce((sum, t) => sum + t.time, 0);
@@ -125,11 +200,16 @@
         $.testQuizForm.classList.add('visible');
 
         // Wait for validator to initialize
-        setTimeout(() => {
+        setTimeout(async () => {
             runPublicAPITests();
             runStateTests();
             runDOMExtractionTests();
+            runScannerTests();
             runUtilityTests();
+            runSelectorRuleTests();
+            runTransportTests();
+            runScanHistoryTests();
+            await runAsyncTests();
             
             renderResults();
             $.runBtn.disabled = false;
@@ -179,9 +259,64 @@
             assertType(window.LMS_QA.export, 'function');
         });
 
+        test('Public API: getProfile is a function', () => {
+            assertType(window.LMS_QA.getProfile, 'function');
+        });
+
+        testAsync('Public API: scan profile covers every phase and counts streamed items', async () => {
+            const isReport = m => m.type === 'LMS_QA_CHUNK' && m.messageType === 'LMS_QA_SCAN_COMPLETE';
+            const received = collectMessages(messages => messages.some(m => isReport(m) && m.index === m.count - 1), 30000);
+            await window.LMS_QA.scan();
+            const messages = await received;
+
+            const profile = window.LMS_QA.getProfile();
+            const root = profile.spans[0];
+            assertEqual(root.parent, null, 'root span');
+            const phases = profile.spans.filter(span => span.parent === root.id).map(span => span.name);
+            ['apis', 'storyline', 'storylineDOM', 'dom', 'resources'].forEach(name => {
+                assertTrue(phases.includes(name), `phase ${name}`);
+            });
+            profile.spans.forEach(span => assertTrue(span.duration !== null, `span ${span.name} ended`));
+
+            const streamed = messages
+                .flatMap(m => m.type === 'LMS_QA_BATCH' ? m.messages : [m])
+                .filter(m => m.type === 'LMS_QA_SCAN_PARTIAL')
+                .reduce((sum, m) => sum + m.payload.items.length, 0);
+            const report = JSON.parse(decodeChunks(messages.filter(isReport)));
+            assertEqual(report.profile.counters.itemsEmitted, streamed, 'itemsEmitted');
+        });
+
+        testAsync('Public API: extractions outside the scanner are not billed to a running scan', async () => {
+            await window.LMS_QA.scan();
+            const alone = window.LMS_QA.getProfile().counters.nodesVisited;
+            assertTrue(alone > 0, 'scan visits nodes');
+
+            // The scan yields while it checks for Storyline data; extract in that gap
+            const scanning = window.LMS_QA.scan();
+            window.LMS_QA.getDOMQuizzes();
+            window.LMS_QA.getStorylineDOM();
+            await scanning;
+
+            assertEqual(window.LMS_QA.getProfile().counters.nodesVisited, alone);
+        });
+
+        test('Public API: getTrace returns trace event JSON', () => {
+            const trace = window.LMS_QA.getTrace();
+            assertTrue(Array.isArray(trace.traceEvents));
+            assertEqual(trace.displayTimeUnit, 'ms');
+        });
+
         test('Public API: getDOMQuizzes is a function', () => {
             assertType(window.LMS_QA.getDOMQuizzes, 'function');
         });
+
+        test('Public API: monitoring can be started and stopped', () => {
+            assertTrue(window.LMS_QA.startMonitoring());
+            assertTrue(window.LMS_QA.isMonitoring());
+            assertFalse(window.LMS_QA.startMonitoring(), 'second start should be a no-op');
+            assertTrue(window.LMS_QA.stopMonitoring());
+            assertFalse(window.LMS_QA.isMonitoring());
+        });
     }
 
     function runStateTests() {
@@ -202,6 +337,39 @@
             const state = window.LMS_QA.getState();
             assertType(state.scanning, 'boolean');
         });
+
+        test('State: logs stay oldest first after the log buffer wraps', () => {
+            const capacity = 500; // CONFIG.MAX_LOGS
+            const round = () => {
+                window.LMS_QA.discoverAPIs();
+                window.LMS_QA.getDOMQuizzes();
+            };
+
+            // Learn the messages one round logs, then log well past capacity
+            const before = window.LMS_QA.getLogs().length;
+            round();
+            const cycle = window.LMS_QA.getLogs().slice(before).map(entry => entry.message);
+            assertTrue(cycle.length > 0, 'round should log');
+            for (let i = 0; i * cycle.length < capacity + 100; i++) round();
+
+            const logs = window.LMS_QA.getLogs();
+            assertEqual(logs.length, capacity);
+            for (let i = 0; i < logs.length; i++) {
+                const fromEnd = logs.length - 1 - i;
+                assertEqual(logs[i].message, cycle[cycle.length - 1 - (fromEnd % cycle.length)], `entry ${i}`);
+                if (i > 0) assertTrue(logs[i].timestamp >= logs[i - 1].timestamp, `timestamp ${i}`);
+            }
+        });
+
+        testAsync('State: a scan reset empties the log buffer', async () => {
+            await new Promise(resolve => setTimeout(resolve, 5));
+            const started = Date.now();
+            await window.LMS_QA.scan();
+
+            const logs = window.LMS_QA.getLogs();
+            assertTrue(logs.length < 500, 'buffer should have been emptied');
+            assertTrue(logs.every(entry => Date.parse(entry.timestamp) >= started), 'entries from before the scan survived');
+        });
     }
 
     function runDOMExtractionTests() {
@@ -258,6 +426,41 @@
             const selectedOption = select.options[select.selectedIndex];
             assertEqual(selectedOption.value, 'true', 'Select should have correct value selected');
         });
+
+        testAsync('DOM Extraction: live monitoring re-extracts only the changed question', async () => {
+            const region = (key) => `
+                <fieldset>
+                    <legend>Live monitor question ${key}?</legend>
+                    <label><input type="radio" name="live-${key}" value="true"> Live ${key} right</label>
+                    <label><input type="radio" name="live-${key}" value="false"> Live ${key} wrong</label>
+                </fieldset>`;
+            const root = mountFixture(region('alpha') + region('beta'));
+
+            try {
+                await window.LMS_QA.scan();
+                assertTrue(window.LMS_QA.startMonitoring());
+
+                const bySource = (items, key) => items.filter(item => item.source === `DOM:radio:live-${key}`);
+                const before = window.LMS_QA.getQA().slice();
+                assertEqual(bySource(before, 'alpha').length, 3, 'alpha question and answers');
+                assertEqual(bySource(before, 'beta').length, 3, 'beta question and answers');
+
+                const isState = m => m.type === 'LMS_QA_CHUNK' && m.messageType === 'LMS_QA_STATE';
+                const received = collectMessages(messages => messages.some(isState));
+                root.querySelector('legend').textContent = 'Live monitor question alpha, reworded?';
+                await received;
+
+                const after = window.LMS_QA.getQA();
+                const alpha = bySource(after, 'alpha');
+                assertEqual(alpha.length, 3, 'alpha re-extracted');
+                assertEqual(alpha[0].text, 'Live monitor question alpha, reworded?');
+                assertTrue(alpha.every(item => !before.includes(item)), 'alpha items are fresh');
+                assertTrue(bySource(before, 'beta').every(item => after.includes(item)), 'beta items kept as they were');
+            } finally {
+                window.LMS_QA.stopMonitoring();
+                root.remove();
+            }
+        });
     }
 
     function runUtilityTests() {
@@ -276,6 +479,843 @@
             assertExists(report.qa.items);
             assertExists(report.logs);
         });
+
+        test('Utility: diff aligns reworded questions and flags key changes', () => {
+            const q = (text) => ({ type: 'question', text });
+            const a = (text, correct = false) => ({ type: 'answer', text, correct });
+            const baseline = { qa: { items: [
+                q('What is the capital of France?'), a('Paris', true), a('Lyon'),
+                q('Which planet is known as the red planet?'), a('Mars', true)
+            ] } };
+            const current = { qa: { items: [
+                q('What is the capital city of France?'), a('Paris'), a('Lyon', true),
+                q('Which gas do plants absorb?'), a('Carbon dioxide', true)
+            ] } };
+
+            const diff = window.LMS_QA.diff(baseline, current);
+            assertEqual(diff.summary.changed, 1, 'reworded question');
+            assertEqual(diff.summary.correct, 2, 'correct flag moved');
+            assertEqual(diff.summary.removed, 2, 'removed question and answer');
+            assertEqual(diff.summary.added, 2, 'added question and answer');
+            assertEqual(diff.summary.unchanged, 0);
+        });
+
+        test('Utility: rewording a question keeps its answers\' change IDs', () => {
+            const q = (text) => ({ type: 'question', text });
+            const a = (text, correct = false) => ({ type: 'answer', text, correct });
+            const baseline = { qa: { items: [q('What is the capital of France?'), a('Paris', true), a('Lyon'), a('Nice')] } };
+            const edit = (question) => ({ qa: { items: [q(question), a('Paris'), a('Lyon', true), a('Marseille')] } });
+            const answerIds = (diff) => diff.changes
+                .filter(c => c.type === 'answer')
+                .map(c => `${c.kind}:${c.id}`)
+                .sort()
+                .join();
+
+            const same = window.LMS_QA_DIFF.compare(baseline, edit('What is the capital of France?'));
+            const reworded = window.LMS_QA_DIFF.compare(baseline, edit('What is the capital city of France?'));
+
+            assertEqual(reworded.summary.changed, 1, 'question reworded');
+            assertEqual(reworded.summary.correct, 2);
+            assertEqual(answerIds(reworded), answerIds(same));
+
+            const ids = reworded.changes.map(c => c.id);
+            assertEqual(new Set(ids).size, ids.length, 'IDs are unique');
+        });
+
+        testAsync('Utility: cached resources are revalidated and a 304 reuses the stored copy', async () => {
+            // Stand in for the content script, backed by the service worker's store
+            const sender = { origin: 'test://resource-cache' };
+            const bridge = (event) => {
+                if (event.source !== window || event.data?.type !== 'LMS_QA_CACHE_REQUEST') return;
+                const { id, op, payload } = event.data;
+                ResourceStore.handle({ op, payload }, sender).then(result => {
+                    window.postMessage({ type: 'LMS_QA_CMD_CACHE_REPLY', payload: { id, result } }, '*');
+                });
+            };
+
+            const body = JSON.stringify({ question: 'Which planet is known as the red planet?', correctAnswer: 'Mars' });
+            const requests = [];
+            const realFetch = window.fetch;
+            window.fetch = async (url, init = {}) => {
+                const conditional = init.headers?.['If-None-Match'] === '"v1"';
+                requests.push({ conditional, cache: init.cache });
+                return conditional
+                    ? new Response(null, { status: 304 })
+                    : new Response(body, { status: 200, headers: { ETag: '"v1"' } });
+            };
+
+            window.addEventListener('message', bridge);
+            try {
+                window.postMessage({ type: 'LMS_QA_CMD_CACHE_CONNECT' }, '*');
+                await new Promise(resolve => setTimeout(resolve, 0));
+
+                await window.LMS_QA.scan();
+                const fetched = requests.length;
+                const firstTotal = window.LMS_QA.getReport().qa.total;
+                assertTrue(fetched > 0, 'scan fetched resources');
+                assertFalse(requests.some(r => r.conditional), 'nothing cached before the first scan');
+
+                await window.LMS_QA.scan();
+                const revalidated = requests.slice(fetched);
+                assertEqual(revalidated.length, fetched, 'same resources fetched again');
+                assertTrue(revalidated.every(r => r.conditional), 'sent If-None-Match from the cache');
+                assertTrue(revalidated.every(r => r.cache !== 'no-cache'), 'conditional requests skip the HTTP cache');
+                assertEqual(window.LMS_QA.getProfile().counters.bytesFetched || 0, 0, 'no bodies downloaded');
+                assertEqual(window.LMS_QA.getReport().qa.total, firstTotal, 'items found from the cached copy');
+            } finally {
+                window.fetch = realFetch;
+                window.removeEventListener('message', bridge);
+                await ResourceStore.handle({ op: 'clear' }, sender);
+            }
+        });
+    }
+
+    function runScannerTests() {
+        const settle = (ms = 0) => new Promise(resolve => setTimeout(resolve, ms));
+
+        /**
+         * Replace window.fetch; handler(url, signal) returns the response promise.
+         * Tracks how many requests are in flight, overall and per host.
+         */
+        function stubFetch(handler) {
+            const stats = { started: [], active: 0, maxActive: 0, hosts: new Map(), maxPerHost: 0 };
+            const realFetch = window.fetch;
+
+            window.fetch = async (url, init = {}) => {
+                const host = new URL(url, window.location.href).host;
+                stats.started.push(url);
+                stats.active++;
+                stats.maxActive = Math.max(stats.maxActive, stats.active);
+                stats.hosts.set(host, (stats.hosts.get(host) || 0) + 1);
+                stats.maxPerHost = Math.max(stats.maxPerHost, stats.hosts.get(host));
+                try {
+                    return await handler(String(url), init.signal);
+                } finally {
+                    stats.active--;
+                    stats.hosts.set(host, stats.hosts.get(host) - 1);
+                }
+            };
+
+            stats.restore = () => { window.fetch = realFetch; };
+            return stats;
+        }
+
+        // Never settles until the request is aborted
+        const hang = (signal) => new Promise((_, reject) => {
+            signal.addEventListener('abort', () => reject(new DOMException('Aborted', 'AbortError')), { once: true });
+        });
+
+        testAsync('Scanner: fetch scheduler keeps to the overall and per-host ceilings', async () => {
+            const { FetchScheduler } = window.LMS_QA._internals;
+            const hosts = ['a.test', 'a.test', 'a.test', 'a.test', 'a.test', 'a.test', 'b.test', 'b.test', 'b.test', 'c.test', 'c.test', 'c.test'];
+            const tasks = hosts.map((host, i) => ({ url: `https://${host}/${i === 4 ? 'fail' : 'file'}-${i}.js` }));
+            const stats = stubFetch(async (url) => {
+                await settle(5);
+                if (url.includes('fail')) throw new TypeError('Failed to fetch');
+                return new Response(url);
+            });
+
+            try {
+                const results = await FetchScheduler.map(tasks, async (task, signal) => {
+                    const response = await fetch(task.url, { signal });
+                    return response.text();
+                }, { concurrency: 4, perHost: 2 });
+
+                assertEqual(stats.started.length, tasks.length, 'every task ran');
+                assertEqual(stats.maxActive, 4, 'concurrency ceiling reached, not passed');
+                assertEqual(stats.maxPerHost, 2, 'per-host ceiling');
+                assertEqual(results[4], null, 'failed task');
+                assertEqual(results.filter((text, i) => text === tasks[i].url).length, tasks.length - 1, 'results in task order');
+            } finally {
+                stats.restore();
+            }
+        });
+
+        testAsync('Scanner: aborting a scheduled batch drops queued tasks and aborts running ones', async () => {
+            const { FetchScheduler } = window.LMS_QA._internals;
+            const tasks = Array.from({ length: 5 }, (_, i) => ({ url: `https://lms.test/slide-${i}.js` }));
+            const controller = new AbortController();
+            const aborted = [];
+            const stats = stubFetch((url, signal) => {
+                signal.addEventListener('abort', () => aborted.push(url), { once: true });
+                return hang(signal);
+            });
+
+            try {
+                const pending = FetchScheduler.map(tasks, (task, signal) => fetch(task.url, { signal }),
+                    { concurrency: 2, signal: controller.signal });
+                await settle();
+                assertEqual(stats.active, 2, 'two in flight');
+
+                controller.abort();
+                const results = await pending;
+
+                assertEqual(stats.started.length, 2, 'queued tasks never started');
+                assertEqual(aborted.length, 2, 'running tasks aborted');
+                assertTrue(results.every(result => result === null), 'no results');
+
+                const late = await FetchScheduler.map(tasks, () => 'ran', { signal: controller.signal });
+                assertTrue(late.every(result => result === null), 'an already aborted signal runs nothing');
+            } finally {
+                stats.restore();
+            }
+        });
+
+        testAsync('Scanner: CMD_CANCEL_SCAN stops a scan mid-phase after streaming partial results', async () => {
+            const slides = Array.from({ length: 20 }, (_, i) => ({ id: `s${i}` }));
+            const courseData = `globalProvideData('data', '${JSON.stringify({ scenes: [{ slides }] })}')`;
+            const stats = stubFetch((url, signal) => {
+                if (url.endsWith('/data.js')) return Promise.resolve(new Response(courseData));
+                // The first two slides answer at once; the rest hang until cancelled
+                if (/\/s[01]\.js$/.test(url)) return Promise.resolve(new Response('no slide data'));
+                return hang(signal);
+            });
+
+            // Make the test page look like a Storyline course
+            window.globalProvideData = () => {};
+            const isError = m => m.type === 'LMS_QA_SCAN_ERROR';
+            const flatten = messages => messages.flatMap(m => m.type === 'LMS_QA_BATCH' ? m.messages : [m]);
+            const received = collectMessages(messages => flatten(messages).some(isError), 10000);
+
+            try {
+                const scanning = window.LMS_QA.scan();
+                for (let i = 0; i < 100 && stats.started.length < 9; i++) await settle(10);
+
+                // data.js, two finished slides and six hanging ones: the per-host ceiling
+                assertEqual(stats.started.length, 9, 'slides started');
+                assertEqual(stats.active, 6, 'in flight');
+                assertEqual(stats.maxPerHost, 6, 'per-host ceiling');
+
+                window.postMessage({ type: 'LMS_QA_CMD_CANCEL_SCAN' }, '*');
+                await scanning;
+                const messages = flatten(await received);
+
+                assertEqual(messages.find(isError).payload.error, 'Scan cancelled');
+                assertEqual(stats.started.length, 9, 'queued slides never fetched');
+                assertEqual(stats.active, 0, 'in-flight slides aborted');
+                assertFalse(window.LMS_QA.getState().scanning, 'scan finished');
+
+                const partials = messages
+                    .filter(m => m.type === 'LMS_QA_SCAN_PARTIAL' && m.payload.phase === 'storyline')
+                    .map(m => m.payload);
+                assertEqual(partials.map(p => p.completed).join(), '1,2', 'one partial per finished slide');
+                assertTrue(partials.every(p => p.total === slides.length), 'progress total');
+                assertTrue(partials[1].seq > partials[0].seq, 'sequence numbers increase');
+                assertFalse(messages.some(m => m.type === 'LMS_QA_SCAN_COMPLETE' ||
+                    (m.type === 'LMS_QA_CHUNK' && m.messageType === 'LMS_QA_SCAN_COMPLETE')), 'no completion');
+            } finally {
+                delete window.globalProvideData;
+                stats.restore();
+            }
+        });
+    }
+
+    function runSelectorRuleTests() {
+        const RULE = { questionSelector: '.fx-q', answerSelector: '.fx-a', correctSelector: '.fx-c', urlPattern: 'test/rules' };
+        const itemsHTML = (count) => Array.from({ length: count }, (_, i) => `
+            <div class="fx-item">
+                <p class="fx-q">Fixture question ${i + 1}?</p>
+                <ul><li class="fx-a">Wrong ${i + 1}</li><li class="fx-a fx-c">Right ${i + 1}</li></ul>
+            </div>`).join('');
+
+        test('Selector Rules: compile picks a descendant plan when each question has its own container', () => {
+            const root = mountFixture(itemsHTML(3));
+            try {
+                const result = window.LMS_QA_SELECTOR.applyRule(RULE);
+                assertTrue(result.success, result.error);
+                assertTrue(result.compiled, 'freshly compiled');
+                assertEqual(result.plan.grouping, 'descendant');
+                assertEqual(result.plan.containerDepth, 1, 'question parent holds the answers');
+                assertEqual(result.plan.frames[0].index, -1, 'main document');
+                assertEqual(result.qaGroups.length, 3);
+                result.qaGroups.forEach(group => {
+                    assertEqual(group.answers.length, 2);
+                    assertEqual(group.answers.filter(a => a.correct).length, 1);
+                });
+            } finally {
+                root.remove();
+            }
+        });
+
+        test('Selector Rules: resolve reuses a cached plan and recompiles a stale one', () => {
+            const root = mountFixture(itemsHTML(2));
+            try {
+                const { plan } = window.LMS_QA_SELECTOR.applyRule(RULE);
+
+                const reused = window.LMS_QA_SELECTOR.applyRule({ ...RULE, plan });
+                assertTrue(reused.success);
+                assertFalse(reused.compiled, 'cached plan reused');
+                assertEqual(reused.qaGroups.length, 2);
+
+                const stale = window.LMS_QA_SELECTOR.applyRule({ ...RULE, plan: { ...plan, key: 'other rule' } });
+                assertTrue(stale.compiled, 'plan for another rule is recompiled');
+            } finally {
+                root.remove();
+            }
+        });
+
+        test('Selector Rules: shared containers fall back to proximity grouping', () => {
+            // Questions and answers are siblings, so no ancestor isolates a question
+            const root = mountFixture(`<div>
+                <p class="fx-q">Flat question 1?</p><div class="fx-a">One A</div><div class="fx-a fx-c">One B</div>
+                <p class="fx-q">Flat question 2?</p><div class="fx-a fx-c">Two A</div><div class="fx-a">Two B</div>
+            </div>`);
+            try {
+                const result = window.LMS_QA_SELECTOR.applyRule(RULE);
+                assertTrue(result.success, result.error);
+                assertEqual(result.plan.grouping, 'proximity');
+                assertEqual(result.plan.containerDepth, 0);
+                assertEqual(result.qaGroups.map(g => g.answers.length).join(','), '2,2');
+                assertEqual(result.qaGroups[1].answers[0].text, 'Two A');
+            } finally {
+                root.remove();
+            }
+        });
+
+        test('Selector Rules: descendant fast path gives way when the page stops fitting the plan', () => {
+            const root = mountFixture(itemsHTML(3));
+            try {
+                const { plan } = window.LMS_QA_SELECTOR.applyRule(RULE);
+
+                // Move the second question into the first container: the plan's
+                // depth now maps two questions to one container
+                const items = root.querySelectorAll('.fx-item');
+                items[0].appendChild(items[1].querySelector('.fx-q'));
+
+                const result = window.LMS_QA_SELECTOR.applyRule({ ...RULE, plan });
+                assertTrue(result.success, result.error);
+                assertFalse(result.compiled, 'plan still resolves');
+                assertEqual(result.qaGroups.length, 3, 'proximity grouping still finds every question');
+            } finally {
+                root.remove();
+            }
+        });
+
+        test('Selector Rules: index prefers the longest matching pattern', () => {
+            const index = RuleIndex.create();
+            ['lms.test/*', 'lms.test/course/*', 'lms.test/course/*/quiz'].forEach(p => RuleIndex.insert(index, p, p));
+
+            assertEqual(RuleIndex.match(index, 'https://lms.test/course/42/quiz'), 'lms.test/course/*/quiz');
+            assertEqual(RuleIndex.match(index, 'https://lms.test/course/42/review'), 'lms.test/course/*');
+            assertEqual(RuleIndex.match(index, 'https://lms.test/catalog/42'), 'lms.test/*');
+            assertEqual(RuleIndex.match(index, 'https://lms.test/'), 'lms.test/*');
+        });
+
+        test('Selector Rules: index matches pattern keys built from numeric segments', () => {
+            // getPatternKey() turns /123 into /* and /7abc into /*abc
+            const index = RuleIndex.create();
+            ['lms.test/course/*/unit/*abc', 'lms.test/course/*/page'].forEach(p => RuleIndex.insert(index, p, p));
+
+            assertEqual(RuleIndex.match(index, 'https://lms.test/course/12/unit/345abc'), 'lms.test/course/*/unit/*abc');
+            assertEqual(RuleIndex.match(index, 'https://lms.test/course/12/unit/abc'), null, 'no leading digits');
+            assertEqual(RuleIndex.match(index, 'https://lms.test/course/12/unit/9abd'), null, 'different suffix');
+            assertEqual(RuleIndex.match(index, 'https://lms.test/course/12/page/'), 'lms.test/course/*/page', 'trailing slash');
+            assertEqual(RuleIndex.match(index, 'https://lms.test/course/intro/page'), 'lms.test/course/*/page', '* still matches any segment');
+        });
+
+        test('Selector Rules: index returns null when nothing matches', () => {
+            const index = RuleIndex.create();
+            RuleIndex.insert(index, 'lms.test/course/*/quiz', 'lms.test/course/*/quiz');
+
+            assertEqual(RuleIndex.match(index, 'https://other.test/course/1/quiz'), null, 'other host');
+            assertEqual(RuleIndex.match(index, 'https://lms.test/course/1'), null, 'shorter path');
+            assertEqual(RuleIndex.match(index, 'https://lms.test/course/1/quiz/extra'), null, 'longer path');
+            assertEqual(RuleIndex.match(index, 'not a url'), null, 'invalid URL');
+        });
+
+        testAsync('Selector Rules: document order numbers elements across the page and its frames', async () => {
+            const { DocumentOrder } = window.LMS_QA_SELECTOR._internals;
+            const root = mountFixture('<div class="fx-order"><p id="o1"><span id="o2"></span></p><p id="o3"></p></div><iframe srcdoc="<p id=f1></p>"></iframe>');
+            try {
+                const iframe = root.querySelector('iframe');
+                await new Promise(resolve => iframe.contentDocument?.readyState === 'complete' && iframe.contentDocument.getElementById('f1')
+                    ? resolve()
+                    : iframe.addEventListener('load', resolve, { once: true }));
+
+                const frameDoc = iframe.contentDocument;
+                const [o1, o2, o3] = ['o1', 'o2', 'o3'].map(id => root.querySelector(`#${id}`));
+                const f1 = frameDoc.getElementById('f1');
+                const detached = document.createElement('p');
+
+                const order = DocumentOrder.build([f1, o3, detached, o1, o2], [document, frameDoc]);
+                assertFalse(order.has(detached), 'elements outside the documents are not indexed');
+                assertTrue(order.get(o1) < order.get(o2) && order.get(o2) < order.get(o3), 'tree order, parents first');
+                assertTrue(order.get(f1) > order.get(o3), 'frame elements after the main document');
+                assertEqual(order.get(o2) - order.get(o1), 1, 'ordinals count every element walked');
+            } finally {
+                root.remove();
+            }
+        });
+
+        test('Selector Rules: document order ranks indexed elements and bisects positions', () => {
+            const { DocumentOrder } = window.LMS_QA_SELECTOR._internals;
+            const [a, b, c, missing] = ['a', 'b', 'c', 'missing'].map(() => document.createElement('li'));
+            const order = new Map([[a, 2], [b, 4], [c, 7]]);
+
+            const ranked = DocumentOrder.rank([c, missing, a, b], order);
+            assertTrue(ranked.elements[0] === a && ranked.elements[1] === b && ranked.elements[2] === c, 'sorted by ordinal');
+            assertEqual(ranked.positions.join(), '2,4,7');
+            assertEqual(ranked.elements.length, 3, 'un-indexed element dropped');
+
+            const positions = [2, 4, 4, 7];
+            assertEqual(DocumentOrder.bisect(positions, 4), 3, 'first slot after a value');
+            assertEqual(DocumentOrder.bisect(positions, 4, true), 1, 'inclusive');
+            assertEqual(DocumentOrder.bisect(positions, 0), 0);
+            assertEqual(DocumentOrder.bisect(positions, 9), 4);
+            assertEqual(DocumentOrder.bisect(positions, Infinity, true), 4, 'open-ended range');
+            assertEqual(DocumentOrder.bisect([], 3), 0, 'empty list');
+        });
+
+        test('Selector Rules: answers between questions skip un-indexed questions', () => {
+            const { DocumentOrder, RuleExtractor } = window.LMS_QA_SELECTOR._internals;
+            const root = mountFixture('<div class="fx-between"><h3>Q1</h3><i>a</i><i>b</i><h3>Q2</h3><i>c</i></div>');
+            try {
+                const [q1, q2] = root.querySelectorAll('h3');
+                const answers = [...root.querySelectorAll('i')];
+                const detached = document.createElement('h3');
+                const order = DocumentOrder.build([q1, q2, ...answers], [document]);
+                const ranked = DocumentOrder.rank(answers, order);
+                const between = (q, next, used = new Set()) =>
+                    RuleExtractor.findAnswersBetween(q, next, ranked, used, order).map(el => el.textContent).join();
+
+                assertEqual(RuleExtractor.getDocumentPosition(detached, order), Infinity, 'un-indexed position');
+                assertEqual(between(q1, q2), 'a,b');
+                assertEqual(between(q1, q2, new Set([answers[0]])), 'b', 'used answers skipped');
+                assertEqual(between(q2, null), 'c', 'last question runs to the end');
+                assertEqual(between(q1, detached), 'a,b,c', 'un-indexed next question leaves the range open');
+                assertEqual(between(detached, q2), '', 'un-indexed question has no answers');
+            } finally {
+                root.remove();
+            }
+        });
+
+        test('Selector Rules: picker mutations are not page changes', () => {
+            const { SelectorCache } = window.LMS_QA_SELECTOR._internals;
+            const root = mountFixture('<div class="fx-own"><p class="a"></p></div><div id="lms-qa-selector-panel"><span></span></div>');
+            try {
+                const p = root.querySelector('p');
+                const inPanel = root.querySelector('#lms-qa-selector-panel span');
+                const attr = (target, attributeName, oldValue) => ({ type: 'attributes', target, attributeName, oldValue });
+                const childList = (addedNodes, removedNodes = []) => ({ type: 'childList', target: root, addedNodes, removedNodes });
+                const own = (record) => SelectorCache.isOwnMutation(record);
+
+                p.className = 'a lms-qa-selector-highlight answer-mode';
+                assertTrue(own(attr(p, 'class', 'a')), 'highlight classes added');
+                p.className = 'a b';
+                assertFalse(own(attr(p, 'class', 'a')), 'page class added');
+
+                assertTrue(own(attr(p, 'style', '')), 'style');
+                assertTrue(own(attr(p, 'data-lms-index', null)), 'data-lms- attributes');
+                assertFalse(own(attr(p, 'hidden', null)), 'other attributes');
+                assertTrue(own(attr(inPanel, 'hidden', null)), 'inside the panel');
+
+                const overlay = document.createElement('div');
+                overlay.id = 'lms-qa-selector-overlay';
+                assertTrue(own(childList([overlay])), 'overlay inserted');
+                assertFalse(own(childList([overlay, document.createElement('li')])), 'mixed with page nodes');
+                assertFalse(own(childList([])), 'empty record');
+            } finally {
+                root.remove();
+            }
+        });
+
+        testAsync('Selector Rules: cached matches last until the page itself changes', async () => {
+            const { SelectorCache } = window.LMS_QA_SELECTOR._internals;
+            const wasRunning = !!SelectorCache.observer;
+            const root = mountFixture('<ul class="fx-epoch"><li>a</li><li>b</li></ul>');
+            const settle = () => new Promise(resolve => setTimeout(resolve, 0));
+            const changes = [];
+
+            SelectorCache.start();
+            const unsubscribe = SelectorCache.onChange(doc => changes.push(doc));
+            try {
+                const first = SelectorCache.query('.fx-epoch li');
+                assertEqual(first.length, 2);
+                assertTrue(SelectorCache.query('.fx-epoch li') === first, 'cache hit');
+
+                root.querySelector('li').classList.add('lms-qa-selector-highlight');
+                await settle();
+                assertTrue(SelectorCache.query('.fx-epoch li') === first, 'own mutation keeps the epoch');
+                assertEqual(changes.length, 0);
+
+                root.querySelector('ul').appendChild(document.createElement('li'));
+                await settle();
+                const second = SelectorCache.query('.fx-epoch li');
+                assertFalse(second === first, 'page change invalidates');
+                assertEqual(second.length, 3);
+                assertTrue(changes[0] === document, 'listeners told which document changed');
+
+                assertEqual(SelectorCache.count('[[invalid'), 0, 'invalid selector');
+            } finally {
+                unsubscribe();
+                if (!wasRunning) SelectorCache.stop();
+                root.remove();
+            }
+        });
+
+        test('Selector Rules: generator ranks matching selectors by how few elements they match', () => {
+            const { SelectorGenerator } = window.LMS_QA_SELECTOR._internals;
+            const root = mountFixture('<ul class="fx-rank"><li class="opt">a</li><li class="opt">b</li><li class="opt">c</li><li>d</li></ul>');
+            try {
+                const target = root.querySelector('.opt');
+                const ranked = SelectorGenerator.rank([
+                    { selector: '.fx-rank li', type: 'tag' },
+                    { selector: '.fx-rank li:first-child', type: 'nth' },
+                    { selector: '.fx-rank .opt', type: 'class' },
+                    { selector: '.fx-rank li:last-child', type: 'other' },
+                    { selector: '[[invalid', type: 'broken' }
+                ], target);
+
+                assertEqual(ranked.map(c => c.selector).join(), '.fx-rank .opt,.fx-rank li,.fx-rank li:first-child');
+                assertEqual(ranked.map(c => c.count).join(), '3,4,1');
+                assertEqual(ranked.map(c => c.score).join(), '97,96,0', 'a unique match is no pattern');
+                assertEqual(ranked[0].type, 'class', 'candidate fields kept');
+                assertEqual(SelectorGenerator.findBest([{ selector: '.fx-rank li:last-child' }], target), null);
+            } finally {
+                root.remove();
+            }
+        });
+
+        test('Selector Rules: stream emits array elements split across chunks', () => {
+            const stream = RuleStream.create();
+            const text = '[{"urlPattern":"a/*","questionSelector":"h2 [data-q=\\"]\\"]"},\n {"urlPattern":"b/*","questionSelector":"p"}]';
+            const records = [];
+
+            // Cut inside strings, escapes and brackets alike
+            for (let i = 0; i < text.length; i += 7) {
+                records.push(...RuleStream.feed(stream, text.slice(i, i + 7)));
+            }
+            records.push(...RuleStream.feed(stream, '', true));
+
+            assertEqual(stream.mode, 'array');
+            assertEqual(records.length, 2);
+            assertEqual(records[0].questionSelector, 'h2 [data-q="]"]', 'brackets and quotes inside strings');
+            assertEqual(records[1].urlPattern, 'b/*');
+        });
+
+        test('Selector Rules: stream reads compact rows after a header line', () => {
+            const stream = RuleStream.create();
+            const header = JSON.stringify({ format: RULE_EXPORT_FORMAT, version: 1, fields: ['urlPattern', 'answerSelector', 'questionSelector'] });
+
+            const first = RuleStream.feed(stream, header + '\n["a/*","li","h2"]\n["b/', false);
+            const rest = RuleStream.feed(stream, '*","td","th"]', true);
+
+            assertEqual(stream.mode, 'lines');
+            assertEqual(stream.fields.join(), 'urlPattern,answerSelector,questionSelector', 'fields from header');
+            assertEqual(first.length, 1, 'header is not a record');
+            assertEqual(first[0].join(), 'a/*,li,h2');
+            assertEqual(rest.length, 1, 'partial line completes with the next chunk');
+            assertEqual(rest[0].join(), 'b/*,td,th');
+        });
+
+        test('Selector Rules: stream rejects a truncated array', () => {
+            const stream = RuleStream.create();
+            RuleStream.feed(stream, '[{"urlPattern":"a/*"}, {"urlPattern"');
+
+            let error = null;
+            try {
+                RuleStream.feed(stream, '', true);
+            } catch (e) {
+                error = e;
+            }
+            assertTrue(error instanceof Error, 'throws at end of input');
+        });
+
+        test('Selector Rules: normalize accepts compact rows and rule objects', () => {
+            const row = RuleTransfer.normalize([' lms.test/*  ', 'h2', 'li', 'li.ok', 'proximity', '2024-01-01T00:00:00.000Z'], RULE_EXPORT_FIELDS);
+            assertEqual(row.urlPattern, 'lms.test/*', 'pattern trimmed');
+            assertEqual(row.correctSelector, 'li.ok');
+            assertEqual(row.grouping, 'proximity');
+            assertEqual(row.created, '2024-01-01T00:00:00.000Z');
+
+            const plan = { version: 1 };
+            const object = RuleTransfer.normalize({
+                urlPattern: 'lms.test/course/*',
+                questionSelector: 'h2',
+                answerSelector: 'li',
+                correctSelector: '',
+                grouping: 'nearest',
+                plan
+            }, RULE_EXPORT_FIELDS);
+            assertEqual(object.correctSelector, null, 'blank correct selector');
+            assertEqual(object.grouping, 'auto', 'unknown grouping');
+            assertTrue(object.plan === plan, 'plan kept');
+            assertTrue(typeof object.created === 'string');
+        });
+
+        test('Selector Rules: normalize rejects invalid records', () => {
+            const base = { urlPattern: 'lms.test/*', questionSelector: 'h2', answerSelector: 'li' };
+            const invalid = {
+                'missing field': { urlPattern: 'lms.test/*', questionSelector: 'h2' },
+                'blank field': { ...base, answerSelector: '  ' },
+                'non-string field': { ...base, questionSelector: 42 },
+                'too long': { ...base, answerSelector: 'a'.repeat(MAX_RULE_FIELD_LENGTH + 1) },
+                'leading slash': { ...base, urlPattern: ' /course/*' },
+                'non-object': 'lms.test/*',
+                'null': null
+            };
+
+            for (const [label, record] of Object.entries(invalid)) {
+                assertEqual(RuleTransfer.normalize(record, RULE_EXPORT_FIELDS), null, label);
+            }
+        });
+
+        testAsync('Selector Rules: a multi-chunk import writes storage once', async () => {
+            const count = RULE_IMPORT_BATCH_SIZE * 2 + 10;
+            const lines = [JSON.stringify({ format: RULE_EXPORT_FORMAT, version: 1, fields: RULE_EXPORT_FIELDS })];
+            for (let i = 0; i < count; i++) {
+                lines.push(JSON.stringify([`import.test/${i}/*`, 'h2', 'li', null, 'auto', null]));
+            }
+            lines.push('"not a rule"');
+            const text = lines.join('\n');
+
+            await SelectorRules.load();
+            const writes = chrome.storage.local.writes;
+            const importId = 'test-import';
+            const size = Math.ceil(text.length / 5);
+            let response = null;
+
+            for (let i = 0; i <= text.length; i += size) {
+                const chunk = text.slice(i, i + size);
+                response = await RuleTransfer.receive({ importId, text: chunk, done: i + size > text.length });
+                assertTrue(response.success, response.error);
+            }
+
+            assertTrue(response.done);
+            assertEqual(response.stats.imported, count);
+            assertEqual(response.stats.invalid, 1);
+            assertEqual(chrome.storage.local.writes - writes, 1, 'one storage write');
+
+            const stored = (await chrome.storage.local.get(RULES_STORAGE_KEY))[RULES_STORAGE_KEY];
+            assertEqual(Object.keys(stored).filter(p => p.startsWith('import.test/')).length, count);
+            assertFalse(RuleTransfer.sessions.has(importId), 'session released');
+        });
+    }
+
+    function runTransportTests() {
+        testAsync('Transport: same-tick sends are posted as one batch', async () => {
+            const isResult = m => m.type === 'LMS_QA_TEST_RESULT';
+            const findBatch = messages => messages.find(m => m.type === 'LMS_QA_BATCH' && m.messages.some(isResult));
+            const received = collectMessages(findBatch);
+            window.LMS_QA.testAPI(999);
+            window.LMS_QA.testAPI(999);
+
+            const messages = await received;
+            assertEqual(findBatch(messages).messages.filter(isResult).length, 2);
+            assertFalse(messages.some(isResult), 'results posted on their own');
+        });
+
+        testAsync('Transport: large payloads arrive as ordered chunks that decode intact', async () => {
+            // 1.2 MB of 3-byte characters spans two 1 MB chunks; padding the
+            // baseline URL shifts the boundary so it lands inside a character
+            const text = '\u20AC'.repeat(400000);
+            const isDiffChunk = m => m.type === 'LMS_QA_CHUNK' && m.messageType === 'LMS_QA_DIFF_RESULT';
+            let splits = 0;
+
+            for (const pad of ['x', 'xx', 'xxx']) {
+                const received = collectMessages(messages => messages.some(m => isDiffChunk(m) && m.index === m.count - 1));
+                window.postMessage({
+                    type: 'LMS_QA_CMD_DIFF',
+                    payload: {
+                        baseline: { url: pad, qa: { items: [{ type: 'question', text }] } },
+                        current: { qa: { items: [] } }
+                    }
+                }, '*');
+
+                const chunks = (await received).filter(isDiffChunk);
+                assertTrue(chunks.length > 1, 'multiple chunks');
+                chunks.forEach((chunk, i) => {
+                    assertEqual(chunk.index, i, 'chunk order');
+                    assertEqual(chunk.count, chunks.length, 'chunk count');
+                });
+                if ((new Uint8Array(chunks[1].buffer)[0] & 0xC0) === 0x80) splits++;
+
+                const diff = JSON.parse(decodeChunks(chunks));
+                assertEqual(diff.baseline.url, pad);
+                assertTrue(diff.changes[0].question === text, 'text round-trips');
+            }
+
+            assertTrue(splits > 0, 'a character should straddle a chunk boundary');
+        });
+
+        testAsync('Transport: an unchanged state is sent as SNAPSHOT_UNCHANGED unless forced', async () => {
+            const isStateReply = m => m.type === 'LMS_QA_SNAPSHOT_UNCHANGED' ||
+                (m.type === 'LMS_QA_CHUNK' && m.messageType === 'LMS_QA_STATE');
+            const request = async (force) => {
+                const received = collectMessages(messages => messages.some(isStateReply));
+                window.postMessage({ type: 'LMS_QA_CMD_GET_STATE', payload: { force } }, '*');
+                return (await received).find(isStateReply);
+            };
+
+            assertEqual((await request(true)).messageType, 'LMS_QA_STATE');
+
+            const repeat = await request(false);
+            assertEqual(repeat.type, 'LMS_QA_SNAPSHOT_UNCHANGED');
+            assertEqual(repeat.payload.of, 'STATE');
+
+            assertEqual((await request(true)).messageType, 'LMS_QA_STATE', 'force');
+        });
+
+        test('Transport: service worker reassembles chunks received out of order', () => {
+            const sender = { tab: { id: 1 } };
+            const json = JSON.stringify({ text: 'caf\u00E9 \u20AC' });
+            const parts = [json.slice(0, 5), json.slice(5, 12), json.slice(12)];
+            const chunk = (index) => ({ type: 'CHUNK', id: 'test:1', index, count: 3, messageType: 'STATE', text: parts[index] });
+
+            assertEqual(Transport.receiveChunk(chunk(2), sender), null);
+            assertEqual(Transport.receiveChunk(chunk(0), sender), null);
+            assertEqual(Transport.receiveChunk(chunk(0), sender), null, 'duplicate');
+
+            const whole = Transport.receiveChunk(chunk(1), sender);
+            assertEqual(whole.type, 'STATE');
+            assertEqual(whole.payload.text, 'caf\u00E9 \u20AC');
+            assertFalse(Transport.transfers.has('1:test:1'), 'transfer released');
+        });
+
+        test('Transport: service worker drops chunks with an invalid count or index', () => {
+            const sender = { tab: { id: 1 } };
+            const chunk = (id, index, count) => ({ type: 'CHUNK', id, index, count, messageType: 'STATE', text: '{}' });
+            const invalid = [[0, -1], [0, 1.5], [0, 0], [0, '2'], [0, 1e9], [2, 2], [-1, 2], [0.5, 2], ['0', 2]];
+
+            invalid.forEach(([index, count]) => {
+                assertEqual(Transport.receiveChunk(chunk('test:bad', index, count), sender), null, `${index}/${count}`);
+            });
+            assertFalse(Transport.transfers.has('1:test:bad'));
+
+            // Later chunks must agree with the count the transfer started with
+            assertEqual(Transport.receiveChunk(chunk('test:2', 0, 3), sender), null);
+            assertEqual(Transport.receiveChunk(chunk('test:2', 1, 2), sender), null);
+            assertFalse(Transport.transfers.has('1:test:2'), 'inconsistent transfer dropped');
+        });
+    }
+
+    function runScanHistoryTests() {
+        // Each test gets a fresh database of its own and the default limits back afterwards
+        async function withHistory(fn) {
+            const defaults = { DB_NAME: ScanHistory.DB_NAME, MAX_SCANS: ScanHistory.MAX_SCANS, MAX_BYTES: ScanHistory.MAX_BYTES };
+            const name = `lms-qa-scan-history-test-${Date.now()}`;
+            Object.assign(ScanHistory, { DB_NAME: name, dbPromise: null });
+
+            try {
+                await fn(name);
+            } finally {
+                (await ScanHistory.dbPromise)?.close();
+                Object.assign(ScanHistory, defaults, { dbPromise: null });
+                indexedDB.deleteDatabase(name);
+            }
+        }
+
+        const report = (n) => ({ apis: [], qa: { total: n, correct: 1, items: [{ type: 'question', text: `Q${n}` }] } });
+        const sizeOf = (results) => JSON.stringify(results).length;
+
+        testAsync('Scan History: scans are stored with their results and listed newest first', async () => {
+            await withHistory(async () => {
+                const ids = [];
+                ids.push(await ScanHistory.add('https://lms.test/course/1/quiz', report(1)));
+                ids.push(await ScanHistory.add('https://lms.test/course/2/quiz', report(2)));
+                ids.push(await ScanHistory.add('https://other.test/intro', report(3)));
+                assertTrue(ids.every(id => typeof id === 'number'), 'ids assigned');
+
+                const all = await ScanHistory.list();
+                assertEqual(all.map(scan => scan.id).join(), [...ids].reverse().join(), 'newest first');
+
+                const course = await ScanHistory.list({ course: ScanHistory.getCourseKey('https://lms.test/course/9/quiz') });
+                assertEqual(course.map(scan => scan.id).join(), `${ids[1]},${ids[0]}`, 'numeric segments share a course');
+                assertEqual((await ScanHistory.list({ domain: 'other.test' })).length, 1);
+                assertEqual((await ScanHistory.list({ url: 'https://lms.test/course/2/quiz' }))[0].id, ids[1]);
+                assertEqual((await ScanHistory.list({ limit: 2 })).length, 2, 'limit');
+
+                assertEqual(all[0].qaCount, 3);
+                assertEqual((await ScanHistory.getResults(ids[0])).qa.total, 1, 'full results by id');
+                assertEqual(await ScanHistory.getResults(12345), null);
+
+                const totals = await ScanHistory.getTotals();
+                assertEqual(totals.count, 3);
+                assertEqual(totals.bytes, sizeOf(report(1)) + sizeOf(report(2)) + sizeOf(report(3)));
+            });
+        });
+
+        testAsync('Scan History: retention drops the oldest scans past the count and byte limits', async () => {
+            await withHistory(async () => {
+                ScanHistory.MAX_SCANS = 3;
+                const ids = [];
+                for (let n = 1; n <= 5; n++) ids.push(await ScanHistory.add('https://lms.test/course/1', report(n)));
+
+                assertEqual((await ScanHistory.list()).map(scan => scan.id).join(), ids.slice(2).reverse().join(), 'count limit');
+                assertEqual(await ScanHistory.getResults(ids[0]), null, 'results removed with their scan');
+                assertEqual((await ScanHistory.getTotals()).count, 3);
+
+                ScanHistory.MAX_BYTES = sizeOf(report(6)) * 2;
+                ids.push(await ScanHistory.add('https://lms.test/course/1', report(6)));
+
+                assertEqual((await ScanHistory.list()).map(scan => scan.id).join(), ids.slice(4).reverse().join(), 'byte limit');
+                assertEqual((await ScanHistory.getTotals()).bytes, sizeOf(report(5)) + sizeOf(report(6)));
+            });
+        });
+
+        testAsync('Scan History: totals survive a reopen and are built once for a version 1 database', async () => {
+            await withHistory(async (name) => {
+                // A version 1 database with two scans and no totals
+                const v1 = await new Promise((resolve, reject) => {
+                    const request = indexedDB.open(name, 1);
+                    request.onupgradeneeded = () => {
+                        const scans = request.result.createObjectStore('scans', { keyPath: 'id', autoIncrement: true });
+                        scans.createIndex('timestamp', 'timestamp');
+                        request.result.createObjectStore('results');
+                        scans.add({ url: 'https://lms.test/a', timestamp: 1, size: 10 });
+                        scans.add({ url: 'https://lms.test/b', timestamp: 2, size: 15 });
+                    };
+                    request.onsuccess = () => resolve(request.result);
+                    request.onerror = () => reject(request.error);
+                });
+                v1.close();
+
+                let totals = await ScanHistory.getTotals();
+                assertEqual(totals.count, 2, 'existing scans counted');
+                assertEqual(totals.bytes, 25);
+
+                await ScanHistory.add('https://lms.test/course/1', report(1));
+                (await ScanHistory.dbPromise).close();
+                ScanHistory.dbPromise = null;
+
+                totals = await ScanHistory.getTotals();
+                assertEqual(totals.count, 3, 'read back after reopening');
+                assertEqual(totals.bytes, 25 + sizeOf(report(1)));
+            });
+        });
+
+        testAsync('Scan History: legacy chrome.storage history is migrated and removed', async () => {
+            await withHistory(async () => {
+                const results = report(7);
+                // Legacy history is newest first, with results kept for the latest scan per domain
+                await chrome.storage.local.set({
+                    scanHistory: [
+                        { domain: 'lms.test', url: 'https://lms.test/course/2', timestamp: 3000, qaCount: 7 },
+                        { domain: 'lms.test', url: 'https://lms.test/course/1', timestamp: 2000, qaCount: 5 },
+                        { domain: 'old.test', url: 'https://old.test/', timestamp: 1000, qaCount: 1 }
+                    ],
+                    'results_lms.test': results
+                });
+
+                await ScanHistory.migrateLegacy();
+
+                const scans = await ScanHistory.list();
+                assertEqual(scans.map(scan => scan.timestamp).join(), '3000,2000,1000', 'order kept');
+                assertEqual(scans[0].course, 'lms.test/course/*');
+                assertEqual((await ScanHistory.getResults(scans[0].id)).qa.total, 7, 'latest results kept');
+                assertEqual(await ScanHistory.getResults(scans[1].id), null, 'older scans have no results');
+
+                const totals = await ScanHistory.getTotals();
+                assertEqual(totals.count, 3);
+                assertEqual(totals.bytes, sizeOf(results));
+
+                const left = await chrome.storage.local.get(['scanHistory', 'results_lms.test']);
+                assertEqual(Object.keys(left).length, 0, 'legacy keys removed');
+
+                await ScanHistory.migrateLegacy();
+                assertEqual((await ScanHistory.list()).length, 3, 'second run is a no-op');
+            });
+        });
     }
 
     // Event handlers